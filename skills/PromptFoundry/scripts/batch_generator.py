@@ -8,28 +8,53 @@ Perfect for team-wide rollouts and standardization.
 Usage:
     python batch_generator.py --input team-prompts.csv --format xml --mode core --output-dir ./prompts/
     python batch_generator.py --input batch-config.json --format all --parallel 5 --output-dir ./output/
+    python batch_generator.py --input big-batch.csv --format xml --output-dir ./out/ --report-format jsonl
 """
 
-import csv
+import re
 import json
 import argparse
-import concurrent.futures
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
-from generate_prompt import PromptGenerator, create_markdown_document
+# generate_prompt, csv and concurrent.futures are imported on first use so
+# --help and argument errors return without loading the generator
+from render_cache import RenderCache, DEFAULT_CACHE_PATH
+from profiling import StageProfiler
+from report_writer import JsonlReport
 
 
 class BatchGenerator:
     """Generate multiple prompts in batch mode."""
 
-    def __init__(self, parallel_workers: int = 3):
+    def __init__(self, parallel_workers: int = 3, default_preset: str = None,
+                 render_cache: RenderCache = None, profiler: StageProfiler = None):
         self.parallel_workers = parallel_workers
-        self.generator = PromptGenerator()
+        self.default_preset = default_preset
+        self.profiler = profiler
+
+        from generate_prompt import PromptGenerator
+        self.generator = PromptGenerator(render_cache=render_cache, profiler=profiler)
         self.results = []
 
+    def resolve_responses(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Layer a row's values over its preset defaults (row `preset` or --preset)."""
+        preset_name = config.get('preset') or self.default_preset
+        if not preset_name:
+            return config
+
+        # Parsed presets come from the generator's shared LRU, so repeated
+        # presets across rows never touch the markdown again
+        preset = self.generator.load_preset(preset_name)
+
+        # Blank CSV cells fall back to the preset value
+        overrides = {key: value for key, value in config.items() if value not in ('', None)}
+        return {**preset, **overrides}
+
     def load_csv_batch(self, filepath: str) -> List[Dict[str, Any]]:
         """Load batch configuration from CSV file."""
+        import csv
+
         configs = []
         with open(filepath, 'r') as f:
             reader = csv.DictReader(f)
@@ -60,17 +85,22 @@ class BatchGenerator:
             print(f"📝 Generating: {name}")
 
             # Generate prompt
-            result = self.generator.generate(config, format_type, mode)
+            responses = self.resolve_responses(config)
+            result = self.generator.generate(responses, format_type, mode)
 
             # Create output filename
-            role_slug = config.get('role', 'assistant').lower().replace(' ', '-')
+            # Preset roles such as "CEO / Founder" contain path separators
+            role_slug = re.sub(r'[\s/\\]+', '-', responses.get('role', 'assistant').lower())
             output_file = output_dir / f"{name}-{role_slug}.md"
 
-            # Create markdown document
-            markdown_doc = create_markdown_document(result, mode)
-
-            # Write to file
-            output_file.write_text(markdown_doc)
+            # Stream markdown document straight to disk
+            from generate_prompt import write_markdown_document
+            if self.profiler is not None:
+                started = self.profiler.now()
+            with open(output_file, 'w') as f:
+                write_markdown_document(result, mode, f)
+            if self.profiler is not None:
+                self.profiler.record('markdown', started, result['metadata']['timings'])
 
             # Validation summary
             validation_summary = {
@@ -93,8 +123,14 @@ class BatchGenerator:
             }
 
     def generate_batch(self, configs: List[Dict[str, Any]], format_type: str,
-                      mode: str, output_dir: Path) -> Dict[str, Any]:
-        """Generate multiple prompts in parallel."""
+                      mode: str, output_dir: Path,
+                      report: Optional[JsonlReport] = None) -> Dict[str, Any]:
+        """
+        Generate multiple prompts in parallel.
+
+        With a JSON Lines report, each result is written to it as it
+        completes instead of being kept, and the summary has no 'results'.
+        """
         print(f"\n🚀 Starting batch generation:")
         print(f"   Prompts: {len(configs)}")
         print(f"   Format: {format_type}")
@@ -106,34 +142,50 @@ class BatchGenerator:
         # Ensure output directory exists
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Generate prompts in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.parallel_workers) as executor:
-            futures = {
-                executor.submit(self.generate_single, config, format_type, mode, output_dir): config
-                for config in configs
-            }
+        import concurrent.futures
+
+        results = []
+        successful = 0
 
-            results = []
-            for future in concurrent.futures.as_completed(futures):
-                result = future.result()
+        def collect(future: 'concurrent.futures.Future'):
+            nonlocal successful
+            result = future.result()
+            successful += result['status'] == 'success'
+            if report is not None:
+                report.add(result)
+            else:
                 results.append(result)
 
-                # Print progress
-                status_emoji = "✅" if result['status'] == 'success' else "❌"
-                print(f"{status_emoji} {result['name']}: {result['status']}")
+            # Print progress
+            status_emoji = "✅" if result['status'] == 'success' else "❌"
+            print(f"{status_emoji} {result['name']}: {result['status']}")
 
-        # Generate summary
-        successful = sum(1 for r in results if r['status'] == 'success')
-        failed = len(results) - successful
+        # Generate prompts in parallel, with a bounded number of rows in
+        # flight so finished results are not held for the whole batch
+        max_pending = self.parallel_workers * 4
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.parallel_workers) as executor:
+            pending = set()
+            for config in configs:
+                if len(pending) >= max_pending:
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+                pending.add(executor.submit(self.generate_single, config, format_type, mode, output_dir))
+
+            for future in concurrent.futures.as_completed(pending):
+                collect(future)
 
+        # Generate summary
         summary = {
             'total': len(configs),
             'successful': successful,
-            'failed': failed,
+            'failed': len(configs) - successful,
             'output_dir': str(output_dir),
             'generated_at': datetime.now().isoformat(),
-            'results': results
         }
+        if report is None:
+            summary['results'] = results
 
         return summary
 
@@ -189,6 +241,8 @@ CSV Format Example:
   backend-api,Senior Backend Engineer,FinTech,Build secure APIs,code,"Python,FastAPI"
   frontend-ui,Frontend Engineer,FinTech,Build UIs,code,"React,TypeScript"
 
+  An optional `preset` column fills blank cells from a quick-start preset.
+
 JSON Format Example:
   {
     "prompts": [
@@ -203,6 +257,9 @@ Examples:
 
   # From JSON with parallel processing
   python batch_generator.py --input batch.json --format all --parallel 10 --output-dir ./output/
+
+  # Very large batches: one JSON line per prompt as it completes
+  python batch_generator.py --input big.csv --format xml --output-dir ./out/ --report-format jsonl
 """
     )
 
@@ -217,8 +274,18 @@ Examples:
                        help='Output directory for generated prompts')
     parser.add_argument('--parallel', type=int, default=3,
                        help='Number of parallel workers (default: 3)')
+    parser.add_argument('--preset',
+                       help='Default preset for rows without a `preset` column')
+    parser.add_argument('--cache', nargs='?', const=str(DEFAULT_CACHE_PATH), metavar='PATH',
+                       help='Reuse renders of unchanged rows from a persistent cache '
+                            '(default: outputs/.render-cache.sqlite3)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print aggregated per-stage timings after the batch')
     parser.add_argument('--report', action='store_true',
                        help='Generate summary report (default: True)')
+    parser.add_argument('--report-format', default='md', choices=['md', 'jsonl'],
+                       help='md: markdown summary written at the end (default); jsonl: '
+                            'batch-generation-report.jsonl, one line per prompt as it completes')
 
     args = parser.parse_args()
 
@@ -228,7 +295,10 @@ Examples:
         parser.error(f"Input file not found: {args.input}")
 
     # Load configurations
-    batch_gen = BatchGenerator(parallel_workers=args.parallel)
+    render_cache = RenderCache(Path(args.cache)) if args.cache else None
+    profiler = StageProfiler() if args.profile else None
+    batch_gen = BatchGenerator(parallel_workers=args.parallel, default_preset=args.preset,
+                               render_cache=render_cache, profiler=profiler)
 
     if input_path.suffix == '.csv':
         print(f"📄 Loading CSV batch configuration...")
@@ -243,7 +313,13 @@ Examples:
 
     # Generate batch
     output_dir = Path(args.output_dir)
-    summary = batch_gen.generate_batch(configs, args.format, args.mode, output_dir)
+    report = None
+    if args.report_format == 'jsonl':
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report = JsonlReport(str(output_dir / 'batch-generation-report.jsonl'))
+    summary = batch_gen.generate_batch(configs, args.format, args.mode, output_dir, report)
+    if report is not None:
+        report.close(summary)
 
     # Print summary
     print(f"\n{'=' * 60}")
@@ -254,8 +330,24 @@ Examples:
     print(f"❌ Failed: {summary['failed']}")
     print(f"📁 Output: {summary['output_dir']}")
 
+    cache_stats = batch_gen.generator.preset_cache.stats()
+    if cache_stats['hits'] or cache_stats['misses']:
+        print(f"🗂️  Preset cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+              f"({cache_stats['hit_rate'] * 100:.1f}% hit rate)")
+
+    if render_cache is not None:
+        render_stats = render_cache.stats()
+        print(f"💾 Render cache: {render_stats['hits']} hits, {render_stats['misses']} misses "
+              f"({render_stats['hit_rate'] * 100:.1f}% hit rate)")
+        render_cache.close()
+
+    if profiler is not None:
+        print(f"\n{profiler.format_table()}")
+
     # Generate report
-    if args.report or summary['failed'] > 0:
+    if report is not None:
+        print(f"📋 Report: {report.path}")
+    elif args.report or summary['failed'] > 0:
         report_file = create_summary_report(summary, output_dir)
         print(f"📋 Report: {report_file}")
 
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Chunked Validation
+
+Map-reduce scanning of one very large prompt. The text is split at line
+boundaries into one chunk per worker; each chunk is scanned on a process
+pool with the streaming scanner (stream_validation.StreamScan) and the
+partial counts are merged in order. PromptValidator.validate_chunked() runs
+the usual gates on the merged scan, so results match validate().
+
+Chunks are scanned without knowing how the previous chunk ended. The few
+cases where that matters (a comment, tag or placeholder running across a
+boundary) are detected during the merge and that chunk is re-scanned in the
+parent with the correct starting state. Tag nesting is merged from each
+chunk's unmatched closing and opening tags; if anything is misnested, the
+tag scan is redone sequentially so the reported error is exact.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
+from xml_structure import TagScanner, TagNode, TagTree, fence_states, scan_tags
+from token_counter import TOKEN_BOUNDARY, get_counter
+from stream_validation import StreamScan, DEFAULT_OVERLAP
+
+if TYPE_CHECKING:
+    from validator import PromptValidator
+
+
+# Below this size one process is faster than shipping chunks to a pool
+MIN_CHUNK_CHARS = 1 << 18
+
+# One validator per worker process, for its patterns and indicator lists
+_chunk_validator: Optional['PromptValidator'] = None
+
+
+def split_points(text: str, chunks: int) -> List[int]:
+    """
+    Line-start offsets dividing text into about `chunks` equal parts (0 first).
+
+    Only lines starting with text begin a chunk (token_counter.TOKEN_BOUNDARY),
+    so per-chunk token counts add up to the whole; text with fewer of them
+    gets fewer chunks.
+    """
+    points = [0]
+    for index in range(1, chunks):
+        offset = len(text) * index // chunks
+        match = TOKEN_BOUNDARY.search(text, offset)
+        if match is None:
+            break
+        point = match.start() + 1
+        if point <= points[-1]:
+            continue
+        points.append(point)
+    return points
+
+
+def scan_chunk(text: str, start: int, cut: int, at_end: bool, fence: Tuple[Optional[str], bool],
+               tokenizer: str, carry: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Scan text[:cut], one chunk starting at offset start; the rest is lookahead.
+
+    Module-level so process pool workers can run it.
+
+    Args:
+        at_end: text reaches the end of the prompt
+        fence: Fence state at the chunk start (xml_structure.fence_states)
+        tokenizer: token_counter backend name
+        carry: State carried from the preceding chunk, if it ran over
+
+    Returns:
+        StreamScan.export() of the chunk
+    """
+    global _chunk_validator
+    if _chunk_validator is None:
+        from validator import PromptValidator
+        _chunk_validator = PromptValidator()
+    _chunk_validator.counter = get_counter(tokenizer)
+
+    tags = TagScanner(keep_tree=False, partial=True, start=start, fence=fence,
+                      resume=carry['scan_from'] if carry else None)
+    scan = StreamScan(_chunk_validator, tags, carry)
+    scan.feed(text, start, cut, at_end)
+    return scan.export()
+
+
+def _carries_over(carry: Dict[str, Any], boundary: int) -> bool:
+    """Whether a chunk's scan state reaches past boundary into the next chunk."""
+    return (carry['scan_from'] > boundary or carry['example_from'] > 0 or carry['heading_from'] > 0
+            or any(end > boundary for end in carry['placeholder_ends'].values()))
+
+
+def _merge_tags(text: str, partials: List[Dict[str, Any]]) -> TagTree:
+    """Combine per-chunk tag results; misnesting falls back to one sequential scan."""
+    if any(partial['tags']['error'] for partial in partials):
+        return scan_tags(text)
+
+    # Elements still open, outermost first: [name, offset, content seen]
+    stack: List[list] = []
+    empty: Dict[str, int] = {}
+    count = 0
+
+    for partial in partials:
+        tags = partial['tags']
+        count += tags['count']
+        for name, offset in tags['empty'].items():
+            if offset < empty.get(name, offset + 1):
+                empty[name] = offset
+
+        for name, _, content in tags['closers']:
+            if not stack or stack[-1][0] != name:
+                return scan_tags(text)
+            opener = stack.pop()
+            if not (opener[2] or content):
+                if opener[1] < empty.get(name, opener[1] + 1):
+                    empty[name] = opener[1]
+            if stack:
+                # The closed element itself is content of its parent
+                stack[-1][2] = True
+
+        if stack and tags['tail_content']:
+            stack[-1][2] = True
+        if stack and tags['openers']:
+            stack[-1][2] = True
+        stack.extend([name, offset, content] for name, offset, content in tags['openers'])
+
+    if stack:
+        # Unclosed element: let the sequential scan report it
+        return scan_tags(text)
+
+    names = sorted(empty, key=empty.get)
+    return TagTree(TagNode(None), [], None, count, names)
+
+
+def merge_partials(text: str, partials: List[Dict[str, Any]],
+                   placeholder_order: Tuple[str, ...]) -> Dict[str, Any]:
+    """Combine chunk scans, in text order, into validate()'s shared scan keys."""
+    phrases = dict.fromkeys(partials[0]['phrases'], 0)
+    counts: Dict[str, int] = {}
+    samples: Dict[str, Dict[str, None]] = {}
+    first_text = None
+    last_text = -1
+
+    for partial in partials:
+        for phrase, count in partial['phrases'].items():
+            phrases[phrase] += count
+        for kind, count in partial['placeholder_counts'].items():
+            counts[kind] = counts.get(kind, 0) + count
+        for kind, found in partial['placeholder_samples'].items():
+            kept = samples.setdefault(kind, {})
+            for placeholder in found:
+                if len(kept) < 5:
+                    kept[placeholder] = None
+        if partial['first_text'] is not None:
+            if first_text is None:
+                first_text = partial['first_text']
+            last_text = partial['last_text']
+
+    examples = [placeholder for kind in placeholder_order for placeholder in samples.get(kind, ())]
+    return {
+        'tags': _merge_tags(text, partials),
+        'phrases': phrases,
+        'placeholders': (sum(counts.values()), list(dict.fromkeys(examples))[:5]),
+        'example_sections': sum(partial['example_sections'] for partial in partials),
+        'empty_headings': sum(partial['empty_headings'] for partial in partials),
+        'word_count': sum(partial['word_count'] for partial in partials),
+        'tokens': int(sum(partial['tokens'] for partial in partials)),
+        'length': sum(partial['length'] for partial in partials),
+        'stripped_length': 0 if first_text is None else last_text + 1 - first_text,
+    }
+
+
+def scan_chunked(text: str, validator: 'PromptValidator', workers: int,
+                 overlap: int = DEFAULT_OVERLAP) -> Dict[str, Any]:
+    """
+    Scan text in line-aligned chunks across `workers` processes.
+
+    Returns:
+        Scan results keyed like validate()'s shared scans
+    """
+    chunks = max(1, min(workers, len(text) // MIN_CHUNK_CHARS))
+    points = split_points(text, chunks)
+    ends = points[1:] + [len(text)]
+    fences = fence_states(text, points)
+    jobs = [(text[start:end + overlap], start, end - start, end + overlap >= len(text), fence,
+             validator.counter.name)
+            for start, end, fence in zip(points, ends, fences)]
+
+    if len(jobs) == 1:
+        partials = [scan_chunk(*jobs[0])]
+    else:
+        import concurrent.futures
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            partials = list(executor.map(scan_chunk, *zip(*jobs)))
+
+    # Chunks after one whose matches ran past its end were scanned from the
+    # wrong starting state: redo them here with the carried state
+    placeholder_ends: Dict[str, int] = {}
+    for index in range(1, len(partials)):
+        carry = partials[index - 1]['carry']
+        for kind, end in carry['placeholder_ends'].items():
+            placeholder_ends[kind] = max(end, placeholder_ends.get(kind, 0))
+        carry = dict(carry, placeholder_ends=placeholder_ends)
+        if _carries_over(carry, points[index]):
+            partials[index] = scan_chunk(*jobs[index], carry)
+
+    return merge_partials(text, partials, validator.PLACEHOLDER_KEYWORDS + ('...',))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - File Watcher
+
+Reports which files in one directory were saved or removed, for
+`validator.py --watch`. On Linux it uses inotify (through ctypes, no extra
+package) and wakes within milliseconds of a save; elsewhere, or if inotify
+is unavailable, it polls file stats. Events arriving close together are
+batched so an editor's write-then-rename save is reported once.
+"""
+
+import os
+import sys
+import select
+import fnmatch
+from time import monotonic, sleep
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+
+# How long a directory must stay quiet before a batch of changes is reported,
+# and the longest a batch waits for that while events keep arriving
+DEFAULT_SETTLE = 0.02
+DEFAULT_MAX_SETTLE = 0.5
+
+# Seconds between directory scans when polling
+DEFAULT_POLL_INTERVAL = 0.25
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_ISDIR = 0x40000000
+
+# A save is the close after writing, or a rename into place; creation alone
+# is not (the file may still be empty)
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+
+class PollingWatcher:
+    """Finds changes by comparing (mtime, size, inode) of matching files between scans."""
+
+    def __init__(self, directory: Path, pattern: str = '*.md',
+                 interval: float = DEFAULT_POLL_INTERVAL):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.interval = interval
+        self._stats = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int, int]]:
+        stats = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if _matches(entry.name, self.pattern) and entry.is_file():
+                    stat = entry.stat()
+                    stats[str(self.directory / entry.name)] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        return stats
+
+    def wait(self, timeout: Optional[float] = None) -> Tuple[Set[str], Set[str]]:
+        """
+        Block until something changes (or timeout seconds pass).
+
+        Returns:
+            (paths saved or created, paths removed); both empty on timeout
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            stats = self._snapshot()
+            changed = {path for path, stat in stats.items() if self._stats.get(path) != stat}
+            removed = set(self._stats) - set(stats)
+            self._stats = stats
+            if changed or removed:
+                return changed, removed
+            if deadline is not None and monotonic() >= deadline:
+                return set(), set()
+            sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watch on one directory, read without blocking the process."""
+
+    def __init__(self, directory: Path, pattern: str = '*.md', settle: float = DEFAULT_SETTLE,
+                 max_settle: float = DEFAULT_MAX_SETTLE):
+        import ctypes
+
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.settle = settle
+        self.max_settle = max_settle
+        # The running interpreter already links libc
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(self._fd, os.fsencode(str(self.directory)), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f'inotify_add_watch failed for {self.directory}')
+        # Matching files as of the last report; after lost events, the ones
+        # missing from a rescan are reported as removed
+        self._known = self._listing()
+
+    def _listing(self) -> Set[str]:
+        """Paths of the matching files now in the directory."""
+        with os.scandir(self.directory) as entries:
+            return {str(self.directory / entry.name) for entry in entries
+                    if _matches(entry.name, self.pattern) and entry.is_file()}
+
+    def _read(self, changed: Set[str], removed: Set[str]) -> bool:
+        """Drain pending events into changed/removed; False if the queue overflowed."""
+        import struct
+
+        header = struct.Struct('iIII')
+        while True:
+            try:
+                data = os.read(self._fd, 1 << 16)
+            except BlockingIOError:
+                return True
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = header.unpack_from(data, offset)
+                offset += header.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return False
+                if mask & IN_ISDIR or not _matches(name, self.pattern):
+                    continue
+                path = str(self.directory / name)
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    changed.discard(path)
+                    removed.add(path)
+                else:
+                    removed.discard(path)
+                    changed.add(path)
+
+    def wait(self, timeout: Optional[float] = None) -> Tuple[Set[str], Set[str]]:
+        """
+        Block until something changes (or timeout seconds pass).
+
+        Returns:
+            (paths saved or created, paths removed); both empty on timeout
+        """
+        changed: Set[str] = set()
+        removed: Set[str] = set()
+        deadline = None if timeout is None else monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - monotonic())
+            if not select.select([self._fd], [], [], remaining)[0]:
+                return changed, removed
+            overflowed = not self._read(changed, removed)
+            # Let the rest of a multi-step save arrive before reporting, but
+            # not forever if a file is being written continuously
+            settle_end = monotonic() + self.max_settle
+            while True:
+                quiet = min(self.settle, settle_end - monotonic())
+                if quiet <= 0 or not select.select([self._fd], [], [], quiet)[0]:
+                    break
+                if not self._read(changed, removed):
+                    overflowed = True
+            if overflowed:
+                # Events were lost: report every matching file as changed,
+                # and every known one that is gone as removed
+                changed = self._listing()
+                removed = (removed | self._known) - changed
+            else:
+                # Created-then-deleted temp files and the like
+                changed = {path for path in changed if os.path.isfile(path)}
+            if changed or removed:
+                self._known = (self._known | changed) - removed
+                return changed, removed
+
+    def close(self):
+        os.close(self._fd)
+
+
+def _matches(name: str, pattern: str) -> bool:
+    """Same rule as Path.glob(pattern): dotfiles only match dotted patterns."""
+    return fnmatch.fnmatchcase(name, pattern) and (pattern.startswith('.') or not name.startswith('.'))
+
+
+def open_watcher(directory: Path, pattern: str = '*.md', poll: bool = False):
+    """
+    Watch directory for files matching pattern.
+
+    Uses inotify on Linux unless poll is set or it cannot be set up (for
+    example when the per-user watch limit is reached); polls otherwise.
+
+    Returns:
+        A watcher with wait(timeout) -> (changed, removed) and close()
+    """
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory, pattern)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory, pattern)
@@ -7,155 +7,44 @@ with quality validation and contextual best practices.
 
 Usage:
     python generate_prompt.py --responses responses.json --format xml --mode core --output prompt.md
-    python generate_prompt.py --preset fullstack-engineer --format all --mode advanced --output prompt.md
+    python generate_prompt.py --preset hr-manager --format all --mode advanced --output prompt.md
 """
 
 import json
 import argparse
 import re
+import threading
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator, TextIO, Callable, TYPE_CHECKING
+from collections.abc import Mapping
 from pathlib import Path
-
-
-class PromptGenerator:
-    """Enhanced prompt generator with multi-format support and quality validation."""
-
-    def __init__(self):
-        self.validation_score = 0
-        self.validation_issues = []
-
-    def load_responses(self, filepath: str) -> Dict[str, Any]:
-        """Load questionnaire responses from JSON file."""
-        with open(filepath, 'r') as f:
-            return json.load(f)
-
-    def load_preset(self, preset_name: str) -> Dict[str, Any]:
-        """Load a quick-start preset template."""
-        preset_path = Path(__file__).parent.parent / 'templates' / 'presets'
-
-        # Map preset names to files
-        preset_map = {
-            'fullstack-engineer': 'technical/fullstack-engineer.md',
-            'ml-engineer': 'technical/ml-engineer.md',
-            'devops-engineer': 'technical/devops-engineer.md',
-            'mobile-engineer': 'technical/mobile-engineer.md',
-            'solutions-architect': 'technical/solutions-architect.md',
-            'product-manager': 'business/product-manager.md',
-            'marketing-strategist': 'business/marketing-strategist.md',
-            'business-analyst': 'business/business-analyst.md',
-            'operations-manager': 'business/operations-manager.md',
-            'content-strategist': 'creative/content-strategist.md',
-            'ux-designer': 'creative/ux-designer.md',
-            'technical-writer': 'creative/technical-writer.md',
-            'healthcare-consultant': 'specialized/healthcare-consultant.md',
-            'fintech-advisor': 'specialized/fintech-advisor.md',
-            'legal-specialist': 'specialized/legal-specialist.md',
-        }
-
-        if preset_name not in preset_map:
-            raise ValueError(f"Unknown preset: {preset_name}")
-
-        preset_file = preset_path / preset_map[preset_name]
-
-        if not preset_file.exists():
-            raise FileNotFoundError(f"Preset file not found: {preset_file}")
-
-        content = preset_file.read_text(encoding='utf-8')
-
-        # Extract front matter (--- delimited key: value pairs)
-        front_matter: Dict[str, str] = {}
-        body = content
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                front_block = parts[1]
-                body = parts[2]
-                for line in front_block.strip().splitlines():
-                    if ':' not in line:
-                        continue
-                    key, value = line.split(':', 1)
-                    front_matter[key.strip()] = value.strip()
-
-        def extract_markdown_value(label: str) -> Optional[str]:
-            pattern = rf"\*\*{re.escape(label)}:\*\*\s*([^\n]+)"
-            match = re.search(pattern, body)
-            if match:
-                return match.group(1).strip()
-            return None
-
-        # Map front matter and markdown fields to response values
-        role = front_matter.get('role') if front_matter.get('role') is not None else (extract_markdown_value('Role') or preset_name.replace('-', ' ').title())
-        domain = front_matter.get('domain') if front_matter.get('domain') is not None else extract_markdown_value('Domain')
-        output_type = front_matter.get('output_type') if front_matter.get('output_type') is not None else extract_markdown_value('Output Type')
-        tone = front_matter.get('tone') if front_matter.get('tone') is not None else extract_markdown_value('Tone')
-        tech_stack = front_matter.get('tech_stack') if front_matter.get('tech_stack') is not None else extract_markdown_value('Tech Stack')
-
-        defaults: Dict[str, Any] = {**front_matter}
-        if domain:
-            defaults['domain'] = domain
-        if output_type:
-            defaults['output_type'] = output_type
-        if tone:
-            defaults['tone'] = tone
-        if tech_stack:
-            defaults['tech_stack'] = tech_stack
-
-        return {
-            'role': role,
-            'preset': preset_name,
-            'template': preset_map[preset_name],
-            'domain': domain,
-            'output_type': output_type,
-            'tone': tone,
-            'tech_stack': tech_stack,
-            'defaults': defaults,
-        }
-
-    def generate_xml_format(self, responses: Dict[str, Any]) -> str:
-        """Generate prompt in XML format."""
-        role = responses.get('role', 'Expert AI Assistant')
-        role_context = responses.get('role_context', '')
-        domain = responses.get('domain', '')
-        goal = responses.get('goal', 'assist the user effectively')
-        output_type = responses.get('output_type', 'comprehensive response')
-        success_criteria = responses.get('success_criteria', 'Meeting user requirements with high quality')
-        tech_stack = responses.get('tech_stack', '')
-        constraints = responses.get('constraints', '')
-        must_avoid = responses.get('must_avoid', '')
-        target_audience = responses.get('target_audience', 'general')
-        tone = responses.get('tone', 'professional')
-        detail_level = responses.get('detail_level', 'moderate')
-        format_preference = responses.get('format_preference', 'mixed')
-
-        # Build role section
-        role_text = f"{role}"
-        if role_context:
-            role_text += f" with expertise in {role_context}"
-        if domain:
-            role_text += f", specializing in {domain}"
-
-        # Build context section
-        context_parts = []
-        if domain:
-            context_parts.append(f"  <domain>{domain}</domain>")
-        if tech_stack:
-            context_parts.append(f"  <tech_stack>{tech_stack}</tech_stack>")
-        if constraints:
-            context_parts.append(f"  <constraints>{constraints}</constraints>")
-        if must_avoid:
-            context_parts.append(f"  <avoidance_rules>{must_avoid}</avoidance_rules>")
-
-        context_content = "\n".join(context_parts) if context_parts else "  <domain>General</domain>"
-
-        # Get workflow based on output type
-        workflow = self._get_workflow_for_output_type(output_type)
-
-        # Generate best practices
-        best_practices = self._get_best_practices(output_type, domain)
-
-        # Build the prompt
-        prompt = f"""<mega_prompt>
+from template_engine import compile_template
+from quality_gates import GateRegistry, GateContext, GateOutcome
+from render_cache import RenderCache, DEFAULT_CACHE_PATH
+
+if TYPE_CHECKING:
+    # Imported on first preset lookup; generating from --responses never needs them
+    from preset_catalog import PresetCatalog, PresetBundle, PresetCache
+    # Imported on first use, keeping them (and their compiled patterns) out of --help
+    from xml_structure import TagTree
+    from profiling import StageProfiler
+
+
+# Part of every render cache key. Template and table edits are detected by
+# fingerprint; bump this for changes to field resolution or validation.
+GENERATOR_VERSION = '1.2'
+
+# Response keys the renderers read; nothing else can change a rendered prompt
+RESPONSE_FIELDS = (
+    'role', 'role_context', 'domain', 'goal', 'output_type', 'success_criteria',
+    'tech_stack', 'constraints', 'must_avoid', 'target_audience', 'tone',
+    'detail_level', 'format_preference',
+)
+
+# Format skeletons. {field} placeholders are filled by the matching
+# PromptGenerator._*_fields method; each skeleton is compiled once into a
+# renderer by template_engine.compile_template.
+XML_TEMPLATE = """<mega_prompt>
 
 <role>
 {role_text}
@@ -193,7 +82,7 @@ Success is defined by: {success_criteria}
   <priority_1>
     - Ensure all information is accurate and verified
     - Follow ALL constraints specified in the context section
-    {f'- DO NOT include or suggest: {must_avoid}' if must_avoid else ''}
+    {avoid_rule}
   </priority_1>
 
   <priority_2>
@@ -230,7 +119,7 @@ Success is defined by: {success_criteria}
 </examples>
 
 <execution_trigger>
-You are now fully configured as {role}{f' specialized in {domain}' if domain else ''}.
+You are now fully configured as {role}{specialization}.
 
 When the user provides a request:
 1. Analyze their specific needs using the workflow above
@@ -243,24 +132,9 @@ Begin assisting the user now with this configuration.
 
 </mega_prompt>"""
 
-        return prompt
-
-    def generate_claude_format(self, responses: Dict[str, Any]) -> str:
-        """Generate prompt optimized for Claude."""
-        role = responses.get('role', 'Expert AI Assistant')
-        domain = responses.get('domain', '')
-        goal = responses.get('goal', 'assist the user effectively')
-        output_type = responses.get('output_type', 'comprehensive response')
-        tech_stack = responses.get('tech_stack', '')
-        constraints = responses.get('constraints', '')
-        tone = responses.get('tone', 'professional')
-        detail_level = responses.get('detail_level', 'moderate')
-
-        workflow_steps = self._get_workflow_steps(output_type)
+CLAUDE_TEMPLATE = """# System Configuration: {role}
 
-        prompt = f"""# System Configuration: {role}
-
-You are {role}{f' specialized in {domain}' if domain else ''}.
+You are {role}{specialization}.
 
 ## Your Mission
 
@@ -268,8 +142,8 @@ You are {role}{f' specialized in {domain}' if domain else ''}.
 
 ## Your Expertise
 
-{f'Domain: {domain}' if domain else 'General expertise across domains'}
-{f'Technical Stack: {tech_stack}' if tech_stack else ''}
+{expertise}
+{tech_stack_line}
 
 ## Your Workflow
 
@@ -291,7 +165,7 @@ When given a task:
 ## Critical Rules
 
 **Must follow:**
-{f'- Constraints: {constraints}' if constraints else '- Follow standard best practices'}
+{constraints_rule}
 - Verify all information is accurate
 - Provide complete, actionable solutions
 - Include relevant examples
@@ -304,7 +178,7 @@ When given a task:
 
 ## Best Practices
 
-{self._get_best_practices_list(output_type, domain)}
+{best_practices}
 
 ## Response Examples
 
@@ -315,31 +189,19 @@ When given a task:
 Execute your role now, following all guidelines above. When the user makes a request, apply this configuration to deliver high-quality, comprehensive responses.
 """
 
-        return prompt
-
-    def generate_chatgpt_format(self, responses: Dict[str, Any]) -> str:
-        """Generate prompt for ChatGPT custom instructions."""
-        role = responses.get('role', 'Expert AI Assistant')
-        domain = responses.get('domain', '')
-        goal = responses.get('goal', 'assist effectively')
-        output_type = responses.get('output_type', 'comprehensive response')
-        tech_stack = responses.get('tech_stack', '')
-        constraints = responses.get('constraints', '')
-        tone = responses.get('tone', 'professional')
-        detail_level = responses.get('detail_level', 'moderate')
-        format_preference = responses.get('format_preference', 'mixed')
+CHATGPT_TEMPLATE = """**What would you like ChatGPT to know about you to provide better responses?**
 
-        about_section = f"""I need you to act as {role}{f' specialized in {domain}' if domain else ''}.
+I need you to act as {role}{specialization}.
 
-My domain: {domain if domain else 'General'}
-{f'My tech stack: {tech_stack}' if tech_stack else ''}
-{f'My constraints: {constraints}' if constraints else ''}
+My domain: {domain_label}
+{tech_stack_line}
+{constraints_line}
 
-My goal: {goal}"""
+My goal: {goal}
 
-        workflow_steps = self._get_workflow_steps(output_type)
+**How would you like ChatGPT to respond?**
 
-        response_section = f"""WORKFLOW:
+WORKFLOW:
 {workflow_steps}
 
 OUTPUT REQUIREMENTS:
@@ -349,37 +211,19 @@ OUTPUT REQUIREMENTS:
 - Quality: Production-ready, complete, accurate
 
 CRITICAL RULES:
-{f'- Constraints: {constraints}' if constraints else '- Follow best practices'}
+{constraints_rule}
 - Verify accuracy
 - Provide complete solutions
 - Include examples
 - Handle edge cases
 
 BEST PRACTICES:
-{self._get_best_practices_list(output_type, domain)}
+{best_practices}
 
 Always provide {format_preference} responses with concrete examples and ensure {output_type} meets production quality standards."""
 
-        return f"""**What would you like ChatGPT to know about you to provide better responses?**
-
-{about_section}
-
-**How would you like ChatGPT to respond?**
-
-{response_section}"""
-
-    def generate_gemini_format(self, responses: Dict[str, Any]) -> str:
-        """Generate prompt optimized for Google Gemini."""
-        role = responses.get('role', 'Expert AI Assistant')
-        domain = responses.get('domain', '')
-        goal = responses.get('goal', 'assist effectively')
-        output_type = responses.get('output_type', 'comprehensive response')
-        detail_level = responses.get('detail_level', 'moderate')
-
-        workflow_simple = self._get_workflow_simple(output_type)
-
-        prompt = f"""## Role Configuration
-You are: {role}{f' specialized in {domain}' if domain else ''}
+GEMINI_TEMPLATE = """## Role Configuration
+You are: {role}{specialization}
 
 ## Task Approach
 {workflow_simple}
@@ -402,12 +246,60 @@ You are: {role}{f' specialized in {domain}' if domain else ''}
 Apply this configuration to all responses. Maintain this role and follow these standards consistently.
 """
 
-        return prompt
 
-    def _get_workflow_for_output_type(self, output_type: str) -> str:
-        """Get detailed workflow XML for given output type."""
-        workflows = {
-            'code': """<workflow>
+class LazyResults(Mapping):
+    """Read-only, dict-compatible mapping whose values are computed on first access.
+
+    Iteration, len() and membership tests never trigger computation; items(),
+    values() and dict(...) compute every entry.
+    """
+
+    def __init__(self, keys: List[str], compute: Callable[[str], Any]):
+        self._keys = list(keys)
+        self._compute = compute
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            if key not in self._keys:
+                raise
+        value = self._values[key] = self._compute(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def is_computed(self, key: str) -> bool:
+        """Whether the value for key has already been computed."""
+        return key in self._values
+
+    def __repr__(self) -> str:
+        shown = {key: (self._values[key] if key in self._values else '<pending>') for key in self._keys}
+        return f"{type(self).__name__}({shown!r})"
+
+
+class PromptGenerator:
+    """Enhanced prompt generator with multi-format support and quality validation."""
+
+    # Renderer method for each output format
+    RENDERERS = {
+        'xml': 'generate_xml_format',
+        'claude': 'generate_claude_format',
+        'chatgpt': 'generate_chatgpt_format',
+        'gemini': 'generate_gemini_format',
+    }
+
+    # Static sections keyed by output_type, built once at import
+    XML_WORKFLOWS = {
+        'code': """<workflow>
   <analysis_phase>
     1. Understand requirements and technical constraints
     2. Identify key components and dependencies
@@ -436,7 +328,7 @@ Apply this configuration to all responses. Maintain this role and follow these s
     4. Confirm security best practices
   </validation>
 </workflow>""",
-            'documentation': """<workflow>
+        'documentation': """<workflow>
   <analysis_phase>
     1. Understand the subject matter and audience
     2. Identify key concepts to document
@@ -458,7 +350,7 @@ Apply this configuration to all responses. Maintain this role and follow these s
     4. Optimize for readability
   </refinement>
 </workflow>""",
-            'strategy': """<workflow>
+        'strategy': """<workflow>
   <analysis_phase>
     1. Assess current situation and challenges
     2. Analyze market dynamics and competition
@@ -480,7 +372,7 @@ Apply this configuration to all responses. Maintain this role and follow these s
     4. Plan risk mitigation strategies
   </implementation_planning>
 </workflow>""",
-            'analysis': """<workflow>
+        'analysis': """<workflow>
   <data_gathering>
     1. Identify relevant data sources
     2. Collect and validate data
@@ -502,48 +394,36 @@ Apply this configuration to all responses. Maintain this role and follow these s
     4. Address limitations and caveats
   </insight_generation>
 </workflow>"""
-        }
-
-        return workflows.get(output_type, workflows['code'])
+    }
 
-    def _get_workflow_steps(self, output_type: str) -> str:
-        """Get workflow steps as numbered list."""
-        workflows = {
-            'code': """1. Analyze requirements and constraints
+    WORKFLOW_STEPS = {
+        'code': """1. Analyze requirements and constraints
 2. Design solution architecture
 3. Implement with best practices
 4. Validate and test thoroughly""",
-            'documentation': """1. Understand audience and content needs
+        'documentation': """1. Understand audience and content needs
 2. Create structured outline
 3. Write clear, comprehensive content
 4. Review and refine for clarity""",
-            'strategy': """1. Assess current situation
+        'strategy': """1. Assess current situation
 2. Develop strategic options
 3. Evaluate and recommend
 4. Plan implementation""",
-            'analysis': """1. Gather and validate data
+        'analysis': """1. Gather and validate data
 2. Execute analytical methods
 3. Generate insights
 4. Provide recommendations"""
-        }
-
-        return workflows.get(output_type, workflows['code'])
+    }
 
-    def _get_workflow_simple(self, output_type: str) -> str:
-        """Get simplified workflow for Gemini."""
-        workflows = {
-            'code': "Analyze → Design → Implement → Validate",
-            'documentation': "Research → Outline → Write → Refine",
-            'strategy': "Assess → Strategize → Recommend → Plan",
-            'analysis': "Collect Data → Analyze → Generate Insights → Recommend"
-        }
+    SIMPLE_WORKFLOWS = {
+        'code': "Analyze → Design → Implement → Validate",
+        'documentation': "Research → Outline → Write → Refine",
+        'strategy': "Assess → Strategize → Recommend → Plan",
+        'analysis': "Collect Data → Analyze → Generate Insights → Recommend"
+    }
 
-        return workflows.get(output_type, "Analyze → Plan → Execute → Validate")
-
-    def _get_best_practices(self, output_type: str, domain: str) -> str:
-        """Get best practices XML section."""
-        practices = {
-            'code': """<best_practices>
+    XML_BEST_PRACTICES = {
+        'code': """<best_practices>
 **OpenAI Best Practices:**
 - Write clear, specific instructions
 - Provide examples for complex patterns
@@ -565,7 +445,7 @@ Apply this configuration to all responses. Maintain this role and follow these s
 - Consider security implications
 - Optimize for performance
 </best_practices>""",
-            'documentation': """<best_practices>
+        'documentation': """<best_practices>
 **OpenAI Best Practices:**
 - Structure content logically
 - Use clear, concise language
@@ -587,7 +467,7 @@ Apply this configuration to all responses. Maintain this role and follow these s
 - Troubleshooting guidance
 - Keep content updated
 </best_practices>""",
-            'strategy': """<best_practices>
+        'strategy': """<best_practices>
 **OpenAI Best Practices:**
 - Data-driven recommendations
 - Clear reasoning
@@ -609,105 +489,356 @@ Apply this configuration to all responses. Maintain this role and follow these s
 - Resource considerations
 - Change management
 </best_practices>"""
-        }
-
-        return practices.get(output_type, practices['code'])
+    }
 
-    def _get_best_practices_list(self, output_type: str, domain: str) -> str:
-        """Get best practices as bullet list."""
-        practices = {
-            'code': """- Follow language-specific idioms and conventions
+    BEST_PRACTICES_LISTS = {
+        'code': """- Follow language-specific idioms and conventions
 - Write self-documenting code
 - Implement comprehensive error handling
 - Include proper testing
 - Consider security and performance""",
-            'documentation': """- Use clear, concise language
+        'documentation': """- Use clear, concise language
 - Structure content logically
 - Include practical examples
 - Maintain consistent terminology
 - Keep content updated""",
-            'strategy': """- Base on data and evidence
+        'strategy': """- Base on data and evidence
 - Consider multiple scenarios
 - Provide clear rationale
 - Include risk assessment
 - Define measurable success criteria"""
-        }
+    }
 
-        return practices.get(output_type, practices['code'])
+    # Lazily computed hash of the templates and tables, shared by all instances
+    _render_fingerprint: Optional[str] = None
 
-    def validate_prompt(self, prompt: str, format_type: str) -> tuple:
-        """
-        Validate prompt against 7 quality gates.
-        Returns (score, issues_list)
-        """
-        score = 0
-        issues = []
+    def __init__(self, catalog: Optional['PresetCatalog'] = None, preset_cache_size: int = 128,
+                 use_bundle: bool = True, render_cache: Optional[RenderCache] = None,
+                 profiler: Optional['StageProfiler'] = None, tokenizer: Optional[str] = None):
+        from token_counter import get_counter
 
-        # Gate 1: XML structure (if XML format)
-        if format_type == 'xml':
-            if self._validate_xml_structure(prompt):
-                score += 1
-            else:
-                issues.append("XML structure invalid: unclosed tags detected")
-        else:
-            score += 1  # N/A for non-XML formats
+        self.validation_score = 0
+        self.validation_issues = []
+        self.catalog = catalog
+        self.render_cache = render_cache
+        self.profiler = profiler
+        # Shared token_counter backend for the token gate
+        self.counter = get_counter(tokenizer)
+        self.bundle: Optional['PresetBundle'] = None
+        self._preset_cache: Optional['PresetCache'] = None
+        self._preset_cache_size = preset_cache_size
+        self._catalog_lock = threading.Lock()
+        self._bundle_checked = not use_bundle
+
+    @property
+    def preset_cache(self) -> 'PresetCache':
+        """LRU of parsed presets, created on first use."""
+        if self._preset_cache is None:
+            with self._catalog_lock:
+                if self._preset_cache is None:
+                    from preset_catalog import PresetCache
+                    self._preset_cache = PresetCache(maxsize=self._preset_cache_size)
+        return self._preset_cache
 
-        # Gate 2: Completeness (no empty sections)
-        if self._validate_completeness(prompt):
-            score += 1
-        else:
-            issues.append("Incomplete: empty sections detected")
+    def load_responses(self, filepath: str) -> Dict[str, Any]:
+        """Load questionnaire responses from JSON file."""
+        with open(filepath, 'r') as f:
+            return json.load(f)
 
-        # Gate 3: Token count reasonable
-        token_count = len(prompt.split())
-        if token_count < 8000:
-            score += 1
+    def load_preset(self, preset_name: str) -> Dict[str, Any]:
+        """Load a quick-start preset template from the bundle or preset catalog."""
+        profiler = self.profiler
+        if profiler is not None:
+            started = profiler.now()
+
+        bundle = self._get_bundle()
+
+        if bundle is not None and preset_name in bundle:
+            # Cold-start fast path: one bundle read plus one stat, no catalog load
+            def loader(signature):
+                record = bundle.read_record(preset_name, signature)
+                if record is None:
+                    record = self._get_catalog().read_record(preset_name, signature)
+                return record
+
+            preset_path = bundle.path_for(preset_name)
         else:
-            issues.append(f"Token count high: ~{token_count} words (recommended < 8000)")
+            catalog = self._get_catalog()
 
-        # Gate 4: No placeholders
-        if not re.search(r'\[TODO\]|\[FILL.*?\]|\[\.\.\..*?\]', prompt):
-            score += 1
-        else:
-            issues.append("Placeholder text found (TODO, FILL, etc.)")
+            def loader(signature):
+                return catalog.read_record(preset_name, signature)
 
-        # Gate 5: Workflow present
-        if 'workflow' in prompt.lower() or 'process' in prompt.lower():
-            score += 1
-        else:
-            issues.append("No clear workflow/process defined")
+            preset_path = catalog.path_for(preset_name)
 
-        # Gate 6: Best practices mentioned
-        if 'best practice' in prompt.lower() or 'guideline' in prompt.lower():
-            score += 1
-        else:
-            issues.append("Best practices section missing or incomplete")
+        record = self.preset_cache.get(preset_name, preset_path, loader)
 
-        # Gate 7: Examples present
-        if 'example' in prompt.lower() and prompt.lower().count('example') >= 2:
-            score += 1
-        else:
-            issues.append("Insufficient examples (need at least 2)")
+        if profiler is not None:
+            profiler.record('preset_load', started)
+
+        defaults: Dict[str, Any] = {**record['front_matter']}
+        for key in ('domain', 'output_type', 'tone', 'tech_stack'):
+            if record[key]:
+                defaults[key] = record[key]
 
+        return {
+            'role': record['role'],
+            'preset': preset_name,
+            'template': record['template'],
+            'domain': record['domain'],
+            'output_type': record['output_type'],
+            'tone': record['tone'],
+            'tech_stack': record['tech_stack'],
+            'defaults': defaults,
+        }
+
+    def find_presets(self, query: str, limit: int = 5, **criteria: Optional[str]) -> List[Dict[str, Any]]:
+        """Rank presets against a task description, optionally filtered by metadata."""
+        return [record for _, record in self._get_catalog().search(query, limit, **criteria)]
+
+    def _get_catalog(self) -> 'PresetCatalog':
+        """Load the preset catalog on first use (safe to call from worker threads)."""
+        if self.catalog is None:
+            with self._catalog_lock:
+                if self.catalog is None:
+                    from preset_catalog import PresetCatalog
+                    self.catalog = PresetCatalog.load()
+        return self.catalog
+
+    def _get_bundle(self) -> Optional['PresetBundle']:
+        """Load the compiled preset bundle on first use, if one has been built."""
+        if not self._bundle_checked:
+            with self._catalog_lock:
+                if not self._bundle_checked:
+                    from preset_catalog import PresetBundle
+                    self.bundle = PresetBundle.load()
+                    self._bundle_checked = True
+        return self.bundle
+
+    def generate_xml_format(self, responses: Dict[str, Any]) -> str:
+        """Generate prompt in XML format."""
+        return compile_template(XML_TEMPLATE, 'xml_template')(self._xml_fields(responses))
+
+    def generate_claude_format(self, responses: Dict[str, Any]) -> str:
+        """Generate prompt optimized for Claude."""
+        return compile_template(CLAUDE_TEMPLATE, 'claude_template')(self._claude_fields(responses))
+
+    def generate_chatgpt_format(self, responses: Dict[str, Any]) -> str:
+        """Generate prompt for ChatGPT custom instructions."""
+        return compile_template(CHATGPT_TEMPLATE, 'chatgpt_template')(self._chatgpt_fields(responses))
+
+    def generate_gemini_format(self, responses: Dict[str, Any]) -> str:
+        """Generate prompt optimized for Google Gemini."""
+        return compile_template(GEMINI_TEMPLATE, 'gemini_template')(self._gemini_fields(responses))
+
+    def _xml_fields(self, responses: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve XML template fields from questionnaire responses."""
+        role = responses.get('role', 'Expert AI Assistant')
+        role_context = responses.get('role_context', '')
+        domain = responses.get('domain', '')
+        output_type = responses.get('output_type', 'comprehensive response')
+        tech_stack = responses.get('tech_stack', '')
+        constraints = responses.get('constraints', '')
+        must_avoid = responses.get('must_avoid', '')
+
+        # Build role section
+        role_text = f"{role}"
+        if role_context:
+            role_text += f" with expertise in {role_context}"
+        if domain:
+            role_text += f", specializing in {domain}"
+
+        # Build context section
+        context_parts = []
+        if domain:
+            context_parts.append(f"  <domain>{domain}</domain>")
+        if tech_stack:
+            context_parts.append(f"  <tech_stack>{tech_stack}</tech_stack>")
+        if constraints:
+            context_parts.append(f"  <constraints>{constraints}</constraints>")
+        if must_avoid:
+            context_parts.append(f"  <avoidance_rules>{must_avoid}</avoidance_rules>")
+
+        return {
+            'role': role,
+            'role_text': role_text,
+            'specialization': f' specialized in {domain}' if domain else '',
+            'goal': responses.get('goal', 'assist the user effectively'),
+            'success_criteria': responses.get('success_criteria', 'Meeting user requirements with high quality'),
+            'context_content': "\n".join(context_parts) if context_parts else "  <domain>General</domain>",
+            'workflow': self._get_workflow_for_output_type(output_type),
+            'output_type': output_type,
+            'format_preference': responses.get('format_preference', 'mixed'),
+            'detail_level': responses.get('detail_level', 'moderate'),
+            'tone': responses.get('tone', 'professional'),
+            'target_audience': responses.get('target_audience', 'general'),
+            'best_practices': self._get_best_practices(output_type, domain),
+            'avoid_rule': f'- DO NOT include or suggest: {must_avoid}' if must_avoid else '',
+        }
+
+    def _claude_fields(self, responses: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve Claude template fields from questionnaire responses."""
+        domain = responses.get('domain', '')
+        output_type = responses.get('output_type', 'comprehensive response')
+        tech_stack = responses.get('tech_stack', '')
+        constraints = responses.get('constraints', '')
+
+        return {
+            'role': responses.get('role', 'Expert AI Assistant'),
+            'specialization': f' specialized in {domain}' if domain else '',
+            'goal': responses.get('goal', 'assist the user effectively'),
+            'expertise': f'Domain: {domain}' if domain else 'General expertise across domains',
+            'tech_stack_line': f'Technical Stack: {tech_stack}' if tech_stack else '',
+            'workflow_steps': self._get_workflow_steps(output_type),
+            'output_type': output_type,
+            'detail_level': responses.get('detail_level', 'moderate'),
+            'tone': responses.get('tone', 'professional'),
+            'constraints_rule': f'- Constraints: {constraints}' if constraints else '- Follow standard best practices',
+            'best_practices': self._get_best_practices_list(output_type, domain),
+        }
+
+    def _chatgpt_fields(self, responses: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve ChatGPT template fields from questionnaire responses."""
+        domain = responses.get('domain', '')
+        output_type = responses.get('output_type', 'comprehensive response')
+        tech_stack = responses.get('tech_stack', '')
+        constraints = responses.get('constraints', '')
+
+        return {
+            'role': responses.get('role', 'Expert AI Assistant'),
+            'specialization': f' specialized in {domain}' if domain else '',
+            'domain_label': domain if domain else 'General',
+            'tech_stack_line': f'My tech stack: {tech_stack}' if tech_stack else '',
+            'constraints_line': f'My constraints: {constraints}' if constraints else '',
+            'goal': responses.get('goal', 'assist effectively'),
+            'workflow_steps': self._get_workflow_steps(output_type),
+            'output_type': output_type,
+            'tone': responses.get('tone', 'professional'),
+            'detail_level': responses.get('detail_level', 'moderate'),
+            'format_preference': responses.get('format_preference', 'mixed'),
+            'constraints_rule': f'- Constraints: {constraints}' if constraints else '- Follow best practices',
+            'best_practices': self._get_best_practices_list(output_type, domain),
+        }
+
+    def _gemini_fields(self, responses: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve Gemini template fields from questionnaire responses."""
+        domain = responses.get('domain', '')
+        output_type = responses.get('output_type', 'comprehensive response')
+
+        return {
+            'role': responses.get('role', 'Expert AI Assistant'),
+            'specialization': f' specialized in {domain}' if domain else '',
+            'workflow_simple': self._get_workflow_simple(output_type),
+            'output_type': output_type,
+            'detail_level': responses.get('detail_level', 'moderate'),
+        }
+
+    def _get_workflow_for_output_type(self, output_type: str) -> str:
+        """Get detailed workflow XML for given output type."""
+        return self.XML_WORKFLOWS.get(output_type, self.XML_WORKFLOWS['code'])
+
+    def _get_workflow_steps(self, output_type: str) -> str:
+        """Get workflow steps as numbered list."""
+        return self.WORKFLOW_STEPS.get(output_type, self.WORKFLOW_STEPS['code'])
+
+    def _get_workflow_simple(self, output_type: str) -> str:
+        """Get simplified workflow for Gemini."""
+        return self.SIMPLE_WORKFLOWS.get(output_type, "Analyze → Plan → Execute → Validate")
+
+    def _get_best_practices(self, output_type: str, domain: str) -> str:
+        """Get best practices XML section."""
+        return self.XML_BEST_PRACTICES.get(output_type, self.XML_BEST_PRACTICES['code'])
+
+    def _get_best_practices_list(self, output_type: str, domain: str) -> str:
+        """Get best practices as bullet list."""
+        return self.BEST_PRACTICES_LISTS.get(output_type, self.BEST_PRACTICES_LISTS['code'])
+
+    # Same pass threshold as validator.py; gates are reported in this order
+    GATES = GateRegistry(pass_threshold=6)
+
+    def validate_prompt(self, prompt: str, format_type: str) -> tuple:
+        """
+        Validate prompt against 7 quality gates.
+        Returns (score, issues_list)
+        """
+        from xml_structure import scan_tags
+
+        ctx = GateContext(prompt, format_type, {
+            'tags': lambda ctx: scan_tags(ctx.prompt),
+            'lowered': lambda ctx: ctx.prompt.lower(),
+        })
+        outcomes, _ = self.GATES.run(self, ctx)
+
+        score = sum(outcome.points for outcome in outcomes.values())
+        issues = [outcomes[gate.key].issue for gate in self.GATES if outcomes[gate.key].issue]
         return score, issues
 
+    @staticmethod
+    def _gate(passed: bool, issue: str) -> GateOutcome:
+        """One point and no issue if passed, else the issue."""
+        return GateOutcome(int(passed), {'passed': passed}, issue=None if passed else issue)
+
+    @GATES.register('xml_structure', 'XML Structure Valid', cost=2)
+    def _gate_xml_structure(self, ctx: GateContext) -> GateOutcome:
+        """Gate 1: XML structure (if XML format)."""
+        if ctx.format != 'xml':
+            return self._gate(True, '')  # N/A for non-XML formats
+        tags = ctx['tags']
+        return self._gate(tags.valid, f"XML structure invalid: {tags.error and tags.error['message']}")
+
+    @GATES.register('completeness', 'No Empty Sections', cost=3)
+    def _gate_completeness(self, ctx: GateContext) -> GateOutcome:
+        """Gate 2: Completeness (no empty sections)."""
+        return self._gate(self._validate_completeness(ctx.prompt, ctx['tags']),
+                          "Incomplete: empty sections detected")
+
+    @GATES.register('token_count', 'Token Count Reasonable', cost=4)
+    def _gate_token_count(self, ctx: GateContext) -> GateOutcome:
+        """Gate 3: Token count reasonable."""
+        token_count = self.counter.count(ctx.prompt)
+        return self._gate(token_count < 8000,
+                          f"Token count high: ~{token_count} tokens (recommended < 8000)")
+
+    @GATES.register('no_placeholders', 'No Placeholder Text', cost=1)
+    def _gate_no_placeholders(self, ctx: GateContext) -> GateOutcome:
+        """Gate 4: No placeholders."""
+        return self._gate(not re.search(r'\[TODO\]|\[FILL.*?\]|\[\.\.\..*?\]', ctx.prompt),
+                          "Placeholder text found (TODO, FILL, etc.)")
+
+    @GATES.register('actionable_workflow', 'Workflow Actionable', cost=5)
+    def _gate_actionable_workflow(self, ctx: GateContext) -> GateOutcome:
+        """Gate 5: Workflow present."""
+        lowered = ctx['lowered']
+        return self._gate('workflow' in lowered or 'process' in lowered,
+                          "No clear workflow/process defined")
+
+    @GATES.register('best_practices', 'Best Practices Present', cost=5)
+    def _gate_best_practices(self, ctx: GateContext) -> GateOutcome:
+        """Gate 6: Best practices mentioned."""
+        lowered = ctx['lowered']
+        return self._gate('best practice' in lowered or 'guideline' in lowered,
+                          "Best practices section missing or incomplete")
+
+    @GATES.register('examples_present', 'Examples Included', cost=6)
+    def _gate_examples_present(self, ctx: GateContext) -> GateOutcome:
+        """Gate 7: Examples present."""
+        return self._gate(ctx['lowered'].count('example') >= 2,
+                          "Insufficient examples (need at least 2)")
+
     def _validate_xml_structure(self, prompt: str) -> bool:
-        """Validate XML tags are properly closed."""
-        # Find all XML tags
-        opening_tags = re.findall(r'<([^/][^>]*)>', prompt)
-        closing_tags = re.findall(r'</([^>]+)>', prompt)
+        """Validate XML tags are properly nested and closed."""
+        from xml_structure import scan_tags
 
-        # Simple validation: same count of opening and closing
-        return len(opening_tags) == len(closing_tags)
+        return scan_tags(prompt).valid
 
-    def _validate_completeness(self, prompt: str) -> bool:
-        """Check for empty sections."""
-        # Look for tags with no content
-        empty_pattern = r'<([^>]+)>\s*</\1>'
-        return not re.search(empty_pattern, prompt)
+    def _validate_completeness(self, prompt: str, tags: 'TagTree' = None) -> bool:
+        """Check for empty sections (elements with no content)."""
+        from xml_structure import scan_tags
+
+        return not (tags if tags is not None else scan_tags(prompt)).empty_elements()
 
     def generate(self, responses: Dict[str, Any], format_type: str = 'xml',
-                 mode: str = 'core') -> Dict[str, Any]:
+                 mode: str = 'core', lazy: bool = False,
+                 defer_validation: bool = False) -> Dict[str, Any]:
         """
         Generate complete mega-prompt.
 
@@ -715,10 +846,25 @@ Apply this configuration to all responses. Maintain this role and follow these s
             responses: Questionnaire responses
             format_type: 'xml', 'claude', 'chatgpt', 'gemini', or 'all'
             mode: 'core' or 'advanced'
+            lazy: Render each format on first access instead of up front
+            defer_validation: Run the quality gates only when a format's
+                validation entry is read (implied by lazy)
 
         Returns:
             Dict with generated prompt(s) and metadata
         """
+        profiler = self.profiler
+        timings = None
+        if profiler is not None:
+            timings = {}
+            generate_started = profiler.now()
+
+        cache_key = None
+        if self.render_cache is not None:
+            cache_key = self.render_cache.make_key(
+                responses, RESPONSE_FIELDS, format_type, mode, self._cache_version()
+            )
+
         result = {
             'formats': {},
             'metadata': {
@@ -730,6 +876,21 @@ Apply this configuration to all responses. Maintain this role and follow these s
             },
             'validation': {}
         }
+        if timings is not None:
+            result['metadata']['timings'] = timings
+
+        if cache_key is not None:
+            if profiler is not None:
+                started = profiler.now()
+            cached = self.render_cache.get(cache_key)
+            if profiler is not None:
+                profiler.record('cache_lookup', started, timings)
+            if cached is not None:
+                result['formats'] = cached['formats']
+                result['validation'] = cached['validation']
+                if profiler is not None:
+                    profiler.record('generate', generate_started, timings)
+                return result
 
         # Generate requested format(s)
         if format_type == 'all':
@@ -738,39 +899,156 @@ Apply this configuration to all responses. Maintain this role and follow these s
             formats_to_generate = [format_type]
 
         for fmt in formats_to_generate:
-            if fmt == 'xml':
-                prompt = self.generate_xml_format(responses)
-            elif fmt == 'claude':
-                prompt = self.generate_claude_format(responses)
-            elif fmt == 'chatgpt':
-                prompt = self.generate_chatgpt_format(responses)
-            elif fmt == 'gemini':
-                prompt = self.generate_gemini_format(responses)
-            else:
+            if fmt not in self.RENDERERS:
                 raise ValueError(f"Unknown format: {fmt}")
 
-            # Validate
-            score, issues = self.validate_prompt(prompt, fmt)
+        if lazy or defer_validation:
+            # Deferred results are never written back to the render cache:
+            # that would force every render and gate the caller skipped
+            if lazy:
+                formats = LazyResults(formats_to_generate,
+                                      lambda fmt: self._render_format(responses, fmt, timings))
+            else:
+                formats = {fmt: self._render_format(responses, fmt, timings)
+                           for fmt in formats_to_generate}
+            result['formats'] = formats
+            result['validation'] = LazyResults(
+                formats_to_generate,
+                lambda fmt: self._validation_entry(formats[fmt], fmt, timings)
+            )
+            if profiler is not None:
+                profiler.record('generate', generate_started, timings)
+            return result
 
+        for fmt in formats_to_generate:
+            prompt = self._render_format(responses, fmt, timings)
             result['formats'][fmt] = prompt
-            result['validation'][fmt] = {
-                'score': score,
-                'max_score': 7,
-                'passed': score >= 6,
-                'issues': issues
-            }
+            result['validation'][fmt] = self._validation_entry(prompt, fmt, timings)
+
+        if cache_key is not None:
+            if profiler is not None:
+                started = profiler.now()
+            self.render_cache.put(cache_key, {
+                'formats': result['formats'],
+                'validation': result['validation']
+            })
+            if profiler is not None:
+                profiler.record('cache_store', started, timings)
+
+        if profiler is not None:
+            profiler.record('generate', generate_started, timings)
 
         return result
 
+    def _render_format(self, responses: Dict[str, Any], fmt: str,
+                       timings: Optional[Dict[str, float]] = None) -> str:
+        """Render a single format."""
+        renderer = getattr(self, self.RENDERERS[fmt])
+        if self.profiler is None:
+            return renderer(responses)
 
-def create_markdown_document(result: Dict[str, Any], mode: str) -> str:
-    """Create complete markdown document with prompt(s) and instructions."""
+        started = self.profiler.now()
+        prompt = renderer(responses)
+        self.profiler.record(f'render.{fmt}', started, timings)
+        return prompt
+
+    def _validation_entry(self, prompt: str, fmt: str,
+                          timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Run the quality gates for one rendered format."""
+        if self.profiler is None:
+            score, issues = self.validate_prompt(prompt, fmt)
+        else:
+            started = self.profiler.now()
+            score, issues = self.validate_prompt(prompt, fmt)
+            self.profiler.record(f'validate.{fmt}', started, timings)
+
+        return {
+            'score': score,
+            'max_score': len(self.GATES),
+            'passed': score >= self.GATES.pass_threshold,
+            'issues': issues
+        }
+
+    def _cache_version(self) -> str:
+        """Generator version, token counter and a fingerprint of every template and table."""
+        if PromptGenerator._render_fingerprint is None:
+            import hashlib
+            digest = hashlib.sha256()
+            for template in (XML_TEMPLATE, CLAUDE_TEMPLATE, CHATGPT_TEMPLATE, GEMINI_TEMPLATE):
+                digest.update(template.encode('utf-8'))
+            tables = [self.XML_WORKFLOWS, self.WORKFLOW_STEPS, self.SIMPLE_WORKFLOWS,
+                      self.XML_BEST_PRACTICES, self.BEST_PRACTICES_LISTS]
+            digest.update(json.dumps(tables, sort_keys=True).encode('utf-8'))
+            PromptGenerator._render_fingerprint = digest.hexdigest()[:16]
+        return f"{GENERATOR_VERSION}:{self.counter.name}:{PromptGenerator._render_fingerprint}"
+
+
+# Per-format usage notes and opening code fence for the markdown document
+FORMAT_USAGE = {
+    'xml': (
+        "**Best for:** All LLMs, maximum compatibility, clear structure\n\n"
+        "**How to use:**\n"
+        "1. Copy the entire `<mega_prompt>` block below\n"
+        "2. Paste into your LLM conversation\n"
+        "3. Follow with your specific request\n\n"
+        "```xml\n"
+    ),
+    'claude': (
+        "**Best for:** Claude conversations, system-level configuration\n\n"
+        "**How to use:**\n"
+        "1. Copy the prompt below\n"
+        "2. Paste as system prompt or start of conversation\n"
+        "3. Claude maintains this configuration throughout\n\n"
+        "```markdown\n"
+    ),
+    'chatgpt': (
+        "**Best for:** ChatGPT persistent configuration\n\n"
+        "**How to use:**\n"
+        "1. Go to ChatGPT Settings → Personalization → Custom Instructions\n"
+        "2. Split prompt at '**How would you like ChatGPT to respond?**'\n"
+        "3. Paste first part in top box, second part in bottom box\n\n"
+        "```\n"
+    ),
+    'gemini': (
+        "**Best for:** Google Gemini conversations\n\n"
+        "**How to use:**\n"
+        "1. Copy the prompt below\n"
+        "2. Paste at start of Gemini conversation\n"
+        "3. Gemini maintains configuration\n\n"
+        "```markdown\n"
+    ),
+}
+
+DOCUMENT_FOOTER = """## Tips for Best Results
+
+1. **Test with sample queries** - Validate the prompt works as expected
+2. **Start with specific requests** - Provide clear context in your queries
+3. **Iterate on sections** - Refine specific parts rather than regenerating
+4. **Save successful versions** - Keep prompts that work well
+5. **Monitor responses** - Note what works and what needs adjustment
+
+## Next Steps
+
+1. Copy your preferred format above
+2. Test with 2-3 real queries
+3. Note effectiveness
+4. Request refinements if needed
+
+---
+
+*Generated by Prompt Suite - World-Class Prompt Powerhouse*
+*Learn more: https://github.com/your-repo/prompt-suite*
+"""
+
+
+def iter_markdown_document(result: Dict[str, Any], mode: str) -> Iterator[str]:
+    """Yield the markdown document for a result chunk by chunk."""
     metadata = result['metadata']
     role = metadata['role']
     domain = metadata.get('domain', 'General')
     output_type = metadata.get('output_type', 'Comprehensive')
 
-    doc = f"""# {role} Mega-Prompt
+    yield f"""# {role} Mega-Prompt
 
 ## Metadata
 - **Created**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -789,84 +1067,40 @@ def create_markdown_document(result: Dict[str, Any], mode: str) -> str:
     # Add validation results
     for fmt, validation in result['validation'].items():
         status = "✅ PASSED" if validation['passed'] else "⚠️ NEEDS REVIEW"
-        doc += f"**{fmt.upper()} Format**: {status} ({validation['score']}/7)\n"
+        yield f"**{fmt.upper()} Format**: {status} ({validation['score']}/7)\n"
         if validation['issues']:
-            doc += f"Issues:\n"
+            yield "Issues:\n"
             for issue in validation['issues']:
-                doc += f"- {issue}\n"
-        doc += "\n"
+                yield f"- {issue}\n"
+        yield "\n"
 
-    doc += "---\n\n"
+    yield "---\n\n"
 
     # Add each format
     for fmt, prompt in result['formats'].items():
-        doc += f"## {fmt.upper()} Format\n\n"
-
-        if fmt == 'xml':
-            doc += "**Best for:** All LLMs, maximum compatibility, clear structure\n\n"
-            doc += "**How to use:**\n"
-            doc += "1. Copy the entire `<mega_prompt>` block below\n"
-            doc += "2. Paste into your LLM conversation\n"
-            doc += "3. Follow with your specific request\n\n"
-            doc += "```xml\n"
-            doc += prompt
-            doc += "\n```\n\n"
-
-        elif fmt == 'claude':
-            doc += "**Best for:** Claude conversations, system-level configuration\n\n"
-            doc += "**How to use:**\n"
-            doc += "1. Copy the prompt below\n"
-            doc += "2. Paste as system prompt or start of conversation\n"
-            doc += "3. Claude maintains this configuration throughout\n\n"
-            doc += "```markdown\n"
-            doc += prompt
-            doc += "\n```\n\n"
-
-        elif fmt == 'chatgpt':
-            doc += "**Best for:** ChatGPT persistent configuration\n\n"
-            doc += "**How to use:**\n"
-            doc += "1. Go to ChatGPT Settings → Personalization → Custom Instructions\n"
-            doc += "2. Split prompt at '**How would you like ChatGPT to respond?**'\n"
-            doc += "3. Paste first part in top box, second part in bottom box\n\n"
-            doc += "```\n"
-            doc += prompt
-            doc += "\n```\n\n"
-
-        elif fmt == 'gemini':
-            doc += "**Best for:** Google Gemini conversations\n\n"
-            doc += "**How to use:**\n"
-            doc += "1. Copy the prompt below\n"
-            doc += "2. Paste at start of Gemini conversation\n"
-            doc += "3. Gemini maintains configuration\n\n"
-            doc += "```markdown\n"
-            doc += prompt
-            doc += "\n```\n\n"
-
-        doc += "---\n\n"
+        yield f"## {fmt.upper()} Format\n\n"
 
-    # Add tips
-    doc += """## Tips for Best Results
+        usage = FORMAT_USAGE.get(fmt)
+        if usage is not None:
+            yield usage
+            yield prompt
+            yield "\n```\n\n"
 
-1. **Test with sample queries** - Validate the prompt works as expected
-2. **Start with specific requests** - Provide clear context in your queries
-3. **Iterate on sections** - Refine specific parts rather than regenerating
-4. **Save successful versions** - Keep prompts that work well
-5. **Monitor responses** - Note what works and what needs adjustment
+        yield "---\n\n"
 
-## Next Steps
+    # Add tips
+    yield DOCUMENT_FOOTER
 
-1. Copy your preferred format above
-2. Test with 2-3 real queries
-3. Note effectiveness
-4. Request refinements if needed
 
----
+def write_markdown_document(result: Dict[str, Any], mode: str, stream: TextIO):
+    """Stream the markdown document to a file-like object without building it in memory."""
+    for chunk in iter_markdown_document(result, mode):
+        stream.write(chunk)
 
-*Generated by Prompt Suite - World-Class Prompt Powerhouse*
-*Learn more: https://github.com/your-repo/prompt-suite*
-"""
 
-    return doc
+def create_markdown_document(result: Dict[str, Any], mode: str) -> str:
+    """Create complete markdown document with prompt(s) and instructions."""
+    return ''.join(iter_markdown_document(result, mode))
 
 
 def main():
@@ -880,7 +1114,7 @@ Examples:
   python generate_prompt.py --responses config.json --format xml --mode core --output prompt.md
 
   # Use a preset
-  python generate_prompt.py --preset fullstack-engineer --format claude --mode advanced --output prompt.md
+  python generate_prompt.py --preset hr-manager --format claude --mode advanced --output prompt.md
 
   # Generate all formats
   python generate_prompt.py --responses config.json --format all --mode core --output prompt.md
@@ -888,18 +1122,28 @@ Examples:
     )
 
     parser.add_argument('--responses', help='Path to responses JSON file')
-    parser.add_argument('--preset', help='Use a quick-start preset')
+    parser.add_argument('--preset', help='Use a quick-start preset (see preset_catalog.py --list)')
     parser.add_argument('--format', required=True,
                        choices=['xml', 'claude', 'chatgpt', 'gemini', 'all'],
                        help='Output format')
     parser.add_argument('--mode', default='core', choices=['core', 'advanced'],
                        help='Generation mode (default: core)')
     parser.add_argument('--output', required=True, help='Output markdown file path')
+    parser.add_argument('--cache', nargs='?', const=str(DEFAULT_CACHE_PATH), metavar='PATH',
+                       help='Reuse renders from a persistent cache '
+                            '(default: outputs/.render-cache.sqlite3)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print per-stage timings after generation')
 
     args = parser.parse_args()
 
     # Load responses or preset
-    generator = PromptGenerator()
+    render_cache = RenderCache(Path(args.cache)) if args.cache else None
+    profiler = None
+    if args.profile:
+        from profiling import StageProfiler
+        profiler = StageProfiler()
+    generator = PromptGenerator(render_cache=render_cache, profiler=profiler)
 
     if args.preset:
         responses = generator.load_preset(args.preset)
@@ -923,18 +1167,22 @@ Examples:
             for issue in validation['issues']:
                 print(f"    - {issue}")
 
-    # Create markdown document
-    markdown_doc = create_markdown_document(result, args.mode)
-
-    # Write output
+    # Write markdown document
+    if profiler is not None:
+        started = profiler.now()
     with open(args.output, 'w') as f:
-        f.write(markdown_doc)
+        write_markdown_document(result, args.mode, f)
+    if profiler is not None:
+        profiler.record('markdown', started, result['metadata']['timings'])
 
     print(f"\n✅ Mega-prompt generated successfully!")
     print(f"📁 Output: {args.output}")
     print(f"📊 Total formats: {len(result['formats'])}")
     print(f"⏱️  Generated at: {result['metadata']['generated_at']}")
 
+    if profiler is not None:
+        print(f"\n{profiler.format_table()}")
+
 
 if __name__ == "__main__":
     main()
@@ -9,14 +9,205 @@ Usage:
     python optimizer.py --prompt my-prompt.md --target-tokens 4000 --output optimized.md
     python optimizer.py --prompt prompt.md --analyze-only --report analysis.json
     python optimizer.py --prompt prompt.md --aggressive --output compact.md
+    python optimizer.py --prompt prompt.md --with-analysis --output optimized.md
 """
 
 import re
-import json
 import argparse
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Set
+from typing import Dict, List, Any, Tuple, Set, Optional, TYPE_CHECKING
 from datetime import datetime
+from time import perf_counter
+from bisect import bisect_right
+
+if TYPE_CHECKING:
+    from phrase_rewriter import PhraseRewriter
+
+
+class PromptDocument:
+    """
+    A prompt parsed once into a preamble and markdown sections.
+
+    Passes find what to change by scanning text() and hand the spans to
+    apply_edits(), which rewrites only the nodes they fall in, or drop
+    whole sections with remove_sections(). text() serializes only when
+    something changed since the last call, and stats() is kept current from
+    the edited spans alone rather than by rescanning the text.
+    """
+
+    SECTION_HEADING = re.compile(r'(^#+\s+[^\n]+)', re.MULTILINE)
+
+    # One '#' followed by whitespace per match of _get_stats' r'##?\s+'
+    HEADING_MARK = re.compile(r'#\s')
+
+    def __init__(self, prompt: str):
+        matches = list(self.SECTION_HEADING.finditer(prompt))
+        self.preamble = prompt[:matches[0].start()] if matches else prompt
+        self.sections: List[Dict[str, str]] = []
+
+        # Offset of each node in text(): preamble, then each heading and its content
+        self._offsets = [0]
+        for idx, match in enumerate(matches):
+            end = matches[idx + 1].start() if idx + 1 < len(matches) else len(prompt)
+            self.sections.append({
+                'heading': prompt[match.start():match.end()],
+                'content': prompt[match.end():end]
+            })
+            self._offsets.append(match.start())
+            self._offsets.append(match.end())
+
+        self.dirty = False
+        self._text = prompt
+        # [characters, words, line breaks, heading marks] of text()
+        self._counts = self._measure(prompt)
+
+    @classmethod
+    def _measure(cls, text: str) -> List[int]:
+        return [len(text), len(text.split()), text.count('\n'), len(cls.HEADING_MARK.findall(text))]
+
+    def stats(self) -> Dict[str, int]:
+        """Character, word, line and section counts of text(), as in _get_stats."""
+        characters, words, breaks, marks = self._counts
+        return {'characters': characters, 'words': words, 'lines': breaks + 1, 'sections': marks}
+
+    def section_span(self, idx: int) -> Tuple[int, int, int]:
+        """(heading start, content start, end) of section idx in text()."""
+        text = self.text()
+        node = 2 * idx + 1
+        end = self._offsets[node + 2] if node + 2 < len(self._offsets) else len(text)
+        return self._offsets[node], self._offsets[node + 1], end
+
+    def _count_edits(self, edits: List[Tuple[int, int, str]]):
+        """
+        Update the counts for edits about to be applied to text().
+
+        Each edit is measured over its span widened to the words it touches
+        plus one following character, since a word or a '#' + whitespace
+        pair can only change there; edits whose windows overlap are
+        measured together.
+        """
+        text = self.text()
+        size = len(text)
+        windows: List[List[Any]] = []
+        for start, end, replacement in edits:
+            low = start
+            while low > 0 and not text[low - 1].isspace():
+                low -= 1
+            high = end
+            while high < size and not text[high].isspace():
+                high += 1
+            high = min(high + 1, size)
+            if windows and low < windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], high)
+                windows[-1][2].append((start, end, replacement))
+            else:
+                windows.append([low, high, [(start, end, replacement)]])
+
+        counts = self._counts
+        for low, high, spans in windows:
+            parts = []
+            position = low
+            for start, end, replacement in spans:
+                parts.append(text[position:start])
+                parts.append(replacement)
+                position = end
+            parts.append(text[position:high])
+            before = self._measure(text[low:high])
+            after = self._measure(''.join(parts))
+            counts = [count + new - old for count, new, old in zip(counts, after, before)]
+        self._counts = counts
+
+    def _nodes(self) -> List[str]:
+        nodes = [self.preamble]
+        for section in self.sections:
+            nodes.append(section['heading'])
+            nodes.append(section['content'])
+        return nodes
+
+    def text(self) -> str:
+        """The document as a string."""
+        if self.dirty:
+            nodes = self._nodes()
+            self._offsets = []
+            offset = 0
+            for node in nodes:
+                self._offsets.append(offset)
+                offset += len(node)
+            self._text = ''.join(nodes)
+            self.dirty = False
+        return self._text
+
+    def apply_edits(self, edits: List[Tuple[int, int, str]]):
+        """
+        Replace text()[start:end] spans with new strings.
+
+        Edits are in order and do not overlap. A span running past the end
+        of its node is cut there, so an edit never joins two nodes.
+        """
+        if not edits:
+            return
+
+        text = self.text()
+        nodes = self._nodes()
+        offsets = self._offsets
+        changed: Dict[int, List[str]] = {}
+        values: Dict[int, str] = {}
+        # The edits as applied (cut at node ends, plus restored line breaks)
+        applied: List[Tuple[int, int, str]] = []
+        position = 0
+        idx = -1
+
+        def close(idx: int, node_end: int):
+            changed[idx].append(text[position:node_end])
+            value = ''.join(changed[idx])
+            # A phrase rewrite whose trailing \s+ took the line break before
+            # a heading would run the heading into the previous line; keep it
+            if (idx % 2 == 0 and idx + 1 < len(nodes) and value
+                    and not value.endswith('\n') and nodes[idx].endswith('\n')):
+                value += '\n'
+                applied.append((node_end, node_end, '\n'))
+            values[idx] = value
+
+        for start, end, replacement in edits:
+            node = bisect_right(offsets, start) - 1
+            if node != idx:
+                if idx >= 0:
+                    close(idx, node_end)
+                idx = node
+                node_end = offsets[idx + 1] if idx + 1 < len(offsets) else len(text)
+                changed[idx] = [text[offsets[idx]:start]]
+            else:
+                changed[idx].append(text[position:start])
+            changed[idx].append(replacement)
+            position = min(end, node_end)
+            applied.append((start, position, replacement))
+        close(idx, node_end)
+
+        self._count_edits(applied)
+        for idx, value in values.items():
+            if idx == 0:
+                self.preamble = value
+            else:
+                self.sections[(idx - 1) // 2]['heading' if idx % 2 else 'content'] = value
+        self.dirty = True
+
+    def remove_sections(self, indices: List[int]):
+        """Drop the sections at these indices, headings and content."""
+        if not indices:
+            return
+
+        removed = set(indices)
+        edits: List[Tuple[int, int, str]] = []
+        for idx in sorted(removed):
+            start, _, end = self.section_span(idx)
+            if edits and edits[-1][1] == start:
+                edits[-1] = (edits[-1][0], end, '')
+            else:
+                edits.append((start, end, ''))
+
+        self._count_edits(edits)
+        self.sections = [section for idx, section in enumerate(self.sections) if idx not in removed]
+        self.dirty = True
 
 
 class PromptOptimizer:
@@ -27,15 +218,138 @@ class PromptOptimizer:
         'on', 'by', 'from', 'your', 'our', 'this', 'that'
     }
 
-    def __init__(self, aggressive: bool = False):
+    # Phrase tables, each compiled once into a single one-pass matcher
+    # (PHRASE_SAVINGS etc., built by the first PromptOptimizer() so that
+    # --help does not load phrase_rewriter).
+    # Analysis: (pattern, estimated tokens saved per match); redundant
+    # phrases first, then complex words that have a simpler synonym
+    # (utilize/implement/leverage -> use, facilitate -> help, paradigm -> model)
+    REDUNDANT_PHRASE_COUNT = 8
+    PHRASE_SAVINGS_RULES = (
+        (r'it is important to note that', 50),
+        (r'please note that', 30),
+        (r'it should be noted', 30),
+        (r'as mentioned (above|before|previously)', 40),
+        (r'in order to', 20),
+        (r'for the purpose of', 30),
+        (r'due to the fact that', 40),
+        (r'at this point in time', 40),
+        (r'\butilize\b', 5),
+        (r'\bfacilitate\b', 5),
+        (r'\bimplement\b', 5),
+        (r'\bleverage\b', 5),
+        (r'\bparadigm\b', 5),
+    )
+
+    # Rewrites: (pattern, replacement)
+    REDUNDANT_PHRASE_RULES = (
+        (r'it is important to note that\s+', ''),
+        (r'please note that\s+', ''),
+        (r'it should be noted that\s+', ''),
+        (r'as mentioned (above|before|previously),?\s+', ''),
+        (r'in order to\s+', 'to '),
+        (r'for the purpose of\s+', 'to '),
+        (r'due to the fact that\s+', 'because '),
+        (r'at this point in time\s+', 'now '),
+        (r'has the ability to\s+', 'can '),
+    )
+
+    FILLER_WORD_RULES = tuple(
+        (r'\b' + word + r'\s+', '') for word in (
+            'very', 'really', 'quite', 'rather', 'fairly', 'pretty',
+            'basically', 'essentially', 'actually', 'literally'
+        )
+    )
+
+    PHRASE_SAVINGS: 'PhraseRewriter' = None
+    REDUNDANT_PHRASES: 'PhraseRewriter' = None
+    FILLER_WORDS: 'PhraseRewriter' = None
+
+    SENTENCE_END = re.compile(r'[.!?]+\s+')
+
+    # _clean_formatting: (pattern, replacement, substring it needs). The
+    # rules and trailing whitespace touch disjoint characters, so finding
+    # them all in the same text matches applying them one after another.
+    FORMATTING_RULES = (
+        (re.compile(r'\n\n\n+'), '\n\n', '\n\n\n'),
+        (re.compile(r'\.\.\.\.+'), '...', '....'),
+        (re.compile(r'!!!+'), '!', '!!!'),
+        (re.compile(r'\?\?\?+'), '?', '???'),
+    )
+
+    EXAMPLE_HEADING = re.compile(r'##?\s*Example', re.IGNORECASE)
+    SPACED_HEADING = re.compile(r'##\s+(.+?)\s*$')
+
+    # Budget mode passes: (name, transform, savings estimate). Aggressive
+    # passes are only tried when the standard ones cannot reach the target.
+    PASSES = (
+        ('redundancy', '_remove_redundancy', '_check_redundancy'),
+        ('verbosity', '_simplify_verbosity', '_check_verbosity'),
+        ('sections', '_merge_sections', '_check_mergeable_sections'),
+        ('examples', '_consolidate_examples', '_check_excessive_examples'),
+        ('formatting', '_clean_formatting', '_check_formatting'),
+    )
+    AGGRESSIVE_PASSES = (
+        ('aggressive', '_aggressive_optimization', '_check_aggressive'),
+    )
+
+    # Starting cost estimates per pass, in ms per 1,000 characters; refined
+    # from measured run times while the optimizer is reused
+    PASS_COST_MS = {
+        'redundancy': 0.07, 'verbosity': 0.12, 'sections': 0.10,
+        'examples': 0.02, 'formatting': 0.01, 'aggressive': 0.015,
+    }
+
+    def __init__(self, aggressive: bool = False, tokenizer: Optional[str] = None):
         self.aggressive = aggressive
         self.optimizations_applied = []
+        # (prompt, {scan method: result}) of the last prompt scanned, so
+        # analysis checks and budget planning share their scans
+        self._scanned: Optional[Tuple[str, Dict[str, Any]]] = None
+        from token_counter import get_counter
+
+        # Shared token_counter backend ('heuristic' by default, or 'bpe')
+        self.counter = get_counter(tokenizer)
+        if PromptOptimizer.PHRASE_SAVINGS is None:
+            PromptOptimizer._build_rewriters()
+        self.pass_costs = dict(self.PASS_COST_MS)
+
+    @classmethod
+    def _build_rewriters(cls):
+        """Compile the phrase tables, once per process."""
+        from phrase_rewriter import PhraseRewriter
+
+        cls.PHRASE_SAVINGS = PhraseRewriter(cls.PHRASE_SAVINGS_RULES, re.IGNORECASE)
+        cls.REDUNDANT_PHRASES = PhraseRewriter(cls.REDUNDANT_PHRASE_RULES, re.IGNORECASE)
+        cls.FILLER_WORDS = PhraseRewriter(cls.FILLER_WORD_RULES)
 
     def analyze(self, prompt: str) -> Dict[str, Any]:
         """Analyze prompt and identify optimization opportunities."""
+        return self._analyze(prompt, self._get_stats(prompt))
+
+    def analyze_and_optimize(self, prompt: str, target_tokens: int = None,
+                             budget: bool = False) -> Tuple[Dict[str, Any], str, Dict[str, Any]]:
+        """
+        analyze() and optimize() in one run.
+
+        The prompt is parsed and measured once for both reports, budget
+        planning reuses the analysis checks while the prompt is unchanged,
+        and the optimized statistics come from the document's running
+        counts.
+
+        Returns:
+            (analysis, optimized_prompt, optimization_report)
+        """
+        document = PromptDocument(prompt)
+        original_stats = self._document_stats(document)
+        analysis = self._analyze(prompt, dict(original_stats))
+        optimized, report = self._optimize(document, original_stats, target_tokens, budget)
+        return analysis, optimized, report
+
+    def _analyze(self, prompt: str, original_stats: Dict[str, Any]) -> Dict[str, Any]:
         analysis = {
             'timestamp': datetime.now().isoformat(),
-            'original_stats': self._get_stats(prompt),
+            'original_stats': original_stats,
             'opportunities': [],
             'estimated_savings': 0,
             'recommendations': []
@@ -45,7 +359,7 @@ class PromptOptimizer:
         opportunities = []
 
         # 1. Redundant phrases
-        redundant_savings = self._check_redundancy(prompt)
+        redundant_savings = self._scan('_check_redundancy', prompt)
         if redundant_savings > 0:
             opportunities.append({
                 'type': 'redundancy',
@@ -55,7 +369,7 @@ class PromptOptimizer:
             })
 
         # 2. Verbose explanations
-        verbose_savings = self._check_verbosity(prompt)
+        verbose_savings = self._scan('_check_verbosity', prompt)
         if verbose_savings > 0:
             opportunities.append({
                 'type': 'verbosity',
@@ -65,7 +379,7 @@ class PromptOptimizer:
             })
 
         # 3. Mergeable sections
-        merge_savings = self._check_mergeable_sections(prompt)
+        merge_savings = self._scan('_check_mergeable_sections', prompt)
         if merge_savings > 0:
             opportunities.append({
                 'type': 'section_merge',
@@ -75,7 +389,7 @@ class PromptOptimizer:
             })
 
         # 4. Excessive examples
-        example_savings = self._check_excessive_examples(prompt)
+        example_savings = self._scan('_check_excessive_examples', prompt)
         if example_savings > 0:
             opportunities.append({
                 'type': 'examples',
@@ -85,7 +399,7 @@ class PromptOptimizer:
             })
 
         # 5. Unnecessary formatting
-        format_savings = self._check_formatting(prompt)
+        format_savings = self._scan('_check_formatting', prompt)
         if format_savings > 0:
             opportunities.append({
                 'type': 'formatting',
@@ -95,7 +409,7 @@ class PromptOptimizer:
             })
 
         # 6. Simplifiable language
-        language_savings = self._check_language_complexity(prompt)
+        language_savings = self._scan('_check_language_complexity', prompt)
         if language_savings > 0:
             opportunities.append({
                 'type': 'language',
@@ -112,86 +426,173 @@ class PromptOptimizer:
 
         return analysis
 
-    def optimize(self, prompt: str, target_tokens: int = None) -> Tuple[str, Dict[str, Any]]:
+    def optimize(self, prompt: str, target_tokens: int = None,
+                 budget: bool = False) -> Tuple[str, Dict[str, Any]]:
         """
         Optimize prompt for token efficiency.
 
         Args:
             prompt: Original prompt text
             target_tokens: Target token count (None = reasonable reduction)
+            budget: Apply only the passes needed to reach target_tokens,
+                best estimated savings per millisecond first; aggressive
+                passes (if enabled) only when the others fall short
 
         Returns:
             (optimized_prompt, optimization_report)
         """
-        original_word_count = len(prompt.split())
+        # Parsed once; every pass edits the tree and it is serialized at the end
+        document = PromptDocument(prompt)
+        return self._optimize(document, self._document_stats(document), target_tokens, budget)
+
+    def _optimize(self, document: PromptDocument, original_stats: Dict[str, Any],
+                  target_tokens: Optional[int], budget: bool) -> Tuple[str, Dict[str, Any]]:
+        prompt = document.text()
+        original_tokens = original_stats['estimated_tokens']
 
         # Determine target if not specified
         if target_tokens is None:
             # Aim for 20% reduction
-            target_tokens = int(original_word_count * 0.75 * 0.8)
+            target_tokens = int(original_tokens * 0.8)
 
-        optimized = prompt
         self.optimizations_applied = []
+        budget_passes = None
+
+        if budget:
+            budget_passes = self._optimize_to_budget(document, target_tokens)
+        else:
+            # Apply optimizations in order of priority
+            self._remove_redundancy(document)
+            self._simplify_verbosity(document)
+            self._merge_sections(document)
+            self._consolidate_examples(document)
+            self._clean_formatting(document)
 
-        # Apply optimizations in order of priority
-        optimized = self._remove_redundancy(optimized)
-        optimized = self._simplify_verbosity(optimized)
-        optimized = self._merge_sections(optimized)
-        optimized = self._consolidate_examples(optimized)
-        optimized = self._clean_formatting(optimized)
+            if self.aggressive:
+                self._aggressive_optimization(document)
 
-        if self.aggressive:
-            optimized = self._aggressive_optimization(optimized)
+        optimized = document.text()
 
-        # Generate report
+        # Generate report (tokens re-count through the counter's section cache)
+        optimized_stats = self._document_stats(document)
+        optimized_tokens = optimized_stats['estimated_tokens']
         report = {
             'timestamp': datetime.now().isoformat(),
-            'original_stats': self._get_stats(prompt),
-            'optimized_stats': self._get_stats(optimized),
+            'original_stats': original_stats,
+            'optimized_stats': optimized_stats,
             'target_tokens': target_tokens,
             'optimizations_applied': self.optimizations_applied,
             'quality_maintained': self._validate_quality(prompt, optimized),
-            'achieved_target': len(optimized.split()) * 0.75 <= target_tokens
+            'achieved_target': optimized_tokens <= target_tokens
         }
 
         # Calculate savings
-        original_tokens = int(original_word_count * 0.75)
-        optimized_tokens = int(len(optimized.split()) * 0.75)
         report['token_reduction'] = original_tokens - optimized_tokens
         report['reduction_percentage'] = (report['token_reduction'] / original_tokens * 100) if original_tokens > 0 else 0
 
+        if budget_passes is not None:
+            report['budget_passes'] = budget_passes
+
         return optimized, report
 
+    def _optimize_to_budget(self, document: PromptDocument, target_tokens: int) -> List[Dict[str, Any]]:
+        """
+        Apply passes to document until it fits target_tokens.
+
+        Each stage (standard passes, then aggressive ones if enabled) is
+        planned up front: every pass gets a savings estimate from its
+        analysis check and a cost estimate from pass_costs, and they run
+        in order of savings per millisecond. Passes estimated to save
+        nothing still run last, cheapest first, since the estimates are
+        rough.
+
+        Returns:
+            One record per pass run
+        """
+        tokens = self.counter.count(document.text())
+        applied: List[Dict[str, Any]] = []
+
+        stages = [self.PASSES]
+        if self.aggressive:
+            stages.append(self.AGGRESSIVE_PASSES)
+
+        for passes in stages:
+            if tokens <= target_tokens:
+                break
+
+            plan = []
+            text = document.text()
+            for name, transform, estimate in passes:
+                savings = self._scan(estimate, text)
+                cost = self.pass_costs[name] * max(len(text), 1) / 1000
+                plan.append((savings / cost, name, transform, savings, cost))
+            plan.sort(key=lambda entry: (-entry[0], entry[4]))
+
+            for _, name, transform, savings, cost in plan:
+                if tokens <= target_tokens:
+                    break
+
+                size = max(len(document.text()), 1)
+                started = perf_counter()
+                getattr(self, transform)(document)
+                elapsed = (perf_counter() - started) * 1000
+                self.pass_costs[name] = (self.pass_costs[name] + elapsed * 1000 / size) / 2
+
+                tokens = self.counter.count(document.text())
+                applied.append({
+                    'pass': name,
+                    'estimated_savings': savings,
+                    'estimated_ms': round(cost, 3),
+                    'elapsed_ms': round(elapsed, 3),
+                    'tokens_after': tokens
+                })
+
+        return applied
+
     def _get_stats(self, text: str) -> Dict[str, Any]:
         """Get text statistics."""
         words = text.split()
         return {
             'characters': len(text),
             'words': len(words),
-            'estimated_tokens': int(len(words) * 0.75),
+            'estimated_tokens': self.counter.count(text),
             'lines': len(text.split('\n')),
             'sections': len(re.findall(r'##?\s+', text))
         }
 
-    def _check_redundancy(self, prompt: str) -> int:
-        """Check for redundant phrases."""
-        redundant_patterns = [
-            (r'it is important to note that', 50),
-            (r'please note that', 30),
-            (r'it should be noted', 30),
-            (r'as mentioned (above|before|previously)', 40),
-            (r'in order to', 20),
-            (r'for the purpose of', 30),
-            (r'due to the fact that', 40),
-            (r'at this point in time', 40),
-        ]
+    def _document_stats(self, document: PromptDocument) -> Dict[str, Any]:
+        """_get_stats() of document.text(), from the counts the document keeps."""
+        stats = document.stats()
+        return {
+            'characters': stats['characters'],
+            'words': stats['words'],
+            'estimated_tokens': self.counter.count(document.text()),
+            'lines': stats['lines'],
+            'sections': stats['sections']
+        }
+
+    def _scan(self, method: str, prompt: str) -> Any:
+        """Result of a scan method on prompt, run once per prompt."""
+        if self._scanned is None or self._scanned[0] is not prompt:
+            self._scanned = (prompt, {})
+        results = self._scanned[1]
+        if method not in results:
+            results[method] = getattr(self, method)(prompt)
+        return results[method]
 
-        total_savings = 0
-        for pattern, savings in redundant_patterns:
-            matches = len(re.findall(pattern, prompt, re.IGNORECASE))
-            total_savings += matches * savings
+    def _phrase_counts(self, prompt: str) -> List[int]:
+        """PHRASE_SAVINGS matches per rule, one pass shared by the checks."""
+        return self.PHRASE_SAVINGS.count(prompt)
 
-        return total_savings
+    def _example_sections(self, prompt: str) -> List[str]:
+        """Example sections, as the example checks see them."""
+        return re.findall(r'##?\s*Example[^#]*(?=##|$)', prompt, re.IGNORECASE | re.DOTALL)
+
+    def _check_redundancy(self, prompt: str) -> int:
+        """Check for redundant phrases."""
+        counts = self._scan('_phrase_counts', prompt)
+        rules = self.PHRASE_SAVINGS.rules
+        return sum(counts[i] * rules[i][1] for i in range(self.REDUNDANT_PHRASE_COUNT))
 
     def _check_verbosity(self, prompt: str) -> int:
         """Check for verbose explanations."""
@@ -221,7 +622,7 @@ class PromptOptimizer:
 
     def _check_excessive_examples(self, prompt: str) -> int:
         """Check for excessive examples."""
-        example_sections = re.findall(r'##?\s*Example[^#]*(?=##|$)', prompt, re.IGNORECASE | re.DOTALL)
+        example_sections = self._scan('_example_sections', prompt)
 
         if len(example_sections) > 3:
             # Estimate we can consolidate to 2-3 examples
@@ -242,103 +643,60 @@ class PromptOptimizer:
 
     def _check_language_complexity(self, prompt: str) -> int:
         """Check for overly complex language."""
-        # Words that could be simplified
-        complex_patterns = [
-            ('utilize', 'use'),
-            ('facilitate', 'help'),
-            ('implement', 'use'),
-            ('leverage', 'use'),
-            ('paradigm', 'model'),
-        ]
+        counts = self._scan('_phrase_counts', prompt)
+        rules = self.PHRASE_SAVINGS.rules
+        return sum(counts[i] * rules[i][1] for i in range(self.REDUNDANT_PHRASE_COUNT, len(rules)))
 
-        total_savings = 0
-        for complex_word, _ in complex_patterns:
-            matches = len(re.findall(r'\b' + complex_word + r'\b', prompt, re.IGNORECASE))
-            total_savings += matches * 5  # Small savings per word
+    def _check_aggressive(self, prompt: str) -> int:
+        """Check what aggressive optimization could save (every example after the first)."""
+        example_sections = self._scan('_example_sections', prompt)
+        return int(sum(len(ex.split()) for ex in example_sections[1:]) * 0.75)
 
-        return total_savings
-
-    def _remove_redundancy(self, prompt: str) -> str:
+    def _remove_redundancy(self, document: PromptDocument):
         """Remove redundant phrases."""
-        redundant_phrases = {
-            r'it is important to note that\s+': '',
-            r'please note that\s+': '',
-            r'it should be noted that\s+': '',
-            r'as mentioned (above|before|previously),?\s+': '',
-            r'in order to\s+': 'to ',
-            r'for the purpose of\s+': 'to ',
-            r'due to the fact that\s+': 'because ',
-            r'at this point in time\s+': 'now ',
-            r'has the ability to\s+': 'can ',
-        }
-
-        optimized = prompt
-        for pattern, replacement in redundant_phrases.items():
-            before = len(optimized.split())
-            optimized = re.sub(pattern, replacement, optimized, flags=re.IGNORECASE)
-            after = len(optimized.split())
-            if before != after:
+        rules = self.REDUNDANT_PHRASES.rules
+        counts = [0] * len(rules)
+        edits = []
+        for start, end, rule in self.REDUNDANT_PHRASES.spans(document.text()):
+            counts[rule] += 1
+            edits.append((start, end, rules[rule][1]))
+        document.apply_edits(edits)
+
+        for (pattern, _), count in zip(rules, counts):
+            if count:
                 self.optimizations_applied.append(f"Removed redundant phrase pattern: {pattern[:30]}...")
 
-        return optimized
-
-    def _simplify_verbosity(self, prompt: str) -> str:
+    def _simplify_verbosity(self, document: PromptDocument):
         """Simplify verbose explanations."""
-        # Split into sentences
-        sentences = re.split(r'([.!?]+\s+)', prompt)
-
-        optimized_sentences = []
-        for i in range(0, len(sentences), 2):
-            sentence = sentences[i] if i < len(sentences) else ''
-            delimiter = sentences[i+1] if i+1 < len(sentences) else ''
-
+        text = document.text()
+        edits = []
+
+        # Sentences run between delimiters, across headings if need be
+        start = 0
+        ends = [(match.start(), match.end()) for match in self.SENTENCE_END.finditer(text)]
+        ends.append((len(text), len(text)))
+        for end, next_start in ends:
             # If sentence is too long, try to simplify
-            if len(sentence.split()) > 40:
+            sentence = text[start:end]
+            words = len(sentence.split())
+            if words > 40:
                 # Remove filler words
-                simplified = sentence
-                simplified = re.sub(r'\b(very|really|quite|rather|fairly|pretty)\s+', '', simplified)
-                simplified = re.sub(r'\b(basically|essentially|actually|literally)\s+', '', simplified)
-
-                if len(simplified.split()) < len(sentence.split()):
-                    self.optimizations_applied.append(f"Simplified verbose sentence (reduced by {len(sentence.split()) - len(simplified.split())} words)")
-
-                sentence = simplified
-
-            optimized_sentences.append(sentence + delimiter)
-
-        return ''.join(optimized_sentences)
-
-    def _parse_sections(self, prompt: str) -> Tuple[str, List[Dict[str, str]]]:
-        """Split prompt into preamble and markdown sections."""
-        section_pattern = re.compile(r'(^#+\s+[^\n]+)', re.MULTILINE)
-        matches = list(section_pattern.finditer(prompt))
-
-        if not matches:
-            return prompt, []
-
-        preamble = prompt[:matches[0].start()]
-        sections: List[Dict[str, str]] = []
-
-        for idx, match in enumerate(matches):
-            end = matches[idx + 1].start() if idx + 1 < len(matches) else len(prompt)
-            sections.append({
-                'heading': prompt[match.start():match.end()],
-                'content': prompt[match.end():end]
-            })
-
-        return preamble, sections
-
-    def _rebuild_prompt(self, preamble: str, sections: List[Dict[str, str]]) -> str:
-        """Rebuild prompt text from preamble and sections."""
-        parts: List[str] = []
-        if preamble:
-            parts.append(preamble)
-
-        for section in sections:
-            parts.append(section['heading'])
-            parts.append(section['content'])
-
-        return ''.join(parts)
+                fillers = [(s, e, '') for s, e, _ in self.FILLER_WORDS.spans(text, start, end)]
+                if fillers:
+                    parts = []
+                    position = start
+                    for s, e, _ in fillers:
+                        parts.append(text[position:s])
+                        position = e
+                    parts.append(text[position:end])
+                    reduced = words - len(''.join(parts).split())
+                    if reduced > 0:
+                        self.optimizations_applied.append(f"Simplified verbose sentence (reduced by {reduced} words)")
+                    edits.extend(fillers)
+
+            start = next_start
+
+        document.apply_edits(edits)
 
     def _heading_signature(self, heading: str) -> Tuple[str, Set[str]]:
         """Normalize heading text to detect similar sections."""
@@ -381,101 +739,116 @@ class PromptOptimizer:
         if not blocks:
             return ''
 
-        combined = blocks[0]
+        # Collected as parts: repeated concatenation is quadratic when many
+        # sections merge into one
+        parts = [blocks[0]]
         for block in blocks[1:]:
             normalized = self._normalize_block(block)
             if not normalized:
                 continue
-            trimmed_existing = combined.rstrip('\n')
-            addition = block.strip('\n')
-            combined = trimmed_existing + '\n\n' + addition
+            parts[-1] = parts[-1].rstrip('\n')
+            parts.append('\n\n')
+            parts.append(block.strip('\n'))
             if block.endswith('\n'):
-                combined += '\n'
+                parts.append('\n')
 
-        return combined
+        return ''.join(parts)
 
-    def _merge_sections(self, prompt: str) -> str:
+    def _merge_sections(self, document: PromptDocument):
         """Merge similar or overlapping sections."""
-        preamble, sections = self._parse_sections(prompt)
+        sections = document.sections
         if not sections:
-            return prompt
+            return
 
-        merged_sections: List[Dict[str, Any]] = []
-        changed = False
+        from hashlib import blake2b
 
-        for section in sections:
+        merged_sections: List[Dict[str, Any]] = []
+        # Heading token -> indexes of kept sections whose tokens include it.
+        # Any section a heading can merge into shares at least one token
+        # with it, so only those sections are candidates.
+        postings: Dict[str, List[int]] = {}
+        # Indexes of the sections merged into an earlier one
+        merged_away: List[int] = []
+
+        for section_index, section in enumerate(sections):
             normalized, tokens = self._heading_signature(section['heading'])
             is_example = 'example' in normalized
 
             target_index = None
             if not is_example:
-                for idx, existing in enumerate(merged_sections):
-                    overlap = tokens & existing['tokens']
-                    if (tokens and existing['tokens'] and (
-                        tokens == existing['tokens'] or
-                        tokens <= existing['tokens'] or
-                        existing['tokens'] <= tokens or
-                            len(overlap) >= 2
-                    )) or (normalized and normalized == existing['normalized']):
+                overlaps: Dict[int, int] = {}
+                for token in tokens:
+                    for idx in postings.get(token, ()):
+                        overlaps[idx] = overlaps.get(idx, 0) + 1
+                # The first kept section that matches, as a scan in order would find
+                for idx in sorted(overlaps):
+                    existing = merged_sections[idx]
+                    overlap = overlaps[idx]
+                    if (overlap >= 2 or overlap == len(tokens) or overlap == len(existing['tokens'])
+                            or normalized == existing['normalized']):
                         target_index = idx
                         break
 
             if target_index is None:
+                for token in tokens:
+                    postings.setdefault(token, []).append(len(merged_sections))
                 merged_sections.append({
                     'heading': section['heading'],
                     'normalized': normalized,
-                    'tokens': tokens,
+                    'tokens': set(tokens),
                     'contents': [section['content']],
+                    # Digests of the normalized content blocks, for duplicate checks
+                    'digests': {blake2b(self._normalize_block(section['content']).encode(),
+                                        digest_size=16).digest()},
                     'merged': []
                 })
                 continue
 
             existing_section = merged_sections[target_index]
+            for token in tokens - existing_section['tokens']:
+                postings.setdefault(token, []).append(target_index)
             existing_section['tokens'] |= tokens
-            changed = True
+            merged_away.append(section_index)
             normalized_new_block = self._normalize_block(section['content'])
-            existing_blocks = [self._normalize_block(block) for block in existing_section['contents']]
+            digest = blake2b(normalized_new_block.encode(), digest_size=16).digest()
 
-            if normalized_new_block and normalized_new_block not in existing_blocks:
+            if normalized_new_block and digest not in existing_section['digests']:
                 existing_section['contents'].append(section['content'])
+                existing_section['digests'].add(digest)
 
             existing_section['merged'].append(section['heading'])
 
-        if not changed:
-            return prompt
-
-        final_sections = []
+        if not merged_away:
+            return
+
+        # What is left is merged_sections, in order; apply_edits keeps the
+        # final newline that content merged in from the last section may
+        # lack, so it does not run into the next heading
+        document.remove_sections(merged_away)
+        edits = []
+        for idx, section in enumerate(merged_sections):
+            if len(section['contents']) > 1:
+                _, content_start, end = document.section_span(idx)
+                edits.append((content_start, end, self._combine_section_contents(section['contents'])))
+        document.apply_edits(edits)
+
+        merge_summaries = []
         for section in merged_sections:
-            combined_content = self._combine_section_contents(section['contents'])
-            final_sections.append({
-                'heading': section['heading'],
-                'content': combined_content
-            })
-
-        rebuilt = self._rebuild_prompt(preamble, final_sections)
-
-        if rebuilt != prompt:
-            merge_summaries = []
-            for section in merged_sections:
-                if section['merged']:
-                    duplicates = [re.sub(r'^#+\s*', '', h).strip() for h in section['merged']]
-                    base_heading = re.sub(r'^#+\s*', '', section['heading']).strip()
-                    merge_summaries.append(f"{base_heading} (merged: {', '.join(duplicates)})")
+            if section['merged']:
+                duplicates = [re.sub(r'^#+\s*', '', h).strip() for h in section['merged']]
+                base_heading = re.sub(r'^#+\s*', '', section['heading']).strip()
+                merge_summaries.append(f"{base_heading} (merged: {', '.join(duplicates)})")
 
-            if merge_summaries:
-                self.optimizations_applied.append(
-                    "Merged sections: " + '; '.join(merge_summaries)
-                )
-
-            return rebuilt
-
-        return prompt
+        if merge_summaries:
+            self.optimizations_applied.append(
+                "Merged sections: " + '; '.join(merge_summaries)
+            )
 
-    def _consolidate_examples(self, prompt: str) -> str:
+    def _consolidate_examples(self, document: PromptDocument):
         """Consolidate excessive examples."""
-        preamble, sections = self._parse_sections(prompt)
+        sections = document.sections
         if not sections:
-            return prompt
+            return
 
         example_indices = [
             idx for idx, section in enumerate(sections)
@@ -483,74 +856,79 @@ class PromptOptimizer:
         ]
 
         if len(example_indices) <= 3:
-            return prompt
+            return
 
         keep_indices = set(example_indices[:2] + example_indices[-1:])
-        removed_titles: List[str] = []
-        filtered_sections: List[Dict[str, str]] = []
-
-        for idx, section in enumerate(sections):
-            if idx in example_indices and idx not in keep_indices:
-                title = re.sub(r'^#+\s*', '', section['heading']).strip()
-                removed_titles.append(title)
-                continue
-            filtered_sections.append(section)
-
-        rebuilt = self._rebuild_prompt(preamble, filtered_sections)
-
-        if rebuilt != prompt:
-            removed_display = ', '.join(removed_titles[:3])
-            if len(removed_titles) > 3:
-                removed_display += ', ...'
-            self.optimizations_applied.append(
-                f"Consolidated examples: kept {len(keep_indices)} of {len(example_indices)}"
-                + (f" (removed {removed_display})" if removed_display else '')
-            )
-            return rebuilt
-
-        return prompt
-
-    def _clean_formatting(self, prompt: str) -> str:
+        removed = [idx for idx in example_indices if idx not in keep_indices]
+        removed_titles = [re.sub(r'^#+\s*', '', sections[idx]['heading']).strip() for idx in removed]
+        document.remove_sections(removed)
+
+        removed_display = ', '.join(removed_titles[:3])
+        if len(removed_titles) > 3:
+            removed_display += ', ...'
+        self.optimizations_applied.append(
+            f"Consolidated examples: kept {len(keep_indices)} of {len(example_indices)}"
+            + (f" (removed {removed_display})" if removed_display else '')
+        )
+
+    def _clean_formatting(self, document: PromptDocument):
         """Clean excessive formatting."""
-        optimized = prompt
-
-        # Reduce excessive newlines
-        optimized = re.sub(r'\n\n\n+', '\n\n', optimized)
+        text = document.text()
+        edits = []
 
-        # Reduce excessive punctuation
-        optimized = re.sub(r'\.\.\.+', '...', optimized)
-        optimized = re.sub(r'!!!+', '!', optimized)
-        optimized = re.sub(r'\?\?\?+', '?', optimized)
+        # Reduce excessive newlines and punctuation
+        for pattern, replacement, needle in self.FORMATTING_RULES:
+            if needle in text:
+                edits.extend((match.start(), match.end(), replacement) for match in pattern.finditer(text))
 
         # Remove trailing whitespace
-        lines = [line.rstrip() for line in optimized.split('\n')]
-        optimized = '\n'.join(lines)
-
-        if len(optimized) < len(prompt):
-            savings = len(prompt) - len(optimized)
+        offset = 0
+        for line in text.split('\n'):
+            end = offset + len(line)
+            if line[-1:].isspace():
+                edits.append((offset + len(line.rstrip()), end, ''))
+            offset = end + 1
+
+        edits.sort()
+        savings = sum(end - start - len(replacement) for start, end, replacement in edits)
+        document.apply_edits(edits)
+
+        if savings > 0:
             self.optimizations_applied.append(f"Cleaned formatting (saved {savings} characters)")
 
-        return optimized
-
-    def _aggressive_optimization(self, prompt: str) -> str:
+    def _aggressive_optimization(self, document: PromptDocument):
         """Apply aggressive optimization techniques."""
-        optimized = prompt
-
         # Remove all examples except one
-        example_sections = re.findall(r'##?\s*Example[^#]*(?=##|$)', optimized, re.IGNORECASE | re.DOTALL)
-        if len(example_sections) > 1:
+        example_indices = [
+            idx for idx, section in enumerate(document.sections)
+            if self.EXAMPLE_HEADING.search(section['heading'])
+        ]
+        if len(example_indices) > 1:
             # Keep only the first example
-            for example in example_sections[1:]:
-                optimized = optimized.replace(example, '')
+            document.remove_sections(example_indices[1:])
             self.optimizations_applied.append(f"Aggressively reduced examples to 1")
 
-        # Simplify section headers
-        optimized = re.sub(r'##\s+(.+?)\s*\n', r'## \1\n', optimized)
+        # Simplify section headers: one space after ##, no trailing
+        # whitespace and no blank lines before the content
+        edits = []
+        for idx, section in enumerate(document.sections):
+            heading = section['heading']
+            match = self.SPACED_HEADING.search(heading)
+            content = section['content']
+            blank = len(content) - len(content.lstrip())
+            if not match or '\n' not in content[:blank]:
+                continue
+            heading_start, content_start, _ = document.section_span(idx)
+            simple = '## ' + match.group(1)
+            if heading[match.start():] != simple:
+                edits.append((heading_start + match.start(), content_start, simple))
+            cut = content.rfind('\n', 0, blank) + 1
+            if cut > 1:
+                edits.append((content_start, content_start + cut, '\n'))
+        document.apply_edits(edits)
 
         self.optimizations_applied.append("Applied aggressive optimization")
 
-        return optimized
-
     def _validate_quality(self, original: str, optimized: str) -> bool:
         """Validate that optimization maintained quality."""
         # Check that key sections are still present
@@ -654,6 +1032,15 @@ def create_optimization_report(analysis: Dict[str, Any] = None,
         for opt in optimization_result['optimizations_applied']:
             report += f"- ✅ {opt}\n"
 
+        if 'budget_passes' in optimization_result:
+            report += f"\n## Budget Passes\n\n"
+            report += f"Target: {optimization_result['target_tokens']:,} tokens\n\n"
+            if not optimization_result['budget_passes']:
+                report += "- Already within target, no passes needed\n"
+            for entry in optimization_result['budget_passes']:
+                report += (f"- **{entry['pass']}:** est. ~{entry['estimated_savings']} tokens, "
+                           f"{entry['elapsed_ms']:.2f}ms → {entry['tokens_after']:,} tokens\n")
+
     else:
         report = "# Error: No data provided for report generation"
 
@@ -677,6 +1064,15 @@ Examples:
 
   # Aggressive optimization
   python optimizer.py --prompt my-prompt.md --aggressive --output compact.md
+
+  # Cheapest passes that reach the target, aggressive ones only if needed
+  python optimizer.py --prompt my-prompt.md --target-tokens 4000 --budget --aggressive --output fitted.md
+
+  # Optimize and write the analysis report too, from one parse of the prompt
+  python optimizer.py --prompt my-prompt.md --with-analysis --output optimized.md --report result.json
+
+  # Target measured in BPE tokens (bundled vocabulary, no network)
+  python optimizer.py --prompt my-prompt.md --target-tokens 4000 --tokenizer bpe --output optimized.md
 """
     )
 
@@ -687,10 +1083,21 @@ Examples:
                        help='Target token count (default: 20%% reduction)')
     parser.add_argument('--aggressive', action='store_true',
                        help='Apply aggressive optimization (may reduce quality)')
+    parser.add_argument('--budget', action='store_true',
+                       help='Stop once the target is met, running the passes with the best '
+                            'estimated savings per millisecond first (--aggressive passes only '
+                            'if the others fall short)')
+    parser.add_argument('--with-analysis', action='store_true',
+                       help='Also write the analysis report (and add it to the JSON report '
+                            'as "analysis"), sharing the optimization\'s parse and scans')
     parser.add_argument('--output', help='Output file for optimized prompt')
     parser.add_argument('--report', help='Output JSON report file')
+    parser.add_argument('--tokenizer', default='heuristic', choices=['heuristic', 'bpe'],
+                       help='Token counting backend (default: heuristic; '
+                            'bpe uses the bundled vocabulary)')
 
     args = parser.parse_args()
+    import json
 
     # Load prompt
     prompt_file = Path(args.prompt)
@@ -700,7 +1107,7 @@ Examples:
     print(f"📝 Loading prompt: {prompt_file.name}")
     prompt_text = prompt_file.read_text()
 
-    optimizer = PromptOptimizer(aggressive=args.aggressive)
+    optimizer = PromptOptimizer(aggressive=args.aggressive, tokenizer=args.tokenizer)
 
     if args.analyze_only:
         # Analysis mode
@@ -738,7 +1145,12 @@ Examples:
         if args.aggressive:
             print(f"⚠️  Aggressive mode enabled")
 
-        optimized_prompt, result = optimizer.optimize(prompt_text, args.target_tokens)
+        analysis = None
+        if args.with_analysis:
+            analysis, optimized_prompt, result = optimizer.analyze_and_optimize(
+                prompt_text, args.target_tokens, budget=args.budget)
+        else:
+            optimized_prompt, result = optimizer.optimize(prompt_text, args.target_tokens, budget=args.budget)
 
         # Print results
         print(f"\n{'=' * 60}")
@@ -747,6 +1159,10 @@ Examples:
         print(f"Original: ~{result['original_stats']['estimated_tokens']} tokens")
         print(f"Optimized: ~{result['optimized_stats']['estimated_tokens']} tokens")
         print(f"Savings: {result['token_reduction']} tokens ({result['reduction_percentage']:.1f}%)")
+        if args.budget:
+            passes = ', '.join(entry['pass'] for entry in result['budget_passes']) or 'none'
+            print(f"Target: {result['target_tokens']} tokens "
+                  f"{'✅ met' if result['achieved_target'] else '❌ not met'} (passes: {passes})")
         print(f"Quality: {'✅ Maintained' if result['quality_maintained'] else '⚠️  Review needed'}")
 
         # Save optimized prompt
@@ -757,9 +1173,15 @@ Examples:
         # Save JSON report
         if args.report:
             with open(args.report, 'w') as f:
-                json.dump(result, f, indent=2)
+                json.dump(result if analysis is None else {**result, 'analysis': analysis}, f, indent=2)
             print(f"📊 JSON Report: {args.report}")
 
+        if analysis is not None:
+            report_text = create_optimization_report(analysis=analysis, prompt_file=prompt_file)
+            report_file = prompt_file.parent / f"{prompt_file.stem}-analysis.md"
+            report_file.write_text(report_text)
+            print(f"📋 Analysis Report: {report_file}")
+
         # Create markdown report
         report_text = create_optimization_report(optimization_result=result, prompt_file=prompt_file)
         report_file = output_file.parent / f"{output_file.stem}-optimization-report.md"
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Phrase Rewriter
+
+Compiles a table of phrase rules into one alternation, so the optimizer
+counts or rewrites every phrase in a single left-to-right pass instead of
+one re.sub (and one full copy of the text) per rule. Work is linear in the
+text size whatever the number of rules.
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+# A rule that starts with a literal ASCII letter, optionally after \b
+LEAD = re.compile(r'(\\b)?([A-Za-z])(?![?*+{])')
+
+# Characters IGNORECASE matches to an ASCII letter besides its upper/lower case
+EXTRA_CASES = {'i': '\u0130\u0131', 'k': '\u212a', 's': '\u017f'}
+
+
+class PhraseRewriter:
+    """
+    Ordered (pattern, value) rules matched by one compiled regex.
+
+    A rule's value is its replacement text for sub() (literal, no group
+    references) or its weight for weigh(). Where rules could match at the
+    same position, the earlier rule wins. Patterns must not have a
+    top-level '|' (group the alternatives instead).
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, Union[str, int]]], flags: int = 0):
+        self.rules = list(rules)
+        self.flags = flags
+        self._pattern: Optional['re.Pattern'] = None
+        # Group name -> rule index
+        self._index: Dict[str, int] = {f'r{i}': i for i in range(len(self.rules))}
+
+    @property
+    def pattern(self) -> 're.Pattern':
+        """The combined pattern, compiled on first use."""
+        if self._pattern is None:
+            self._pattern = self._compile()
+        return self._pattern
+
+    def _compile(self) -> 're.Pattern':
+        leads = [LEAD.match(pattern) for pattern, _ in self.rules]
+        if not all(leads):
+            return re.compile(
+                '|'.join(f'(?P<r{i}>{pattern})' for i, (pattern, _) in enumerate(self.rules)),
+                self.flags
+            )
+
+        # Every rule starts with a letter: open the pattern with the set of
+        # those letters, so the regex engine skips ahead to candidate
+        # characters in C, then dispatch on the letter to the rules that
+        # start with it. A plain alternation would try every rule at every
+        # character, which is slower than one scan per rule.
+        ignorecase = bool(self.flags & re.IGNORECASE)
+        branches: Dict[str, List[str]] = {}
+        for i, ((pattern, _), lead) in enumerate(zip(self.rules, leads)):
+            letter = lead.group(2).lower() if ignorecase else lead.group(2)
+            boundary = r'(?<=\b.)' if lead.group(1) else ''
+            branches.setdefault(letter, []).append(f'{boundary}(?P<r{i}>{pattern[lead.end():]})')
+
+        def cases(letter: str) -> str:
+            if not ignorecase:
+                return letter
+            return letter + letter.upper() + EXTRA_CASES.get(letter, '')
+
+        rest = '(?i:{})' if ignorecase else '(?:{})'
+        return re.compile(
+            '[' + ''.join(cases(letter) for letter in branches) + '](?:' + '|'.join(
+                f'(?<=[{cases(letter)}])' + rest.format('|'.join(rules))
+                for letter, rules in branches.items()
+            ) + ')',
+            self.flags & ~re.IGNORECASE
+        )
+
+    def count(self, text: str) -> List[int]:
+        """Matches of each rule, in rule order."""
+        counts = [0] * len(self.rules)
+        index = self._index
+        for match in self.pattern.finditer(text):
+            counts[index[match.lastgroup]] += 1
+        return counts
+
+    def weigh(self, text: str) -> int:
+        """Sum of the weights of every match."""
+        return sum(count * value for count, (_, value) in zip(self.count(text), self.rules))
+
+    def spans(self, text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, rule index) for each match in text[start:end]."""
+        index = self._index
+        matches = self.pattern.finditer(text, start) if end is None else self.pattern.finditer(text, start, end)
+        for match in matches:
+            yield match.start(), match.end(), index[match.lastgroup]
+
+    def sub(self, text: str) -> Tuple[str, List[int]]:
+        """
+        Replace every match with its rule's replacement.
+
+        Returns:
+            (rewritten text, matches of each rule in rule order)
+        """
+        counts = [0] * len(self.rules)
+        index = self._index
+        rules = self.rules
+
+        def replace(match: 're.Match') -> str:
+            rule = index[match.lastgroup]
+            counts[rule] += 1
+            return rules[rule][1]
+
+        return self.pattern.sub(replace, text), counts
@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Preset Catalog
+
+Discovers every quick-start preset under templates/presets once, indexes its
+front matter and body (BM25 full-text ranking), and persists the index to disk
+with mtime invalidation so later lookups skip the directory walk and parsing.
+
+Usage:
+    python preset_catalog.py --list
+    python preset_catalog.py --search "FDA submissions for medical devices" --limit 5
+    python preset_catalog.py --category legal --complexity advanced
+    python preset_catalog.py --build-bundle
+"""
+
+import re
+import json
+import math
+import struct
+import marshal
+import argparse
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Callable
+
+
+PRESET_ROOT = Path(__file__).parent.parent / 'templates' / 'presets'
+DEFAULT_INDEX_PATH = Path(__file__).parent.parent / 'outputs' / '.preset-catalog.json'
+DEFAULT_BUNDLE_PATH = Path(__file__).parent.parent / 'templates' / 'presets.bundle'
+
+# Bump whenever the record or index layout changes so stale files are rebuilt
+CATALOG_VERSION = 1
+
+# Bundle header: magic, bundle format version, marshal format version
+BUNDLE_MAGIC = b'PFPB'
+BUNDLE_VERSION = 1
+BUNDLE_HEADER = struct.Struct('<4sHH')
+
+# Front matter keys exposed as metadata filters
+FILTER_FIELDS = ('preset_name', 'category', 'role', 'domain', 'output_type', 'complexity')
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+MARKDOWN_VALUE_PATTERN = re.compile(r'\*\*([^*\n]+):\*\*\s*([^\n]+)')
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'is', 'it', 'of', 'on', 'or', 'the', 'to', 'with', 'your', 'our', 'this', 'that'
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split into index terms."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower())
+            if token not in STOP_WORDS]
+
+
+def parse_preset(content: str, preset_name: str) -> Dict[str, Any]:
+    """
+    Parse preset markdown into a catalog record.
+
+    Front matter values win over the matching **Label:** lines in the body.
+
+    Returns:
+        Dict with front matter, resolved response fields and the body text
+    """
+    # Extract front matter (--- delimited key: value pairs)
+    front_matter: Dict[str, str] = {}
+    body = content
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        if len(parts) >= 3:
+            front_block = parts[1]
+            body = parts[2]
+            for line in front_block.strip().splitlines():
+                if ':' not in line:
+                    continue
+                key, value = line.split(':', 1)
+                front_matter[key.strip()] = value.strip()
+
+    # Collect every **Label:** value in one pass; first occurrence wins
+    markdown_values: Dict[str, str] = {}
+    for match in MARKDOWN_VALUE_PATTERN.finditer(body):
+        markdown_values.setdefault(match.group(1), match.group(2).strip())
+
+    def resolve(key: str, label: str) -> Optional[str]:
+        if front_matter.get(key) is not None:
+            return front_matter[key]
+        return markdown_values.get(label)
+
+    return {
+        'name': preset_name,
+        'front_matter': front_matter,
+        'role': resolve('role', 'Role') or preset_name.replace('-', ' ').title(),
+        'domain': resolve('domain', 'Domain'),
+        'output_type': resolve('output_type', 'Output Type'),
+        'tone': resolve('tone', 'Tone'),
+        'tech_stack': resolve('tech_stack', 'Tech Stack'),
+        'body': body,
+    }
+
+
+class PresetCatalog:
+    """Indexed, persisted catalog of quick-start presets."""
+
+    # BM25 tuning constants
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, root: Path = PRESET_ROOT, index_path: Optional[Path] = DEFAULT_INDEX_PATH):
+        self.root = Path(root)
+        self.index_path = Path(index_path) if index_path else None
+        self.sources: Dict[str, List[int]] = {}
+        self.records: Dict[str, Dict[str, Any]] = {}
+        # Postings are flat [doc_id, term_frequency, ...] lists keyed by term;
+        # doc ids index into doc_names / doc_lengths
+        self.doc_names: List[str] = []
+        self.doc_lengths: List[int] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.avg_doc_length = 0.0
+
+    @classmethod
+    def load(cls, root: Path = PRESET_ROOT,
+             index_path: Optional[Path] = DEFAULT_INDEX_PATH) -> 'PresetCatalog':
+        """Load the persisted index, rebuilding it if any preset changed."""
+        catalog = cls(root, index_path)
+        sources = catalog._scan_sources()
+
+        if not catalog._load_index(sources):
+            catalog.build(sources)
+            catalog.save()
+
+        return catalog
+
+    def _scan_sources(self) -> Dict[str, List[int]]:
+        """Stat every preset file; the result is the invalidation key."""
+        sources = {}
+        for path in sorted(self.root.glob('**/*.md')):
+            stat = path.stat()
+            sources[path.relative_to(self.root).as_posix()] = [stat.st_mtime_ns, stat.st_size]
+        return sources
+
+    def _load_index(self, sources: Dict[str, List[int]]) -> bool:
+        """Populate from the persisted index if it matches the current sources."""
+        if not self.index_path or not self.index_path.exists():
+            return False
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get('version') != CATALOG_VERSION or data.get('sources') != sources:
+            return False
+
+        self.sources = sources
+        self.records = data['records']
+        self.doc_names = data['doc_names']
+        self.doc_lengths = data['doc_lengths']
+        self.postings = data['postings']
+        self.avg_doc_length = data['avg_doc_length']
+        return True
+
+    def build(self, sources: Optional[Dict[str, List[int]]] = None):
+        """Parse every preset and rebuild the inverted index."""
+        if sources is None:
+            sources = self._scan_sources()
+
+        self.sources = sources
+        self.records = {}
+        self.doc_names = []
+        self.doc_lengths = []
+        self.postings = {}
+
+        for relative_path in sources:
+            preset_file = self.root / relative_path
+            name = preset_file.stem
+            if name in self.records:
+                # Presets are looked up by name alone, so one would shadow the other
+                raise ValueError(f"Duplicate preset name '{name}': "
+                                 f"{self.records[name]['template']} and {relative_path}")
+            parsed = parse_preset(preset_file.read_text(encoding='utf-8'), name)
+            body = parsed.pop('body')
+
+            parsed['template'] = relative_path
+            parsed['category'] = parsed['front_matter'].get('category', preset_file.parent.name)
+            self.records[name] = parsed
+
+            # Index front matter values alongside the body so roles and domains rank
+            indexed_text = ' '.join(parsed['front_matter'].values()) + '\n' + body
+            terms = Counter(tokenize(indexed_text))
+            doc_id = len(self.doc_names)
+            self.doc_names.append(name)
+            self.doc_lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                self.postings.setdefault(term, []).extend((doc_id, frequency))
+
+        total_length = sum(self.doc_lengths)
+        self.avg_doc_length = total_length / len(self.doc_lengths) if self.doc_lengths else 0.0
+
+    def save(self):
+        """Persist the index next to the generated outputs (best effort)."""
+        if not self.index_path:
+            return
+
+        data = {
+            'version': CATALOG_VERSION,
+            'root': str(self.root),
+            'sources': self.sources,
+            'records': self.records,
+            'doc_names': self.doc_names,
+            'doc_lengths': self.doc_lengths,
+            'postings': self.postings,
+            'avg_doc_length': self.avg_doc_length,
+        }
+
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            temp_path.replace(self.index_path)
+        except OSError:
+            # A read-only checkout still works, it just rebuilds on every load
+            pass
+
+    def names(self) -> List[str]:
+        """All preset names in catalog order."""
+        return list(self.records)
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """Look up a preset record by name."""
+        record = self.records.get(name)
+        if record is None:
+            suggestions = [match['name'] for _, match in self.search(name.replace('-', ' '), limit=3)]
+            hint = f" (did you mean: {', '.join(suggestions)}?)" if suggestions else ''
+            raise ValueError(f"Unknown preset: {name}{hint}")
+        return record
+
+    def path_for(self, name: str) -> Path:
+        """Absolute path of a preset's source markdown."""
+        return self.root / self.get(name)['template']
+
+    def read_record(self, name: str, signature: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+        """
+        Return a preset record that is current for the given file signature.
+
+        The indexed record is reused when the (mtime_ns, size) signature still
+        matches the one the index was built from; otherwise the markdown is
+        re-parsed so edits show up without a full catalog rebuild.
+        """
+        indexed = self.get(name)
+        relative_path = indexed['template']
+        if signature is not None and list(signature) == self.sources.get(relative_path):
+            return indexed
+
+        preset_file = self.root / relative_path
+        if not preset_file.exists():
+            raise FileNotFoundError(f"Preset file not found: {preset_file}")
+
+        record = parse_preset(preset_file.read_text(encoding='utf-8'), name)
+        del record['body']
+        record['template'] = relative_path
+        record['category'] = record['front_matter'].get('category', preset_file.parent.name)
+        return record
+
+    def filter(self, **criteria: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Return presets whose front matter matches every given field.
+
+        Matching is case-insensitive; comma-separated values such as
+        output_type match on any listed item.
+        """
+        wanted = {key: value.strip().lower() for key, value in criteria.items() if value}
+        unknown = set(wanted) - set(FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown filter field(s): {', '.join(sorted(unknown))}")
+
+        matches = []
+        for record in self.records.values():
+            if all(self._field_matches(record, key, value) for key, value in wanted.items()):
+                matches.append(record)
+        return matches
+
+    @staticmethod
+    def _field_matches(record: Dict[str, Any], key: str, wanted: str) -> bool:
+        actual = (record['front_matter'].get(key) or record.get(key) or '').lower()
+        if actual == wanted:
+            return True
+        return wanted in (item.strip() for item in actual.split(','))
+
+    def search(self, query: str, limit: int = 5,
+               **criteria: Optional[str]) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Rank presets against a free-text task description using BM25.
+
+        Returns:
+            List of (score, record) pairs, best match first
+        """
+        allowed = None
+        if any(criteria.values()):
+            allowed = {record['name'] for record in self.filter(**criteria)}
+
+        total_docs = len(self.doc_names)
+        scores: Dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            doc_frequency = len(postings) // 2
+            idf = math.log(1 + (total_docs - doc_frequency + 0.5) / (doc_frequency + 0.5))
+            for i in range(0, len(postings), 2):
+                doc_id, frequency = postings[i], postings[i + 1]
+                if allowed is not None and self.doc_names[doc_id] not in allowed:
+                    continue
+                length_norm = 1 - self.B + self.B * self.doc_lengths[doc_id] / self.avg_doc_length
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    frequency * (self.K1 + 1) / (frequency + self.K1 * length_norm)
+                )
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.doc_names[item[0]]))[:limit]
+        return [(score, self.records[self.doc_names[doc_id]]) for doc_id, score in ranked]
+
+
+def compile_bundle(catalog: PresetCatalog, path: Path = DEFAULT_BUNDLE_PATH) -> Path:
+    """Compile every parsed preset record into one versioned marshal bundle."""
+    payload = marshal.dumps({
+        'records': catalog.records,
+        'sources': {relative: tuple(signature) for relative, signature in catalog.sources.items()},
+    })
+    header = BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, marshal.version)
+
+    path = Path(path)
+    temp_path = path.with_suffix('.tmp')
+    temp_path.write_bytes(header + payload)
+    temp_path.replace(path)
+    return path
+
+
+class PresetBundle:
+    """Pre-parsed preset records loaded with a single read at startup.
+
+    Records are only served while their source file still has the
+    (mtime_ns, size) it had at build time; callers fall back to the
+    markdown (via PresetCatalog) for anything stale or missing.
+    """
+
+    def __init__(self, records: Dict[str, Dict[str, Any]],
+                 sources: Dict[str, Tuple[int, int]], root: Path = PRESET_ROOT):
+        self.records = records
+        self.sources = sources
+        self.root = Path(root)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_BUNDLE_PATH,
+             root: Path = PRESET_ROOT) -> Optional['PresetBundle']:
+        """Read a bundle, or return None if it is missing or from another version."""
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            return None
+
+        if len(data) < BUNDLE_HEADER.size:
+            return None
+        magic, version, marshal_version = BUNDLE_HEADER.unpack_from(data)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION or marshal_version != marshal.version:
+            return None
+
+        try:
+            payload = marshal.loads(data[BUNDLE_HEADER.size:])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+        return cls(payload['records'], payload['sources'], root)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.records
+
+    def path_for(self, name: str) -> Path:
+        """Absolute path of a bundled preset's source markdown."""
+        return self.root / self.records[name]['template']
+
+    def read_record(self, name: str, signature: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        """Return the bundled record, or None if its source changed since the build."""
+        record = self.records[name]
+        if self.sources.get(record['template']) != tuple(signature):
+            return None
+        return record
+
+
+class PresetCache:
+    """Bounded, thread-safe LRU of parsed preset records.
+
+    Entries are keyed by preset name and remember the (mtime_ns, size) of the
+    source file they were parsed from; a changed file counts as a miss.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, name: str, path: Path,
+            loader: Callable[[Tuple[int, int]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the cached record for name, calling loader(signature) on a miss."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Preset file not found: {path}")
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(name)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self.invalidations += 1
+            self.misses += 1
+
+        # Parse outside the lock so slow reads don't serialize other workers
+        record = loader(signature)
+
+        with self._lock:
+            self._entries[name] = (signature, record)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return record
+
+    def clear(self):
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for reporting."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Browse and search quick-start presets',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # List every preset
+  python preset_catalog.py --list
+
+  # Find the best preset for a task
+  python preset_catalog.py --search "quarterly board deck on churn" --limit 3
+
+  # Filter by metadata
+  python preset_catalog.py --category executive --complexity advanced
+"""
+    )
+
+    parser.add_argument('--list', action='store_true', help='List all presets')
+    parser.add_argument('--search', help='Rank presets against a task description')
+    parser.add_argument('--limit', type=int, default=5, help='Maximum search results (default: 5)')
+    for field in FILTER_FIELDS:
+        parser.add_argument(f"--{field.replace('_', '-')}", dest=field,
+                           help=f'Filter by {field}')
+    parser.add_argument('--rebuild', action='store_true',
+                       help='Rebuild the persisted index even if it is fresh')
+    parser.add_argument('--build-bundle', nargs='?', const=str(DEFAULT_BUNDLE_PATH),
+                       metavar='PATH',
+                       help='Compile all presets into a fast-loading bundle '
+                            '(default: templates/presets.bundle)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+
+    if args.rebuild:
+        catalog = PresetCatalog()
+        catalog.build()
+        catalog.save()
+        print(f"✓ Rebuilt preset index: {len(catalog.records)} presets")
+    else:
+        catalog = PresetCatalog.load()
+
+    if args.build_bundle:
+        bundle_path = compile_bundle(catalog, Path(args.build_bundle))
+        print(f"📦 Compiled {len(catalog.records)} presets: {bundle_path} "
+              f"({bundle_path.stat().st_size:,} bytes)")
+
+    criteria = {field: getattr(args, field) for field in FILTER_FIELDS}
+
+    if args.search:
+        results = [{'score': round(score, 3), **record}
+                   for score, record in catalog.search(args.search, args.limit, **criteria)]
+    elif args.list or any(criteria.values()):
+        results = catalog.filter(**criteria)
+    else:
+        if not (args.rebuild or args.build_bundle):
+            parser.error("One of --list, --search or a filter option is required")
+        return
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"📚 {len(results)} preset(s)")
+    for record in results:
+        score = f" [{record['score']:.2f}]" if 'score' in record else ''
+        complexity = record['front_matter'].get('complexity', '-')
+        print(f"  - {record['name']}{score} ({record['category']}, {complexity}): {record['role']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Stage Profiler
+
+High-resolution per-stage timing for prompt generation. Callers hold an
+optional StageProfiler and only touch the clock when one is attached, so a
+disabled profiler costs a single `is not None` check per stage.
+"""
+
+import threading
+from time import perf_counter_ns
+from typing import Dict, List, Any, Optional
+
+
+class StageProfiler:
+    """Aggregate stage timings (count, total, p50, p99) across calls."""
+
+    def __init__(self):
+        self._samples: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now() -> int:
+        """Current high-resolution timestamp in nanoseconds."""
+        return perf_counter_ns()
+
+    def record(self, stage: str, started_ns: int,
+               timings: Optional[Dict[str, float]] = None) -> int:
+        """
+        Record the time elapsed since started_ns for a stage.
+
+        Args:
+            stage: Stage name, e.g. 'render.xml'
+            started_ns: Value of now() when the stage began
+            timings: Optional per-call dict to receive the duration in ms
+
+        Returns:
+            The current timestamp, so consecutive stages can chain
+        """
+        finished_ns = perf_counter_ns()
+        elapsed_ns = finished_ns - started_ns
+
+        with self._lock:
+            self._samples.setdefault(stage, []).append(elapsed_ns)
+
+        if timings is not None:
+            timings[stage] = round(timings.get(stage, 0.0) + elapsed_ns / 1e6, 4)
+
+        return finished_ns
+
+    def merge(self, timings: Dict[str, float]):
+        """Add per-call timings (ms, as filled in by record()) taken elsewhere, e.g. in a worker process."""
+        with self._lock:
+            for stage, elapsed_ms in timings.items():
+                self._samples.setdefault(stage, []).append(int(elapsed_ms * 1e6))
+
+    def reset(self):
+        """Discard all recorded samples."""
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage count, total, p50 and p99 in milliseconds."""
+        with self._lock:
+            snapshot = {stage: sorted(samples) for stage, samples in self._samples.items()}
+
+        summary = {}
+        for stage, samples in snapshot.items():
+            summary[stage] = {
+                'count': len(samples),
+                'total_ms': sum(samples) / 1e6,
+                'p50_ms': self._percentile(samples, 50) / 1e6,
+                'p99_ms': self._percentile(samples, 99) / 1e6,
+            }
+        return summary
+
+    @staticmethod
+    def _percentile(sorted_samples: List[int], percent: int) -> int:
+        """Nearest-rank percentile of pre-sorted samples."""
+        rank = max(1, -(-len(sorted_samples) * percent // 100))
+        return sorted_samples[rank - 1]
+
+    def format_table(self) -> str:
+        """Render the summary as a fixed-width console table."""
+        summary = self.summary()
+        if not summary:
+            return "⏱️  No stage timings recorded"
+
+        width = max(len('stage'), max(len(stage) for stage in summary))
+        lines = [
+            "⏱️  Stage timings (ms)",
+            f"  {'stage':<{width}}  {'count':>7}  {'total':>10}  {'p50':>9}  {'p99':>9}",
+        ]
+        for stage, stats in sorted(summary.items(), key=lambda item: -item[1]['total_ms']):
+            lines.append(
+                f"  {stage:<{width}}  {stats['count']:>7}  {stats['total_ms']:>10.3f}  "
+                f"{stats['p50_ms']:>9.4f}  {stats['p99_ms']:>9.4f}"
+            )
+        return '\n'.join(lines)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Quality Gate Registry
+
+Ordered registry of the quality gates shared by the validator and the
+generator. Gates run cheapest first against a GateContext whose shared scans
+(tag tree, lowercased text, phrase counts) are built on first use, so a gate
+that never runs never pays for them. In fail-fast mode a run stops as soon
+as the pass threshold is guaranteed or out of reach.
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from profiling import StageProfiler
+
+
+class GateOutcome:
+    """What one gate contributed: points, its report entry, and any issue or warning."""
+
+    __slots__ = ('points', 'entry', 'issue', 'warning')
+
+    def __init__(self, points: int, entry: Dict[str, Any], issue: Optional[str] = None,
+                 warning: Optional[str] = None):
+        self.points = points
+        self.entry = entry
+        self.issue = issue
+        self.warning = warning
+
+
+class Gate:
+    """A registered gate: key, display name, relative cost and check function."""
+
+    __slots__ = ('key', 'name', 'cost', 'check')
+
+    def __init__(self, key: str, name: str, cost: int, check: Callable[..., GateOutcome]):
+        self.key = key
+        self.name = name
+        self.cost = cost
+        self.check = check
+
+
+class PhraseCounts(dict):
+    """Occurrences of each phrase in a lowercased text, counted on first lookup."""
+
+    def __init__(self, lowered: str):
+        super().__init__()
+        self.lowered = lowered
+
+    def __missing__(self, phrase: str) -> int:
+        count = self[phrase] = self.lowered.count(phrase)
+        return count
+
+
+class GateContext:
+    """
+    The prompt under validation plus its shared scans.
+
+    ctx['name'] builds a scan with its provider on first access and caches it;
+    providers receive the context, so one scan can build on another.
+    """
+
+    def __init__(self, prompt: str, format_hint: str,
+                 providers: Dict[str, Callable[['GateContext'], Any]]):
+        self.prompt = prompt
+        self.format = format_hint
+        self._providers = providers
+        self._scans: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._scans:
+            self._scans[name] = self._providers[name](self)
+        return self._scans[name]
+
+
+class GateRegistry:
+    """Gates in report order, run in cost order, each worth at most one point."""
+
+    def __init__(self, pass_threshold: int):
+        self.pass_threshold = pass_threshold
+        self._gates: List[Gate] = []
+        self._run_order: List[Gate] = []
+
+    def register(self, key: str, name: str, cost: int):
+        """
+        Decorator registering check(owner, ctx) -> GateOutcome as a gate.
+
+        Args:
+            key: Key of the gate's entry in results['gates']
+            name: Display name
+            cost: Relative cost; cheaper gates run first
+        """
+        def decorator(check: Callable[..., GateOutcome]) -> Callable[..., GateOutcome]:
+            self._gates.append(Gate(key, name, cost, check))
+            # Stable sort: equal costs keep registration order
+            self._run_order = sorted(self._gates, key=lambda gate: gate.cost)
+            return check
+        return decorator
+
+    def __iter__(self) -> Iterator[Gate]:
+        return iter(self._gates)
+
+    def __len__(self) -> int:
+        return len(self._gates)
+
+    def run(self, owner: Any, ctx: GateContext, fail_fast: bool = False,
+            profiler: Optional['StageProfiler'] = None,
+            timings: Optional[Dict[str, float]] = None) -> Tuple[Dict[str, GateOutcome], List[str]]:
+        """
+        Run the gates cheapest first.
+
+        Args:
+            owner: Passed to each check as its first argument (the validator
+                or generator the gates were registered on)
+            ctx: Prompt and shared scans
+            fail_fast: Stop once the pass threshold is reached or can no
+                longer be reached
+            profiler: Records each gate as stage 'gate.<key>'
+            timings: Optional per-call dict receiving each gate's cost in ms
+
+        Returns:
+            (outcomes by gate key, keys of skipped gates in report order)
+        """
+        outcomes: Dict[str, GateOutcome] = {}
+        score = 0
+        remaining = len(self._run_order)
+
+        for gate in self._run_order:
+            if fail_fast and (score >= self.pass_threshold
+                              or score + remaining < self.pass_threshold):
+                break
+
+            if profiler is None:
+                outcome = gate.check(owner, ctx)
+            else:
+                started = profiler.now()
+                outcome = gate.check(owner, ctx)
+                profiler.record(f'gate.{gate.key}', started, timings)
+
+            outcomes[gate.key] = outcome
+            score += outcome.points
+            remaining -= 1
+
+        skipped = [gate.key for gate in self._gates if gate.key not in outcomes]
+        return outcomes, skipped
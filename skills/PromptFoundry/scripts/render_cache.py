@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Render Cache
+
+Content-addressed, persistent cache for PromptGenerator.generate().
+Entries are keyed by a stable hash of the normalized responses, format, mode
+and generator version, and hold the rendered prompt(s) plus their validation
+results, so re-running an unchanged batch costs little more than hashing it.
+"""
+
+import json
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, Iterable
+
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / 'outputs' / '.render-cache.sqlite3'
+
+
+class RenderCache:
+    """SQLite-backed render cache, safe to share across worker threads."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+        # sqlite3 is only imported once a cache is actually opened
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL + NORMAL sync keeps per-row commits cheap during large batches
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS renders ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at TEXT NOT NULL)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(responses: Dict[str, Any], fields: Iterable[str],
+                 format_type: str, mode: str, version: str) -> str:
+        """
+        Hash the inputs that determine a render.
+
+        Only the response fields the renderers read are included, so extra
+        batch columns (name, notes, ...) don't fragment the cache.
+        """
+        import hashlib
+
+        normalized = {field: responses[field] for field in fields if field in responses}
+        payload = json.dumps([version, format_type, mode, normalized],
+                             sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None."""
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM renders WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store a rendered result under key."""
+        encoded = json.dumps(value, separators=(',', ':'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO renders (key, value, created_at) VALUES (?, ?, ?)',
+                (key, encoded, datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every cached render."""
+        with self._lock:
+            self._conn.execute('DELETE FROM renders')
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for reporting."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'path': str(self.path),
+        }
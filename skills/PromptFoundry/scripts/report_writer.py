@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Report Writers
+
+Machine-readable run reports for the validator and the batch generator.
+'json' keeps every result and writes one document at the end. 'jsonl'
+appends one JSON record per line as each result completes and ends with a
+summary trailer, so memory stays flat however many files a run covers and
+a crashed or interrupted run still leaves every finished result on disk
+(a report without a trailer is partial).
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+
+REPORT_FORMATS = ('json', 'jsonl')
+
+
+class JsonReport:
+    """One JSON document, {timestamp, <summary>, results: [...]}, written on close()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.results: List[Dict[str, Any]] = []
+
+    def add(self, result: Dict[str, Any]):
+        self.results.append(result)
+
+    def close(self, summary: Dict[str, Any]):
+        report_data = {
+            'timestamp': datetime.now().isoformat(),
+            **summary,
+            'results': self.results
+        }
+
+        with open(self.path, 'w') as f:
+            json.dump(report_data, f, indent=2)
+
+
+class JsonlReport:
+    """JSON Lines: each result on its own line as it arrives, then {"summary": {...}}."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # Line buffered: every record reaches the file as soon as it is written
+        self._file = open(path, 'w', encoding='utf-8', buffering=1)
+
+    def add(self, result: Dict[str, Any]):
+        self._file.write(json.dumps(result, separators=(',', ':')) + '\n')
+
+    def close(self, summary: Dict[str, Any]):
+        trailer = {'summary': {'timestamp': datetime.now().isoformat(), **summary}}
+        self._file.write(json.dumps(trailer, separators=(',', ':')) + '\n')
+        self._file.close()
+
+
+def open_report(path: str, report_format: str = 'json'):
+    """
+    Report writer for a format in REPORT_FORMATS.
+
+    Returns:
+        A writer with add(result) and close(summary)
+    """
+    if report_format == 'jsonl':
+        return JsonlReport(path)
+    return JsonReport(path)
+
+
+def load_jsonl_report(path: str) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Read a JSON Lines report.
+
+    Returns:
+        (result records, summary trailer or None if the run did not finish)
+    """
+    results = []
+    summary = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a truncated last line
+                break
+            if 'summary' in record and len(record) == 1:
+                summary = record['summary']
+            else:
+                results.append(record)
+    return results, summary
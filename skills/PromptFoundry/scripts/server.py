@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Generation Server
+
+Long-running local server that keeps PromptGenerator, PromptValidator and
+PromptOptimizer warm, together with the preset catalog, compiled templates
+and compiled patterns. Requests are answered from memory instead of paying
+for a fresh interpreter, imports and preset parsing on every call.
+
+Endpoints (JSON in, JSON out):
+    GET  /health                   Liveness and request counters
+    GET  /presets?q=...&limit=N    List or search quick-start presets
+    POST /generate                 {"preset"|"responses", "format", "mode", "document"}
+    POST /validate                 {"prompt", "format"}
+    POST /optimize                 {"prompt", "target_tokens", "aggressive", "analyze_only"}
+
+Usage:
+    python server.py --port 8765
+    python server.py --socket /tmp/promptfoundry.sock --max-concurrent 32
+"""
+
+import json
+import asyncio
+import threading
+import argparse
+from time import monotonic
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from typing import Dict, Any, Tuple, Optional
+
+from generate_prompt import PromptGenerator, create_markdown_document
+from validator import PromptValidator
+from optimizer import PromptOptimizer
+from render_cache import RenderCache, DEFAULT_CACHE_PATH
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_CONCURRENT = 16
+MAX_BODY_BYTES = 4 * 1024 * 1024
+FORMATS = ('xml', 'claude', 'chatgpt', 'gemini', 'all')
+MODES = ('core', 'advanced')
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+
+class RequestError(Exception):
+    """A client error reported back as a JSON error body."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class PromptServer:
+    """Warm generator/validator/optimizer state behind a small HTTP front end."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 render_cache: Optional[RenderCache] = None):
+        self.generator = PromptGenerator(render_cache=render_cache)
+        self.validator = PromptValidator()
+        self.optimizers = {
+            False: PromptOptimizer(aggressive=False),
+            True: PromptOptimizer(aggressive=True),
+        }
+        self.render_cache = render_cache
+        self.max_concurrent = max_concurrent
+        self.started_at = monotonic()
+        self.requests_served = 0
+        self.in_flight = 0
+
+        self.routes = {
+            ('GET', '/health'): self.handle_health,
+            ('GET', '/presets'): self.handle_presets,
+            ('POST', '/generate'): self.handle_generate,
+            ('POST', '/validate'): self.handle_validate,
+            ('POST', '/optimize'): self.handle_optimize,
+        }
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._executor = None
+        # Generator, validator and optimizers keep per-call state, so each is
+        # used by one worker thread at a time
+        self._generator_lock = threading.Lock()
+        self._validator_lock = threading.Lock()
+        self._optimizer_locks = {False: threading.Lock(), True: threading.Lock()}
+
+    def warm_up(self):
+        """Load the catalog and exercise every code path once before serving."""
+        catalog = self.generator._get_catalog()
+        names = catalog.names()
+        if names:
+            responses = self.generator.load_preset(names[0])
+            result = self.generator.generate(responses, 'all', 'core')
+            for fmt, prompt in result['formats'].items():
+                self.validator.validate(prompt, fmt)
+            self.optimizers[False].analyze(result['formats']['xml'])
+        return len(names)
+
+    # ------------------------------------------------------------------
+    # Handlers: each takes (query, payload) and returns a JSON-able dict.
+    # They run on worker threads, off the event loop, so a slow request
+    # does not hold up reading and answering the others; they hold the lock
+    # of the component they use.
+    # ------------------------------------------------------------------
+
+    def handle_health(self, query: Dict[str, list], payload: Any) -> Dict[str, Any]:
+        """Liveness probe with basic counters."""
+        health = {
+            'status': 'ok',
+            'uptime_seconds': round(monotonic() - self.started_at, 3),
+            'requests_served': self.requests_served,
+            'in_flight': self.in_flight,
+            'max_concurrent': self.max_concurrent,
+            'presets': len(self.generator._get_catalog().names()),
+            'preset_cache': self.generator.preset_cache.stats(),
+        }
+        if self.render_cache is not None:
+            health['render_cache'] = self.render_cache.stats()
+        return health
+
+    def handle_presets(self, query: Dict[str, list], payload: Any) -> Dict[str, Any]:
+        """List presets, or rank them against ?q= when given."""
+        text = query.get('q', [''])[0]
+        if not text:
+            return {'presets': self.generator._get_catalog().names()}
+
+        limit = self._int_param(query.get('limit', ['5'])[0], 'limit')
+        with self._generator_lock:
+            matches = self.generator.find_presets(text, limit)
+        return {'presets': [{'name': record['name'], 'role': record['role'],
+                             'domain': record['domain']} for record in matches]}
+
+    def handle_generate(self, query: Dict[str, list], payload: Any) -> Dict[str, Any]:
+        """Generate prompt(s) from a preset and/or explicit responses."""
+        payload = self._require_object(payload)
+        format_type = payload.get('format', 'xml')
+        mode = payload.get('mode', 'core')
+        if format_type not in FORMATS:
+            raise RequestError(400, f"format must be one of: {', '.join(FORMATS)}")
+        if mode not in MODES:
+            raise RequestError(400, f"mode must be one of: {', '.join(MODES)}")
+
+        responses = payload.get('responses') or {}
+        if not isinstance(responses, dict):
+            raise RequestError(400, "responses must be a JSON object")
+        not_strings = sorted(key for key, value in responses.items() if not isinstance(value, str))
+        if not_strings:
+            raise RequestError(400, f"responses values must be strings: {', '.join(not_strings)}")
+        preset = payload.get('preset')
+        if preset is not None and not isinstance(preset, str):
+            raise RequestError(400, "preset must be a string")
+
+        with self._generator_lock:
+            if preset:
+                # Explicit responses override preset values, as in batch rows
+                responses = {**self.generator.load_preset(preset), **responses}
+            if not responses:
+                raise RequestError(400, "Either preset or responses is required")
+
+            result = self.generator.generate(responses, format_type, mode)
+        if payload.get('document'):
+            result['document'] = create_markdown_document(result, mode)
+        return result
+
+    def handle_validate(self, query: Dict[str, list], payload: Any) -> Dict[str, Any]:
+        """Run the 7 quality gates over a prompt."""
+        payload = self._require_object(payload)
+        prompt = self._require_prompt(payload)
+        with self._validator_lock:
+            return self.validator.validate(prompt, payload.get('format', 'auto'))
+
+    def handle_optimize(self, query: Dict[str, list], payload: Any) -> Dict[str, Any]:
+        """Analyze or optimize a prompt for token efficiency."""
+        payload = self._require_object(payload)
+        prompt = self._require_prompt(payload)
+        aggressive = bool(payload.get('aggressive'))
+        optimizer = self.optimizers[aggressive]
+
+        if payload.get('analyze_only'):
+            with self._optimizer_locks[aggressive]:
+                return optimizer.analyze(prompt)
+
+        target_tokens = payload.get('target_tokens')
+        if target_tokens is not None:
+            target_tokens = self._int_param(target_tokens, 'target_tokens')
+        with self._optimizer_locks[aggressive]:
+            optimized, result = optimizer.optimize(prompt, target_tokens)
+        result['optimized_prompt'] = optimized
+        return result
+
+    @staticmethod
+    def _require_object(payload: Any) -> Dict[str, Any]:
+        if not isinstance(payload, dict):
+            raise RequestError(400, "Request body must be a JSON object")
+        return payload
+
+    @staticmethod
+    def _require_prompt(payload: Dict[str, Any]) -> str:
+        prompt = payload.get('prompt')
+        if not isinstance(prompt, str) or not prompt:
+            raise RequestError(400, "prompt must be a non-empty string")
+        return prompt
+
+    @staticmethod
+    def _int_param(value: Any, name: str) -> int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise RequestError(400, f"{name} must be an integer")
+
+    # ------------------------------------------------------------------
+    # HTTP/1.1 plumbing
+    # ------------------------------------------------------------------
+
+    def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """Route one request and return (status, response body)."""
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                return 405, {'error': f"{method} not allowed on {url.path}"}
+            return 404, {'error': f"No endpoint at {url.path}"}
+
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError as e:
+            return 400, {'error': f"Invalid JSON body: {e}"}
+
+        try:
+            return 200, handler(parse_qs(url.query), payload)
+        except RequestError as e:
+            return e.status, {'error': str(e)}
+        except (ValueError, KeyError) as e:
+            return 400, {'error': str(e).strip('"\'')}
+        except Exception as e:
+            return 500, {'error': f"{type(e).__name__}: {e}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve keep-alive requests on one connection until the client closes."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'Malformed request line'}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                              else connection == 'keep-alive')
+
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+                if length < 0 or length > MAX_BODY_BYTES:
+                    status = 400 if length < 0 else 413
+                    await self._respond(writer, status, {'error': 'Invalid or oversized body'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                # Bound the number of requests being handled at once; extra
+                # requests wait here for a free worker
+                async with self._limit:
+                    self.in_flight += 1
+                    try:
+                        status, response = await asyncio.get_running_loop().run_in_executor(
+                            self._executor, self.dispatch, method.upper(), target, body)
+                    finally:
+                        self.in_flight -= 1
+                self.requests_served += 1
+
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int,
+                       body: Dict[str, Any], keep_alive: bool):
+        encoded = json.dumps(body, separators=(',', ':'), default=str).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(encoded)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode('latin-1')
+        writer.write(head + encoded)
+        await writer.drain()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    socket_path: Optional[str] = None):
+        """Start listening and serve until cancelled."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._limit = asyncio.Semaphore(self.max_concurrent)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                            thread_name_prefix='promptfoundry')
+        try:
+            if socket_path:
+                server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+            else:
+                server = await asyncio.start_server(self.handle_connection, host, port)
+
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Serve prompt generation, validation and optimization from warm state',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Serve on localhost:8765
+  python server.py
+
+  # Serve on a Unix socket with a render cache
+  python server.py --socket /tmp/promptfoundry.sock --cache
+
+  # Generate a prompt from a preset
+  curl -s localhost:8765/generate -d '{"preset": "hr-manager", "format": "claude"}'
+
+  # Validate a prompt
+  curl -s localhost:8765/validate -d "$(jq -Rs '{prompt: .}' my-prompt.md)"
+"""
+    )
+
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Bind address (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                       help=f'TCP port (default: {DEFAULT_PORT})')
+    parser.add_argument('--socket', metavar='PATH', help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('--max-concurrent', type=int, default=DEFAULT_MAX_CONCURRENT,
+                       help=f'Requests handled at once (default: {DEFAULT_MAX_CONCURRENT})')
+    parser.add_argument('--cache', nargs='?', const=str(DEFAULT_CACHE_PATH), metavar='PATH',
+                       help='Reuse renders from a persistent cache '
+                            '(default: outputs/.render-cache.sqlite3)')
+
+    args = parser.parse_args()
+
+    if args.max_concurrent < 1:
+        parser.error("--max-concurrent must be at least 1")
+
+    render_cache = RenderCache(Path(args.cache)) if args.cache else None
+    server = PromptServer(max_concurrent=args.max_concurrent, render_cache=render_cache)
+
+    print(f"🔥 Warming up...")
+    preset_count = server.warm_up()
+    print(f"📚 {preset_count} presets loaded")
+
+    address = args.socket or f"http://{args.host}:{args.port}"
+    print(f"🚀 Serving on {address} (max {args.max_concurrent} concurrent requests)")
+
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        print(f"\n👋 Shutting down")
+    finally:
+        if render_cache is not None:
+            render_cache.close()
+
+
+if __name__ == "__main__":
+    main()
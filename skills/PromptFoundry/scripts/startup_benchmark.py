@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Startup Benchmark
+
+Measure the cold-start cost of each CLI (`<script> --help`) and check it
+against a per-script import budget. Import costs come from `python -X
+importtime`, so the report also names the heaviest top-level imports.
+
+Usage:
+    python startup_benchmark.py
+    python startup_benchmark.py --runs 20 --top 8
+    python startup_benchmark.py --check
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from time import perf_counter
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+
+SCRIPT_DIR = Path(__file__).parent
+
+# Milliseconds of module imports each CLI may spend before doing any work
+# (best of --runs, which is far less noisy than the median), measured with
+# compiled bytecode available (see --help for
+# PYTHONDONTWRITEBYTECODE). Interpreter startup itself is excluded.
+COLD_START_BUDGET_MS = {
+    'generate_prompt.py': 35,
+    'validator.py': 30,
+    'optimizer.py': 30,
+    'batch_generator.py': 40,
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """Top-level (module, cumulative microseconds) pairs from -X importtime output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        # One separator space, then two spaces per nesting level
+        name = fields[2][1:].rstrip()
+        if name.startswith(' '):
+            continue
+        imports.append((name, int(fields[1])))
+    return imports
+
+
+def interpreter_imports() -> set:
+    """Modules imported by the interpreter itself before any script runs."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'pass'],
+                               capture_output=True, text=True)
+    return {name for name, _ in parse_importtime(completed.stderr)}
+
+
+def measure(script: str, runs: int, baseline: set) -> Dict[str, Any]:
+    """Wall time and import time of `script --help`, over several runs."""
+    path = str(SCRIPT_DIR / script)
+    wall_ms = []
+    import_ms = []
+    heaviest: Dict[str, int] = {}
+
+    for _ in range(runs):
+        started = perf_counter()
+        subprocess.run([sys.executable, path, '--help'], stdout=subprocess.DEVNULL, check=True)
+        wall_ms.append((perf_counter() - started) * 1000)
+
+        completed = subprocess.run([sys.executable, '-X', 'importtime', path, '--help'],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   text=True, check=True)
+        imports = [(name, us) for name, us in parse_importtime(completed.stderr)
+                   if name not in baseline]
+        import_ms.append(sum(us for _, us in imports) / 1000)
+        for name, us in imports:
+            heaviest[name] = min(us, heaviest.get(name, us))
+
+    return {
+        'script': script,
+        'runs': runs,
+        'wall_ms': statistics.median(wall_ms),
+        'import_ms': min(import_ms),
+        'import_median_ms': statistics.median(import_ms),
+        'budget_ms': COLD_START_BUDGET_MS[script],
+        'heaviest_imports': sorted(heaviest.items(), key=lambda item: -item[1]),
+    }
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Measure CLI cold-start time against the import budget',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Report every CLI (10 runs each)
+  python startup_benchmark.py
+
+  # Fail if any CLI exceeds its import budget
+  python startup_benchmark.py --check --runs 20
+
+Note: with PYTHONDONTWRITEBYTECODE set, every run recompiles the scripts and
+import times include compilation.
+"""
+    )
+
+    parser.add_argument('--runs', type=int, default=10, help='Runs per script (default: 10)')
+    parser.add_argument('--top', type=int, default=5,
+                       help='Heaviest top-level imports to show per script (default: 5)')
+    parser.add_argument('--script', action='append', choices=sorted(COLD_START_BUDGET_MS),
+                       help='Only measure this script (repeatable)')
+    parser.add_argument('--check', action='store_true',
+                       help='Exit with status 1 if any script is over budget')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+    if os.environ.get('PYTHONDONTWRITEBYTECODE'):
+        print("⚠️  PYTHONDONTWRITEBYTECODE is set: import times include compilation", file=sys.stderr)
+
+    baseline = interpreter_imports()
+    results = [measure(script, args.runs, baseline)
+               for script in (args.script or COLD_START_BUDGET_MS)]
+    over_budget = [r['script'] for r in results if r['import_ms'] > r['budget_ms']]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"⏱️  Cold start (`--help`, {args.runs} runs)")
+        print(f"  {'script':<20}  {'wall p50':>8}  {'imports':>8}  {'imp p50':>8}  {'budget':>7}")
+        for r in results:
+            status = '❌' if r['script'] in over_budget else '✅'
+            print(f"  {r['script']:<20}  {r['wall_ms']:>6.1f}ms  {r['import_ms']:>6.1f}ms  "
+                  f"{r['import_median_ms']:>6.1f}ms  {r['budget_ms']:>5}ms  {status}")
+        if args.top:
+            for r in results:
+                print(f"\n  {r['script']} heaviest imports:")
+                for name, us in r['heaviest_imports'][:args.top]:
+                    print(f"    {name:<24} {us / 1000:>6.2f}ms")
+
+    if over_budget:
+        print(f"\n❌ Over budget: {', '.join(over_budget)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Streaming Validation
+
+Bounded-memory scanning of very large prompt files. The file is memory-mapped
+and decoded one window at a time; each window is cut at a line boundary and
+followed by a short lookahead, so indicator counts, placeholder matches and
+tag-balance state carry across windows without ever holding the whole text.
+PromptValidator.validate_stream() runs the usual gates on the result.
+"""
+
+import io
+import re
+import mmap
+import codecs
+from typing import Dict, List, Any, Iterator, Optional, Tuple, TYPE_CHECKING
+from xml_structure import TagScanner
+
+if TYPE_CHECKING:
+    from validator import PromptValidator
+
+
+# Decoded characters processed per window, and lookahead past each cut that
+# lets matches straddling it complete. Peak memory is a few times
+# DEFAULT_WINDOW + DEFAULT_OVERLAP (plus the longest line) for any file size.
+DEFAULT_WINDOW = 1 << 20
+DEFAULT_OVERLAP = 1 << 16
+
+
+class MappedText:
+    """`substring in text` over a memory-mapped UTF-8 file, without decoding it."""
+
+    # Bytes searched between page releases
+    STEP = 1 << 24
+
+    def __init__(self, mapped):
+        self.mapped = mapped
+
+    def __contains__(self, substring: str) -> bool:
+        needle = substring.encode('utf-8')
+        for start in range(0, len(self.mapped), self.STEP):
+            found = self.mapped.find(needle, start, start + self.STEP + len(needle) - 1)
+            release_pages(self.mapped, start + self.STEP)
+            if found != -1:
+                return True
+        return False
+
+
+def release_pages(mapped, end: int):
+    """Drop the mapped file's resident pages before end (where madvise exists)."""
+    end -= end % mmap.PAGESIZE
+    if end and hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_DONTNEED'):
+        mapped.madvise(mmap.MADV_DONTNEED, 0, end)
+
+
+def line_cut(text: str, end: int) -> int:
+    """
+    Offset just past the last newline before end that is followed by text
+    (a token_counter.TOKEN_BOUNDARY, so token counts add up across the
+    cut); 0 if there is none.
+    """
+    cut = text.rfind('\n', 0, end)
+    while cut != -1 and text[cut + 1:cut + 2].isspace():
+        cut = text.rfind('\n', 0, cut)
+    return cut + 1
+
+
+def mapped_windows(mapped, window: int = DEFAULT_WINDOW,
+                   overlap: int = DEFAULT_OVERLAP) -> Iterator[Tuple[str, int, int, bool]]:
+    """
+    Decode a mapped file into line-aligned windows.
+
+    Newlines are translated as in Path.read_text(). Each window starts at a
+    line boundary; text before `cut` is new, text after it is lookahead that
+    reappears at the start of the next window.
+
+    Yields:
+        (text, offset of text[0] in the decoded file, cut, is_last)
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+    size = len(mapped)
+    pending = ''
+    base = 0
+    pos = 0
+
+    while True:
+        chunk = mapped[pos:pos + window]
+        pos += len(chunk)
+        final = pos >= size
+        pending += decoder.decode(chunk, final)
+
+        if final:
+            yield pending, base, len(pending), True
+            return
+        if len(pending) < window + overlap:
+            continue
+        # Cut after the last line start before the lookahead; keep reading
+        # if there is none (one long line, or only indented or blank lines)
+        cut = line_cut(pending, len(pending) - overlap)
+        if not cut:
+            continue
+
+        yield pending, base, cut, False
+        base += cut
+        pending = pending[cut:]
+        # Release the pages already decoded so resident memory stays flat
+        release_pages(mapped, pos)
+
+
+class StreamScan:
+    """Gate inputs accumulated window by window; finish() returns a validate() scan."""
+
+    def __init__(self, validator: 'PromptValidator', tags: Optional[TagScanner] = None,
+                 carry: Optional[Dict[str, Any]] = None):
+        self.validator = validator
+        self.tags = tags or TagScanner(keep_tree=False)
+        self.phrases = dict.fromkeys(validator.WORKFLOW_INDICATORS + validator.BEST_PRACTICE_INDICATORS
+                                     + validator.EXAMPLE_PHRASES, 0)
+        self.word_count = 0
+        self.tokens = 0.0
+        self.length = 0
+        self.first_text: Optional[int] = None
+        self.last_text = -1
+        self.example_sections = 0
+        self.empty_headings = 0
+
+        # Placeholder count and first five distinct texts per keyword, and the
+        # end of the last match per keyword (matches inside it are skipped)
+        self.placeholder_counts: Dict[str, int] = {}
+        self.placeholder_samples: Dict[str, Dict[str, None]] = {}
+        self.placeholder_ends: Dict[str, int] = {}
+
+        self._placeholder_pattern = validator._get_placeholder_pattern()
+        self._example_pattern = re.compile(validator.EXAMPLE_SECTION_PATTERN)
+        self._heading_pattern = re.compile(validator.EMPTY_SECTION_PATTERN)
+        # Matches may run past a cut; these say how far into the next window
+        self._example_from = 0
+        self._heading_from = 0
+
+        if carry:
+            # Continue where the scan of the preceding text left off
+            self._example_from = carry['example_from']
+            self._heading_from = carry['heading_from']
+            self.placeholder_ends = dict(carry['placeholder_ends'])
+
+    def feed(self, text: str, base: int, cut: int, final: bool):
+        """Scan text[:cut] (starting at offset base), using text[cut:] as lookahead."""
+        self.tags.feed(text, base, cut)
+
+        new = text[:cut]
+        self.length += cut
+        # Windows split at newlines, so no word or phrase straddles a cut
+        self.word_count += len(new.split())
+        self.tokens += self.validator.counter.measure(new)
+        stripped = new.strip()
+        if stripped:
+            if self.first_text is None:
+                self.first_text = base + new.find(stripped[0])
+            self.last_text = base + len(new.rstrip()) - 1
+        del new, stripped
+
+        lowered = text.lower()
+        # Lowercasing can change lengths (e.g. 'İ'), so map the cut across
+        lowered_cut = cut if len(lowered) == len(text) else len(text[:cut].lower())
+        for phrase in self.phrases:
+            self.phrases[phrase] += lowered.count(phrase, 0, lowered_cut)
+
+        end = self._example_from
+        for match in self._example_pattern.finditer(lowered, self._example_from):
+            if match.start() >= lowered_cut:
+                break
+            self.example_sections += 1
+            end = match.end()
+        self._example_from = max(0, end - lowered_cut)
+        del lowered
+
+        end = self._heading_from
+        for match in self._heading_pattern.finditer(text, self._heading_from):
+            # '$' only means the end of the file in the last window
+            if match.start() >= cut or (not final and match.end() == len(text)):
+                break
+            self.empty_headings += 1
+            end = match.end()
+        self._heading_from = max(0, end - cut)
+
+        keywords = self.validator.PLACEHOLDER_KEYWORDS
+        for match in self._placeholder_pattern.finditer(text, 0, len(text)):
+            start = match.start()
+            if start >= cut:
+                break
+            body = match.group(1)
+            kind = '...' if body.startswith('...') else next(
+                keyword for keyword in keywords if re.match(keyword, body, re.IGNORECASE)
+            )
+            if base + start < self.placeholder_ends.get(kind, 0):
+                continue
+            self.placeholder_ends[kind] = base + match.end(1)
+            self.placeholder_counts[kind] = self.placeholder_counts.get(kind, 0) + 1
+            samples = self.placeholder_samples.setdefault(kind, {})
+            if len(samples) < 5:
+                samples['[' + body] = None
+
+    def export(self) -> Dict[str, Any]:
+        """Raw accumulated state (picklable), for combining partial scans."""
+        tags = self.tags
+        return {
+            'phrases': self.phrases,
+            'word_count': self.word_count,
+            'tokens': self.tokens,
+            'length': self.length,
+            'first_text': self.first_text,
+            'last_text': self.last_text,
+            'example_sections': self.example_sections,
+            'empty_headings': self.empty_headings,
+            'placeholder_counts': self.placeholder_counts,
+            'placeholder_samples': {kind: list(found) for kind, found in self.placeholder_samples.items()},
+            # Carried into the scan of the following text
+            'carry': {
+                'scan_from': tags.position,
+                'example_from': self._example_from,
+                'heading_from': self._heading_from,
+                'placeholder_ends': self.placeholder_ends,
+            },
+            'tags': {
+                'count': tags.count,
+                'empty': tags.empty,
+                'error': tags.error,
+                'closers': tags.closers,
+                'openers': [(node.name, node.start, node.has_content) for node in tags.stack[1:]],
+                'tail_content': tags.root.has_content,
+            },
+        }
+
+    def finish(self) -> Dict[str, Any]:
+        """Scan results keyed like the shared scans validate() builds."""
+        # Same order as the whole-text scan: keyword by keyword, then [...]
+        order = self.validator.PLACEHOLDER_KEYWORDS + ('...',)
+        examples = [text for kind in order for text in self.placeholder_samples.get(kind, ())]
+
+        return {
+            'tags': self.tags.finish(),
+            'phrases': self.phrases,
+            'placeholders': (sum(self.placeholder_counts.values()),
+                             list(dict.fromkeys(examples))[:5]),
+            'example_sections': self.example_sections,
+            'empty_headings': self.empty_headings,
+            'word_count': self.word_count,
+            'tokens': int(self.tokens),
+            'length': self.length,
+            'stripped_length': 0 if self.first_text is None else self.last_text + 1 - self.first_text,
+        }
+
+
+def scan_file(path: str, validator: 'PromptValidator', format_hint: str = 'auto',
+              window: int = DEFAULT_WINDOW, overlap: int = DEFAULT_OVERLAP) -> Tuple[str, Dict[str, Any]]:
+    """
+    Scan a prompt file in bounded memory.
+
+    Returns:
+        (format, scan results keyed like validate()'s shared scans)
+    """
+    scan = StreamScan(validator)
+
+    with open(path, 'rb') as f:
+        if not f.seek(0, io.SEEK_END):
+            # mmap cannot map an empty file
+            scan.feed('', 0, 0, True)
+            return (validator._detect_format('') if format_hint == 'auto' else format_hint), scan.finish()
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if format_hint == 'auto':
+                format_hint = validator._detect_format(MappedText(mapped))
+            for text, base, cut, final in mapped_windows(mapped, window, overlap):
+                scan.feed(text, base, cut, final)
+                del text
+
+    return format_hint, scan.finish()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Template Engine
+
+Compiles prompt skeletons with {field} placeholders into renderer functions.
+Each skeleton is compiled once per process into a generated function whose
+body is a single f-string, so rendering is one BUILD_STRING over constant
+segments and the handful of dynamic fields.
+"""
+
+from typing import Dict, Any, Callable
+
+
+Renderer = Callable[[Dict[str, Any]], str]
+
+# Compiled renderers keyed by template source
+_compiled: Dict[str, Renderer] = {}
+
+
+def compile_template(source: str, name: str = 'template') -> Renderer:
+    """
+    Return the compiled renderer for a template, compiling it on first use.
+
+    Args:
+        source: Template text; {field} marks a dynamic value, {{ and }} are literal braces
+        name: Label used in tracebacks from the generated code
+
+    Returns:
+        Function taking a dict of field values and returning the rendered text
+    """
+    renderer = _compiled.get(source)
+    if renderer is None:
+        renderer = _build_renderer(source, name)
+        _compiled[source] = renderer
+    return renderer
+
+
+def _build_renderer(source: str, name: str) -> Renderer:
+    """Generate and compile a Python function for one template."""
+    import string
+
+    body = []
+    fields = []
+
+    for literal, field, spec, conversion in string.Formatter().parse(source):
+        body.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is None:
+            continue
+        if spec or conversion or not field.isidentifier() or field.startswith('_'):
+            raise ValueError(f"Unsupported placeholder in {name}: {{{field}}}")
+        body.append(f"{{{field}}}")
+        if field not in fields:
+            fields.append(field)
+
+    # Bind each field to a local first: f-string expressions may not contain
+    # the quote escapes repr() would emit for subscripts
+    lines = ["def render(_values):"]
+    lines.extend(f"    {field} = _values[{field!r}]" for field in fields)
+    lines.append(f"    return f{''.join(body)!r}")
+    code = '\n'.join(lines) + '\n'
+    namespace: Dict[str, Any] = {}
+    exec(compile(code, f'<{name}>', 'exec'), namespace)
+
+    renderer = namespace['render']
+    renderer.fields = tuple(fields)
+    return renderer
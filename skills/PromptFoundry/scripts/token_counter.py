@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Token Counter
+
+One token-counting engine shared by the validator, optimizer and generator.
+Backends are pluggable: 'heuristic' (0.75 tokens per word, no setup) and
+'bpe' (byte-pair encoding over a vocabulary file bundled with the suite, so
+counting needs no network and no third-party tokenizer). Text is counted
+section by section and each section's count is memoized by content hash, so
+repeated stats calls on the same or a slightly edited prompt only tokenize
+what changed.
+
+Usage:
+    python token_counter.py --prompt my-prompt.md
+    python token_counter.py --prompt my-prompt.md --backend bpe
+    python token_counter.py --build-vocab
+"""
+
+import re
+import argparse
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, List, Iterable, Iterator, Optional, Callable, Tuple
+
+
+DEFAULT_BACKEND = 'heuristic'
+DEFAULT_VOCAB_PATH = Path(__file__).parent.parent / 'templates' / 'prompt-bpe.tiktoken'
+
+# Vocabulary size (single bytes plus learned merges) for --build-vocab
+DEFAULT_VOCAB_SIZE = 8192
+
+# Section counts kept per counter, and the smallest section worth hashing
+DEFAULT_CACHE_SIZE = 1 << 14
+MIN_SECTION_CHARS = 512
+
+# Sections end at a line break before a heading or a tag
+SECTION_BREAK = re.compile(r'\n(?=[#<])')
+
+# A line break followed by text. No token of any backend spans one, so counts
+# of text split there add up to the count of the whole.
+TOKEN_BOUNDARY = re.compile(r'\n(?=\S)')
+
+# Pre-tokenization: contractions, words (with one leading non-letter),
+# numbers of up to 3 digits, punctuation runs, and whitespace. Every
+# character falls in exactly one piece; BPE merges never cross pieces.
+PRETOKEN_PATTERN = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)"
+    r"|[^\r\n\w]?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+# Longer pieces (whitespace runs, encoded blobs) are merged in slices of this
+# many bytes to keep merging linear
+MAX_PIECE_BYTES = 256
+
+
+class HeuristicBackend:
+    """About 0.75 tokens per whitespace-separated word."""
+
+    name = 'heuristic'
+
+    def measure(self, text: str) -> float:
+        return len(text.split()) * 0.75
+
+
+class BPEBackend:
+    """
+    Byte-level BPE over a tiktoken-format vocabulary (base64 token, rank).
+
+    The bundled vocabulary is built from the suite's own presets, references
+    and examples (see --build-vocab); any other tiktoken-format file, such as
+    a model's published vocabulary, can be passed instead.
+    """
+
+    # Distinct pre-tokenized pieces whose counts are kept
+    PIECE_CACHE_SIZE = 1 << 17
+
+    def __init__(self, vocab_path: Path = DEFAULT_VOCAB_PATH, name: str = 'bpe'):
+        self.name = name
+        self.vocab_path = Path(vocab_path)
+        self._ranks: Optional[Dict[bytes, int]] = None
+        self._pieces: Dict[str, int] = {}
+
+    @property
+    def ranks(self) -> Dict[bytes, int]:
+        """Token -> merge rank, loaded on first use."""
+        if self._ranks is None:
+            self._ranks = load_vocab(self.vocab_path)
+        return self._ranks
+
+    def measure(self, text: str) -> float:
+        pieces = self._pieces
+        total = 0
+        for piece in PRETOKEN_PATTERN.findall(text):
+            count = pieces.get(piece)
+            if count is None:
+                if len(pieces) >= self.PIECE_CACHE_SIZE:
+                    pieces.clear()
+                encoded = piece.encode('utf-8', 'surrogatepass')
+                count = pieces[piece] = sum(
+                    self._merge(encoded[start:start + MAX_PIECE_BYTES])
+                    for start in range(0, len(encoded), MAX_PIECE_BYTES))
+            total += count
+        return total
+
+    def _merge(self, piece: bytes) -> int:
+        """Tokens in one piece: repeatedly merge the adjacent pair of lowest rank."""
+        ranks = self.ranks
+        if piece in ranks:
+            return 1
+        parts = [piece[i:i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            best, best_rank = -1, None
+            for i in range(len(parts) - 1):
+                rank = ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best, best_rank = i, rank
+            if best_rank is None:
+                break
+            parts[best:best + 2] = [parts[best] + parts[best + 1]]
+        return len(parts)
+
+
+# Backend name -> factory; register_backend() adds more
+BACKENDS: Dict[str, Callable[[], object]] = {
+    'heuristic': HeuristicBackend,
+    'bpe': BPEBackend,
+}
+
+
+def register_backend(name: str, factory: Callable[[], object]):
+    """
+    Make a backend available by name, e.g. another vocabulary:
+    register_backend('cl100k', lambda: BPEBackend(path, 'cl100k')).
+
+    Backends have a `name` and measure(text) -> float.
+    """
+    BACKENDS[name] = factory
+
+
+def split_sections(text: str) -> Iterator[str]:
+    """Consecutive pieces of text, each ending before a heading or tag line."""
+    start = 0
+    while True:
+        match = SECTION_BREAK.search(text, start + MIN_SECTION_CHARS)
+        if match is None:
+            yield text[start:]
+            return
+        yield text[start:match.end()]
+        start = match.end()
+
+
+class TokenCounter:
+    """Token counts through one backend, memoized per section content hash."""
+
+    def __init__(self, backend: object, cache_size: int = DEFAULT_CACHE_SIZE):
+        # Imported here: hashlib's OpenSSL binding is a noticeable share of CLI start-up
+        import hashlib
+
+        self._digest = hashlib.blake2b
+        self.backend = backend
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: 'OrderedDict[bytes, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    def measure(self, text: str) -> float:
+        """
+        Unrounded token count of text.
+
+        Measures of pieces split at TOKEN_BOUNDARY add up exactly, so
+        streaming callers sum them and round once with int().
+        """
+        total = 0.0
+        for section in split_sections(text):
+            key = self._digest(section.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+            with self._lock:
+                value = self._cache.get(key)
+                if value is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+            if value is None:
+                value = self.backend.measure(section)
+                with self._lock:
+                    self.misses += 1
+                    self._cache[key] = value
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            total += value
+        return total
+
+    def count(self, text: str) -> int:
+        """Estimated tokens in text."""
+        return int(self.measure(text))
+
+
+_counters: Dict[str, TokenCounter] = {}
+_counters_lock = threading.Lock()
+
+
+def get_counter(backend: Optional[str] = None) -> TokenCounter:
+    """
+    The shared counter for a backend (default: DEFAULT_BACKEND).
+
+    Raises:
+        ValueError: If no backend has that name
+    """
+    name = backend or DEFAULT_BACKEND
+    with _counters_lock:
+        if name not in _counters:
+            if name not in BACKENDS:
+                raise ValueError(f"Unknown tokenizer backend: {name} "
+                                 f"(available: {', '.join(sorted(BACKENDS))})")
+            _counters[name] = TokenCounter(BACKENDS[name]())
+        return _counters[name]
+
+
+def load_vocab(path: Path) -> Dict[bytes, int]:
+    """Read a tiktoken-format vocabulary: one 'base64-token rank' per line."""
+    import base64
+
+    ranks = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                token, rank = line.split()
+                ranks[base64.b64decode(token)] = int(rank)
+    return ranks
+
+
+def save_vocab(ranks: Dict[bytes, int], path: Path):
+    """Write a vocabulary in tiktoken format, by rank."""
+    import base64
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        for token, rank in sorted(ranks.items(), key=lambda item: item[1]):
+            f.write(base64.b64encode(token) + b' ' + str(rank).encode() + b'\n')
+
+
+def train_vocab(texts: Iterable[str], size: int = DEFAULT_VOCAB_SIZE) -> Dict[bytes, int]:
+    """
+    Learn a byte-level BPE vocabulary of `size` tokens from texts.
+
+    Starts from the 256 single bytes and repeatedly adds the most frequent
+    adjacent pair (ties broken by byte order, so training is deterministic).
+    """
+    import heapq
+
+    counts = Counter(piece.encode('utf-8', 'surrogatepass')
+                     for text in texts for piece in PRETOKEN_PATTERN.findall(text))
+    words: List[Tuple[List[bytes], int]] = [
+        ([word[i:i + 1] for i in range(len(word))], freq) for word, freq in counts.items()]
+    ranks = {bytes([byte]): byte for byte in range(256)}
+
+    pairs: Counter = Counter()
+    where: Dict[Tuple[bytes, bytes], set] = {}
+    for index, (parts, freq) in enumerate(words):
+        for pair in zip(parts, parts[1:]):
+            pairs[pair] += freq
+            where.setdefault(pair, set()).add(index)
+    heap = [(-freq, pair) for pair, freq in pairs.items()]
+    heapq.heapify(heap)
+
+    while len(ranks) < size and heap:
+        freq, pair = heapq.heappop(heap)
+        if pairs.get(pair, 0) != -freq or not freq:
+            continue  # stale entry
+        merged = pair[0] + pair[1]
+        ranks.setdefault(merged, len(ranks))
+
+        changed = set()
+        for index in where.pop(pair, ()):
+            parts, word_freq = words[index]
+            for old in zip(parts, parts[1:]):
+                pairs[old] -= word_freq
+                changed.add(old)
+            new_parts, i = [], 0
+            while i < len(parts):
+                if i + 1 < len(parts) and parts[i] == pair[0] and parts[i + 1] == pair[1]:
+                    new_parts.append(merged)
+                    i += 2
+                else:
+                    new_parts.append(parts[i])
+                    i += 1
+            words[index] = (new_parts, word_freq)
+            for new in zip(new_parts, new_parts[1:]):
+                pairs[new] += word_freq
+                where.setdefault(new, set()).add(index)
+                changed.add(new)
+        for changed_pair in changed:
+            if pairs[changed_pair] > 0:
+                heapq.heappush(heap, (-pairs[changed_pair], changed_pair))
+    return ranks
+
+
+def corpus_files() -> List[Path]:
+    """Suite documents the bundled vocabulary is trained on."""
+    root = Path(__file__).parent.parent
+    return sorted(list((root / 'templates' / 'presets').rglob('*.md'))
+                  + list((root / 'references').glob('*.md'))
+                  + list((root / 'examples').glob('*.md')))
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Count prompt tokens with a pluggable, offline tokenizer',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Fast estimate
+  python token_counter.py --prompt my-prompt.md
+
+  # BPE count with the bundled vocabulary
+  python token_counter.py --prompt my-prompt.md --backend bpe
+
+  # Rebuild the bundled vocabulary from presets, references and examples
+  python token_counter.py --build-vocab
+"""
+    )
+
+    parser.add_argument('--prompt', help='Prompt file to count')
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, choices=sorted(BACKENDS),
+                       help=f'Tokenizer backend (default: {DEFAULT_BACKEND})')
+    parser.add_argument('--build-vocab', nargs='?', const=str(DEFAULT_VOCAB_PATH), metavar='PATH',
+                       help='Train the BPE vocabulary (default: templates/prompt-bpe.tiktoken)')
+    parser.add_argument('--vocab-size', type=int, default=DEFAULT_VOCAB_SIZE,
+                       help=f'Tokens in a built vocabulary (default: {DEFAULT_VOCAB_SIZE})')
+
+    args = parser.parse_args()
+
+    if args.build_vocab:
+        files = corpus_files()
+        ranks = train_vocab((path.read_text(encoding='utf-8') for path in files), args.vocab_size)
+        path = Path(args.build_vocab)
+        save_vocab(ranks, path)
+        print(f"📦 Built {len(ranks)}-token vocabulary from {len(files)} files: {path}")
+    elif not args.prompt:
+        parser.error("One of --prompt or --build-vocab is required")
+
+    if args.prompt:
+        text = Path(args.prompt).read_text(encoding='utf-8')
+        counter = get_counter(args.backend)
+        print(f"🔢 {args.prompt}: ~{counter.count(text):,} tokens ({counter.name}), "
+              f"{len(text.split()):,} words")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - Validation Manifest
+
+Persistent record of the last validation of every prompt file: path, size,
+mtime, content hash, validator version, format and result. `validator.py
+--dir --manifest` reuses results for unchanged files, so re-validating a
+large tree costs time proportional to what changed.
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Tuple, Iterable, Optional
+
+
+MANIFEST_NAME = '.validation-manifest.sqlite3'
+
+# (size, mtime_ns, sha256) of the bytes a result was computed from
+Fingerprint = Tuple[int, int, str]
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes."""
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_fingerprinted(path: str) -> Tuple[bytes, Fingerprint]:
+    """
+    A file's bytes and their fingerprint.
+
+    The mtime is taken before reading: if the file is written while it is
+    read, the next run sees a newer mtime and compares the stored hash,
+    which is that of the bytes actually read.
+    """
+    import hashlib
+
+    with open(path, 'rb') as f:
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        data = f.read()
+    return data, (len(data), mtime_ns, hashlib.sha256(data).hexdigest())
+
+
+def file_fingerprint(path: str, before: os.stat_result) -> Optional[Fingerprint]:
+    """
+    Fingerprint of a file validated in place (streamed) since stat before.
+
+    None if the file changed or disappeared in the meantime, so that no
+    result is recorded for bytes that were not the ones validated.
+    """
+    try:
+        digest = file_digest(path)
+        after = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+        return None
+    return after.st_size, after.st_mtime_ns, digest
+
+
+class ValidationManifest:
+    """SQLite-backed manifest of per-file validation results."""
+
+    def __init__(self, path: Path, version: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.version = version
+
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS files ('
+            'path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, '
+            'sha256 TEXT NOT NULL, version TEXT NOT NULL, format TEXT NOT NULL, '
+            'result TEXT NOT NULL, validated_at TEXT NOT NULL)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(path: str) -> str:
+        """Manifest key for a file: its absolute path."""
+        return os.path.abspath(path)
+
+    def partition(self, paths: List[str], format_hint: str,
+                  force: bool = False) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Split files into reusable results and files that need validating.
+
+        A result is reused when the validator version and format match and
+        the file's size and mtime are unchanged. A file whose mtime changed
+        but whose bytes did not (same size and SHA-256) also reuses its result.
+        Files that no longer exist are left out of both.
+
+        Returns:
+            (cached results keyed by path, paths to validate)
+        """
+        with self._lock:
+            rows = {
+                row[0]: row[1:] for row in self._conn.execute(
+                    'SELECT path, size, mtime_ns, sha256, result FROM files '
+                    'WHERE version = ? AND format = ?', (self.version, format_hint)
+                )
+            }
+
+        cached: Dict[str, Dict[str, Any]] = {}
+        stale: List[str] = []
+        touched: List[Tuple[int, str]] = []
+
+        for path in paths:
+            row = None if force else rows.get(self.key(path))
+            if row is None:
+                if os.path.exists(path):
+                    stale.append(path)
+                continue
+
+            size, mtime_ns, sha256, result = row
+            try:
+                stat = os.stat(path)
+                if stat.st_size != size:
+                    stale.append(path)
+                    continue
+                if stat.st_mtime_ns != mtime_ns:
+                    # Touched, checked out or copied: only the bytes decide
+                    if file_digest(path) != sha256:
+                        stale.append(path)
+                        continue
+                    touched.append((stat.st_mtime_ns, self.key(path)))
+            except FileNotFoundError:
+                # Deleted since the directory was listed
+                continue
+
+            cached[path] = {'file': path, **json.loads(result)}
+
+        if touched:
+            with self._lock:
+                self._conn.executemany('UPDATE files SET mtime_ns = ? WHERE path = ?', touched)
+                self._conn.commit()
+
+        return cached, stale
+
+    def record(self, results: Iterable[Tuple[Dict[str, Any], Optional[Fingerprint]]],
+               format_hint: str):
+        """
+        Store fresh results in one transaction.
+
+        Args:
+            results: (result with its 'file' key, fingerprint of the bytes
+                it was computed from) pairs; results without a fingerprint
+                (the file changed or vanished while validating) are skipped
+            format_hint: Format the results were validated as
+        """
+        rows = []
+        for result, fingerprint in results:
+            if fingerprint is None:
+                continue
+            size, mtime_ns, sha256 = fingerprint
+            stored = {key: value for key, value in result.items() if key not in ('file', 'timings')}
+            rows.append((
+                self.key(result['file']), size, mtime_ns, sha256,
+                self.version, format_hint, json.dumps(stored, separators=(',', ':')),
+                datetime.now().isoformat()
+            ))
+
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO files '
+                '(path, size, mtime_ns, sha256, version, format, result, validated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+            )
+            self._conn.commit()
+
+    def prune(self, directory: str, paths: Iterable[str]) -> int:
+        """Drop entries for files in directory that are no longer present."""
+        directory = os.path.abspath(directory)
+        keep = {self.key(path) for path in paths}
+
+        with self._lock:
+            gone = [(key,) for (key,) in self._conn.execute('SELECT path FROM files')
+                    if os.path.dirname(key) == directory and key not in keep]
+            self._conn.executemany('DELETE FROM files WHERE path = ?', gone)
+            self._conn.commit()
+        return len(gone)
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count for reporting."""
+        with self._lock:
+            (entries,) = self._conn.execute('SELECT COUNT(*) FROM files').fetchone()
+        return {'entries': entries, 'path': str(self.path)}
@@ -8,38 +8,87 @@ Ensures prompts meet production standards before deployment.
 Usage:
     python validator.py --prompt my-prompt.md --report validation.json
     python validator.py --dir ./prompts/ --report batch-validation.json
+    python validator.py --dir ./outputs/ --workers 8
     python validator.py --prompt prompt.md --fail-on-error
+    python validator.py --dir ./outputs/ --fail-fast --profile
+    python validator.py --dir ./prompts/ --watch
 """
 
+import os
 import re
-import json
+import sys
 import argparse
+from time import monotonic
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Callable, Iterable, Iterator, TYPE_CHECKING
 from datetime import datetime
+from quality_gates import GateRegistry, GateContext, GateOutcome, PhraseCounts
+
+if TYPE_CHECKING:
+    # Imported on first use, keeping them (and their compiled patterns) out of --help
+    from xml_structure import TagTree
+    from profiling import StageProfiler
+
+
+# Stored with every manifest entry; bump whenever a gate's logic changes so
+# cached results from older validators are not reused
+VALIDATOR_VERSION = '1.2'
+
+# Fresh results stored per manifest transaction during a --dir run
+MANIFEST_BATCH = 256
 
 
 class PromptValidator:
     """Validate prompt quality with 7-point validation gates."""
 
-    def __init__(self):
-        self.gates = [
-            ('xml_structure', 'XML Structure Valid'),
-            ('completeness', 'No Empty Sections'),
-            ('token_count', 'Token Count Reasonable'),
-            ('no_placeholders', 'No Placeholder Text'),
-            ('actionable_workflow', 'Workflow Actionable'),
-            ('best_practices', 'Best Practices Present'),
-            ('examples_present', 'Examples Included')
-        ]
-
-    def validate(self, prompt: str, format_hint: str = 'auto') -> Dict[str, Any]:
+    WORKFLOW_INDICATORS = (
+        'workflow', 'process', 'approach', 'method', 'steps',
+        'phase', 'stage', '1.', '2.', '3.', 'first', 'then', 'next'
+    )
+
+    BEST_PRACTICE_INDICATORS = (
+        'best practice', 'guideline', 'standard', 'recommendation',
+        'should', 'must', 'avoid', 'ensure', 'always', 'never',
+        'principle', 'rule', 'convention'
+    )
+
+    EXAMPLE_PHRASES = ('example', 'for instance', 'for example', 'such as')
+
+    PLACEHOLDER_KEYWORDS = ('todo', 'fill', 'insert', 'placeholder', 'tbd', 'xxx')
+
+    # '## Heading' followed only by whitespace up to the next heading or the end
+    EMPTY_SECTION_PATTERN = r'##\s+([^\n]+)\s*\n\s*(?=##|$)'
+
+    # Explicit example sections (## Example, <example>), matched in lowercased text
+    EXAMPLE_SECTION_PATTERN = r'##?\s*example|<example'
+
+    # All placeholder forms in one pattern, compiled on first validate()
+    _placeholder_pattern: Optional['re.Pattern'] = None
+
+    # Gates run cheapest first (relative cost measured on multi-MB prompts;
+    # shared scans are charged to the first gate that needs them) and are
+    # reported in registration order
+    GATES = GateRegistry(pass_threshold=6)
+
+    def __init__(self, profiler: Optional['StageProfiler'] = None, tokenizer: Optional[str] = None):
+        from token_counter import get_counter
+
+        self.gates = [(gate.key, gate.name) for gate in self.GATES]
+        self.profiler = profiler
+        # Shared token_counter backend ('heuristic' by default, or 'bpe')
+        self.counter = get_counter(tokenizer)
+
+    def validate(self, prompt: str, format_hint: str = 'auto',
+                 fail_fast: bool = False) -> Dict[str, Any]:
         """
         Run all 7 validation gates.
 
         Args:
             prompt: Prompt text to validate
             format_hint: 'xml', 'claude', 'chatgpt', 'gemini', or 'auto'
+            fail_fast: Stop once pass/fail is decided; skipped gates are
+                listed in 'skipped_gates' and reported with passed=None
 
         Returns:
             Validation results dictionary
@@ -48,113 +97,199 @@ class PromptValidator:
         if format_hint == 'auto':
             format_hint = self._detect_format(prompt)
 
+        return self._run_gates(self._gate_context(prompt, format_hint), fail_fast)
+
+    def validate_stream(self, path: str, format_hint: str = 'auto', fail_fast: bool = False,
+                        window: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run all 7 validation gates over a file in bounded memory.
+
+        The file is memory-mapped and scanned in line-aligned windows, so
+        peak memory does not grow with file size. Results match validate()
+        on the file's text.
+
+        Args:
+            path: Prompt file to validate
+            format_hint: 'xml', 'claude', 'chatgpt', 'gemini', or 'auto'
+            fail_fast: As for validate()
+            window: Characters decoded per window (default 1 MiB)
+
+        Returns:
+            Validation results dictionary
+        """
+        from stream_validation import scan_file, DEFAULT_WINDOW
+
+        timings = None if self.profiler is None else {}
+        started = None if self.profiler is None else self.profiler.now()
+        format_hint, scan = scan_file(path, self, format_hint, window or DEFAULT_WINDOW)
+        if started is not None:
+            self.profiler.record('stream_scan', started, timings)
+
+        ctx = GateContext(None, format_hint,
+                          {name: (lambda ctx, value=value: value) for name, value in scan.items()})
+        return self._run_gates(ctx, fail_fast, timings)
+
+    def validate_chunked(self, prompt: str, format_hint: str = 'auto', fail_fast: bool = False,
+                         workers: int = 0) -> Dict[str, Any]:
+        """
+        Run all 7 validation gates, scanning one large prompt on several processes.
+
+        The prompt is split at line boundaries, the chunks are scanned in
+        parallel and the partial counts merged; results match validate().
+
+        Args:
+            prompt: Prompt text to validate
+            format_hint: 'xml', 'claude', 'chatgpt', 'gemini', or 'auto'
+            fail_fast: As for validate()
+            workers: Worker processes (0 = one per CPU)
+
+        Returns:
+            Validation results dictionary
+        """
+        from chunked_validation import scan_chunked
+
+        if format_hint == 'auto':
+            format_hint = self._detect_format(prompt)
+
+        timings = None if self.profiler is None else {}
+        started = None if self.profiler is None else self.profiler.now()
+        scan = scan_chunked(prompt, self, workers or os.cpu_count() or 1)
+        if started is not None:
+            self.profiler.record('chunked_scan', started, timings)
+
+        ctx = GateContext(None, format_hint,
+                          {name: (lambda ctx, value=value: value) for name, value in scan.items()})
+        return self._run_gates(ctx, fail_fast, timings)
+
+    def _run_gates(self, ctx: GateContext, fail_fast: bool,
+                   timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Run the registered gates on ctx and assemble the results dictionary."""
+        if timings is None and self.profiler is not None:
+            timings = {}
+        outcomes, skipped = self.GATES.run(self, ctx, fail_fast, self.profiler, timings)
+
         results = {
-            'format': format_hint,
+            'format': ctx.format,
             'timestamp': datetime.now().isoformat(),
             'gates': {},
             'score': 0,
-            'max_score': 7,
+            'max_score': len(self.GATES),
             'passed': False,
             'issues': [],
             'warnings': [],
             'recommendations': []
         }
 
-        # Gate 1: XML Structure
-        if format_hint == 'xml':
-            passed, details = self._check_xml_structure(prompt)
-        else:
-            passed, details = True, "N/A for non-XML format"
-
-        results['gates']['xml_structure'] = {
-            'passed': passed,
-            'details': details
-        }
-        if passed:
-            results['score'] += 1
-        else:
-            results['issues'].append(f"XML Structure: {details}")
-
-        # Gate 2: Completeness
-        passed, details = self._check_completeness(prompt)
-        results['gates']['completeness'] = {
-            'passed': passed,
-            'details': details
-        }
-        if passed:
-            results['score'] += 1
-        else:
-            results['issues'].append(f"Completeness: {details}")
-
-        # Gate 3: Token Count
-        passed, details, token_count = self._check_token_count(prompt)
-        results['gates']['token_count'] = {
-            'passed': passed,
-            'details': details,
-            'count': token_count
-        }
-        if passed:
-            results['score'] += 1
-        elif token_count < 15000:
-            results['score'] += 1  # Warning but not failure
-            results['warnings'].append(f"Token count high: ~{token_count} words")
-        else:
-            results['issues'].append(f"Token Count: {details}")
-
-        # Gate 4: No Placeholders
-        passed, details, found_placeholders = self._check_placeholders(prompt)
-        results['gates']['no_placeholders'] = {
-            'passed': passed,
-            'details': details,
-            'placeholders': found_placeholders
-        }
-        if passed:
-            results['score'] += 1
-        else:
-            results['issues'].append(f"Placeholders: {details}")
-
-        # Gate 5: Actionable Workflow
-        passed, details = self._check_workflow(prompt)
-        results['gates']['actionable_workflow'] = {
-            'passed': passed,
-            'details': details
-        }
-        if passed:
-            results['score'] += 1
-        else:
-            results['issues'].append(f"Workflow: {details}")
-
-        # Gate 6: Best Practices
-        passed, details = self._check_best_practices(prompt)
-        results['gates']['best_practices'] = {
-            'passed': passed,
-            'details': details
-        }
-        if passed:
-            results['score'] += 1
-        else:
-            results['issues'].append(f"Best Practices: {details}")
-
-        # Gate 7: Examples Present
-        passed, details, example_count = self._check_examples(prompt)
-        results['gates']['examples_present'] = {
-            'passed': passed,
-            'details': details,
-            'count': example_count
-        }
-        if passed:
-            results['score'] += 1
-        else:
-            results['issues'].append(f"Examples: {details}")
+        for gate in self.GATES:
+            if gate.key in skipped:
+                results['gates'][gate.key] = {
+                    'passed': None,
+                    'skipped': True,
+                    'details': "Skipped: pass/fail already decided"
+                }
+                continue
+
+            outcome = outcomes[gate.key]
+            results['gates'][gate.key] = outcome.entry
+            results['score'] += outcome.points
+            if outcome.issue:
+                results['issues'].append(outcome.issue)
+            if outcome.warning:
+                results['warnings'].append(outcome.warning)
+
+        if fail_fast:
+            results['skipped_gates'] = skipped
+        if timings is not None:
+            results['timings'] = timings
 
         # Overall pass/fail (need 6/7 to pass)
-        results['passed'] = results['score'] >= 6
+        results['passed'] = results['score'] >= self.GATES.pass_threshold
 
         # Add recommendations
         results['recommendations'] = self._generate_recommendations(results)
 
         return results
 
+    @GATES.register('xml_structure', 'XML Structure Valid', cost=2)
+    def _gate_xml_structure(self, ctx: GateContext) -> GateOutcome:
+        """Gate 1: XML Structure."""
+        if ctx.format == 'xml':
+            passed, details = self._check_xml_structure(ctx.prompt, ctx['tags'])
+        else:
+            passed, details = True, "N/A for non-XML format"
+
+        return GateOutcome(int(passed), {'passed': passed, 'details': details},
+                           issue=None if passed else f"XML Structure: {details}")
+
+    @GATES.register('completeness', 'No Empty Sections', cost=3)
+    def _gate_completeness(self, ctx: GateContext) -> GateOutcome:
+        """Gate 2: Completeness."""
+        passed, details = self._check_completeness(ctx.prompt, ctx['tags'], ctx)
+        return GateOutcome(int(passed), {'passed': passed, 'details': details},
+                           issue=None if passed else f"Completeness: {details}")
+
+    @GATES.register('token_count', 'Token Count Reasonable', cost=4)
+    def _gate_token_count(self, ctx: GateContext) -> GateOutcome:
+        """Gate 3: Token Count."""
+        passed, details, token_count = self._check_token_count(ctx.prompt, ctx)
+        word_count = ctx['word_count']
+        entry = {'passed': passed, 'details': details, 'count': word_count, 'tokens': token_count}
+        if passed:
+            return GateOutcome(1, entry)
+        elif token_count < 11250:
+            # Warning but not failure (up to the former 15,000-word limit at 0.75 tokens/word)
+            return GateOutcome(1, entry, warning=f"Token count high: ~{token_count} tokens")
+        else:
+            return GateOutcome(0, entry, issue=f"Token Count: {details}")
+
+    @GATES.register('no_placeholders', 'No Placeholder Text', cost=1)
+    def _gate_no_placeholders(self, ctx: GateContext) -> GateOutcome:
+        """Gate 4: No Placeholders."""
+        passed, details, found_placeholders = self._check_placeholders(ctx.prompt, ctx)
+        return GateOutcome(int(passed), {'passed': passed, 'details': details,
+                                         'placeholders': found_placeholders},
+                           issue=None if passed else f"Placeholders: {details}")
+
+    @GATES.register('actionable_workflow', 'Workflow Actionable', cost=7)
+    def _gate_actionable_workflow(self, ctx: GateContext) -> GateOutcome:
+        """Gate 5: Actionable Workflow."""
+        passed, details = self._check_workflow(ctx.prompt, ctx)
+        return GateOutcome(int(passed), {'passed': passed, 'details': details},
+                           issue=None if passed else f"Workflow: {details}")
+
+    @GATES.register('best_practices', 'Best Practices Present', cost=6)
+    def _gate_best_practices(self, ctx: GateContext) -> GateOutcome:
+        """Gate 6: Best Practices."""
+        passed, details = self._check_best_practices(ctx.prompt, ctx)
+        return GateOutcome(int(passed), {'passed': passed, 'details': details},
+                           issue=None if passed else f"Best Practices: {details}")
+
+    @GATES.register('examples_present', 'Examples Included', cost=5)
+    def _gate_examples_present(self, ctx: GateContext) -> GateOutcome:
+        """Gate 7: Examples Present."""
+        passed, details, example_count = self._check_examples(ctx.prompt, ctx)
+        return GateOutcome(int(passed), {'passed': passed, 'details': details,
+                                         'count': example_count},
+                           issue=None if passed else f"Examples: {details}")
+
+    def _gate_context(self, prompt: str, format_hint: str) -> GateContext:
+        """Context whose scans (tag tree, lowercased text, counts) are built on first use."""
+        from xml_structure import scan_tags
+
+        return GateContext(prompt, format_hint, {
+            'tags': lambda ctx: scan_tags(ctx.prompt),
+            'lowered': lambda ctx: ctx.prompt.lower(),
+            'phrases': lambda ctx: PhraseCounts(ctx['lowered']),
+            'placeholders': lambda ctx: self._summarize_placeholders(
+                self._find_placeholders(ctx.prompt)),
+            'example_sections': lambda ctx: self._count_example_sections(ctx['lowered']),
+            'empty_headings': lambda ctx: len(re.findall(self.EMPTY_SECTION_PATTERN, ctx.prompt)),
+            'word_count': lambda ctx: len(ctx.prompt.split()),
+            'tokens': lambda ctx: self.counter.count(ctx.prompt),
+            'length': lambda ctx: len(ctx.prompt),
+            'stripped_length': lambda ctx: len(ctx.prompt.strip()),
+        })
+
     def _detect_format(self, prompt: str) -> str:
         """Auto-detect prompt format."""
         if '<mega_prompt>' in prompt:
@@ -168,94 +303,115 @@ class PromptValidator:
         else:
             return 'unknown'
 
-    def _check_xml_structure(self, prompt: str) -> Tuple[bool, str]:
-        """Validate XML tags are properly closed."""
-        # Extract tag pairs
-        opening_tags = re.findall(r'<([^/\s][^>]*)>', prompt)
-        closing_tags = re.findall(r'</([^>]+)>', prompt)
-
-        # Filter out self-closing or special tags
-        opening_tags = [tag.split()[0] for tag in opening_tags if not tag.endswith('/')]
-        closing_tags = [tag.strip() for tag in closing_tags]
-
-        # Check balance
-        if len(opening_tags) != len(closing_tags):
-            return False, f"Unbalanced tags: {len(opening_tags)} opening, {len(closing_tags)} closing"
-
-        # Check for unclosed specific tags
-        important_tags = ['mega_prompt', 'role', 'mission', 'context', 'workflow']
-        for tag in important_tags:
-            open_count = opening_tags.count(tag)
-            close_count = closing_tags.count(tag)
-            if open_count != close_count:
-                return False, f"Tag '{tag}' unbalanced: {open_count} open, {close_count} close"
-
-        return True, f"All {len(opening_tags)} tags properly closed"
-
-    def _check_completeness(self, prompt: str) -> Tuple[bool, str]:
+    @classmethod
+    def _get_placeholder_pattern(cls) -> 're.Pattern':
+        """Compile the combined placeholder pattern once."""
+        if cls._placeholder_pattern is None:
+            keywords = '|'.join(cls.PLACEHOLDER_KEYWORDS)
+            # Anchored on '[' with a zero-width body, so every bracket is tried
+            # even inside an earlier match; _find_placeholders() drops overlaps per keyword
+            cls._placeholder_pattern = re.compile(
+                rf"\[(?=((?:{keywords})[^\]]*\]|\.\.\..*?\]))", re.IGNORECASE
+            )
+        return cls._placeholder_pattern
+
+    @classmethod
+    def _find_placeholders(cls, prompt: str) -> List[str]:
+        """Placeholder text ([TODO], [TBD], [...], ...), grouped by keyword."""
+        # Per keyword, skip hits inside the previous one (re.findall semantics)
+        placeholders: Dict[str, List[str]] = {keyword: [] for keyword in cls.PLACEHOLDER_KEYWORDS}
+        placeholders['...'] = []
+        last_end: Dict[str, int] = {}
+        for match in cls._get_placeholder_pattern().finditer(prompt):
+            body = match.group(1)
+            kind = '...' if body.startswith('...') else next(
+                keyword for keyword in cls.PLACEHOLDER_KEYWORDS
+                if re.match(keyword, body, re.IGNORECASE)
+            )
+            start = match.start()
+            if start < last_end.get(kind, 0):
+                continue
+            last_end[kind] = match.end(1)
+            placeholders[kind].append('[' + body)
+
+        return [text for found in placeholders.values() for text in found]
+
+    @staticmethod
+    def _summarize_placeholders(found: List[str]) -> Tuple[int, List[str]]:
+        """(number of placeholders, first five distinct) as reported by gate 4."""
+        return len(found), list(dict.fromkeys(found))[:5]
+
+    @classmethod
+    def _count_example_sections(cls, lowered: str) -> int:
+        """Explicit example sections (## Example, <example>) in lowercased text."""
+        return len(re.findall(cls.EXAMPLE_SECTION_PATTERN, lowered))
+
+    def _check_xml_structure(self, prompt: str, tags: 'TagTree' = None) -> Tuple[bool, str]:
+        """Validate XML tags are properly nested and closed."""
+        if tags is None:
+            tags = self._gate_context(prompt, 'unknown')['tags']
+        if tags.error:
+            return False, tags.error['message']
+
+        return True, f"All {len(tags)} tags properly closed"
+
+    def _check_completeness(self, prompt: str, tags: 'TagTree' = None,
+                            scan: GateContext = None) -> Tuple[bool, str]:
         """Check for empty sections or missing content."""
-        # Look for empty XML tags
-        empty_xml = re.findall(r'<([^/][^>]*)>\s*</\1>', prompt)
+        if scan is None:
+            scan = self._gate_context(prompt, 'unknown')
+
+        # Look for empty XML elements
+        empty_xml = (tags if tags is not None else scan['tags']).empty_elements()
         if empty_xml:
-            return False, f"Empty sections found: {', '.join(set(empty_xml))}"
+            return False, f"Empty sections found: {', '.join(empty_xml)}"
 
         # Look for sections with only whitespace
-        section_pattern = r'##\s+([^\n]+)\s*\n\s*(?=##|$)'
-        empty_sections = re.findall(section_pattern, prompt)
+        empty_sections = scan['empty_headings']
         if empty_sections:
-            return False, f"Empty heading sections: {len(empty_sections)}"
+            return False, f"Empty heading sections: {empty_sections}"
 
         # Check minimum content length
-        if len(prompt.strip()) < 1000:
-            return False, f"Prompt too short: {len(prompt)} characters (minimum 1000)"
+        if scan['stripped_length'] < 1000:
+            length = scan['length']
+            return False, f"Prompt too short: {length} characters (minimum 1000)"
 
         return True, "All sections have content"
 
-    def _check_token_count(self, prompt: str) -> Tuple[bool, str, int]:
+    def _check_token_count(self, prompt: str, scan: GateContext = None) -> Tuple[bool, str, int]:
         """Check token count is reasonable."""
-        # Rough token estimation: ~0.75 words per token
-        word_count = len(prompt.split())
-        estimated_tokens = int(word_count * 0.75)
+        if scan is None:
+            scan = self._gate_context(prompt, 'unknown')
+        estimated_tokens = scan['tokens']
 
         if estimated_tokens > 8000:
-            return False, f"Token count very high: ~{estimated_tokens} tokens", word_count
+            return False, f"Token count very high: ~{estimated_tokens} tokens", estimated_tokens
         elif estimated_tokens > 6000:
-            return True, f"Token count acceptable but high: ~{estimated_tokens} tokens", word_count
+            return True, f"Token count acceptable but high: ~{estimated_tokens} tokens", estimated_tokens
         else:
-            return True, f"Token count optimal: ~{estimated_tokens} tokens", word_count
-
-    def _check_placeholders(self, prompt: str) -> Tuple[bool, str, List[str]]:
-        """Check for placeholder text that needs filling."""
-        placeholder_patterns = [
-            r'\[TODO[^\]]*\]',
-            r'\[FILL[^\]]*\]',
-            r'\[INSERT[^\]]*\]',
-            r'\[PLACEHOLDER[^\]]*\]',
-            r'\[TBD[^\]]*\]',
-            r'\[XXX[^\]]*\]',
-            r'\[\.\.\..*?\]',
-        ]
-
-        found = []
-        for pattern in placeholder_patterns:
-            matches = re.findall(pattern, prompt, re.IGNORECASE)
-            found.extend(matches)
-
-        if found:
-            return False, f"Found {len(found)} placeholder(s)", list(set(found))[:5]
+            return True, f"Token count optimal: ~{estimated_tokens} tokens", estimated_tokens
+
+    def _check_placeholders(self, prompt: str,
+                            scan: GateContext = None) -> Tuple[bool, str, List[str]]:
+        """Check for placeholder text that needs filling ([TODO], [TBD], [...], ...)."""
+        if scan is None:
+            scan = self._gate_context(prompt, 'unknown')
+        count, examples = scan['placeholders']
+
+        if count:
+            return False, f"Found {count} placeholder(s)", examples
         else:
             return True, "No placeholders found", []
 
-    def _check_workflow(self, prompt: str) -> Tuple[bool, str]:
+    def _check_workflow(self, prompt: str, scan: GateContext = None) -> Tuple[bool, str]:
         """Check for presence of actionable workflow."""
-        workflow_indicators = [
-            'workflow', 'process', 'approach', 'method', 'steps',
-            'phase', 'stage', '1.', '2.', '3.', 'first', 'then', 'next'
-        ]
+        if scan is None:
+            scan = self._gate_context(prompt, 'unknown')
+        phrases = scan['phrases']
 
         # Count workflow indicators
-        indicators_found = sum(1 for indicator in workflow_indicators
-                             if indicator.lower() in prompt.lower())
+        indicators_found = sum(1 for indicator in self.WORKFLOW_INDICATORS
+                             if phrases[indicator])
 
         if indicators_found >= 5:
             return True, f"Clear workflow present ({indicators_found} indicators)"
@@ -264,16 +420,14 @@ class PromptValidator:
         else:
             return False, f"Workflow unclear ({indicators_found} indicators, need 3+)"
 
-    def _check_best_practices(self, prompt: str) -> Tuple[bool, str]:
+    def _check_best_practices(self, prompt: str, scan: GateContext = None) -> Tuple[bool, str]:
         """Check for inclusion of best practices."""
-        best_practice_indicators = [
-            'best practice', 'guideline', 'standard', 'recommendation',
-            'should', 'must', 'avoid', 'ensure', 'always', 'never',
-            'principle', 'rule', 'convention'
-        ]
+        if scan is None:
+            scan = self._gate_context(prompt, 'unknown')
+        phrases = scan['phrases']
 
-        indicators_found = sum(1 for indicator in best_practice_indicators
-                             if indicator.lower() in prompt.lower())
+        indicators_found = sum(1 for indicator in self.BEST_PRACTICE_INDICATORS
+                             if phrases[indicator])
 
         if indicators_found >= 8:
             return True, f"Comprehensive best practices ({indicators_found} indicators)"
@@ -282,18 +436,16 @@ class PromptValidator:
         else:
             return False, f"Insufficient best practices ({indicators_found} indicators, need 5+)"
 
-    def _check_examples(self, prompt: str) -> Tuple[bool, str, int]:
+    def _check_examples(self, prompt: str, scan: GateContext = None) -> Tuple[bool, str, int]:
         """Check for presence of examples."""
-        # Count explicit example sections
-        example_sections = len(re.findall(r'##?\s*Example|<example', prompt, re.IGNORECASE))
+        if scan is None:
+            scan = self._gate_context(prompt, 'unknown')
 
-        # Count example indicators
-        example_words = prompt.lower().count('example')
-        for_instance = prompt.lower().count('for instance')
-        for_example = prompt.lower().count('for example')
-        such_as = prompt.lower().count('such as')
+        # Count explicit example sections (## Example, <example>)
+        example_sections = scan['example_sections']
 
-        total_indicators = example_words + for_instance + for_example + such_as
+        # Count example indicators
+        total_indicators = sum(scan['phrases'][phrase] for phrase in self.EXAMPLE_PHRASES)
 
         if example_sections >= 2 or total_indicators >= 4:
             return True, f"Good examples: {example_sections} sections, {total_indicators} indicators", example_sections
@@ -306,29 +458,29 @@ class PromptValidator:
         """Generate recommendations based on validation results."""
         recommendations = []
 
-        # Check each gate for specific recommendations
+        # Check each gate for specific recommendations (skipped gates have passed=None)
         gates = results['gates']
 
-        if not gates['xml_structure']['passed']:
+        if gates['xml_structure']['passed'] is False:
             recommendations.append("Fix XML structure: Ensure all tags are properly closed")
 
-        if not gates['completeness']['passed']:
+        if gates['completeness']['passed'] is False:
             recommendations.append("Fill empty sections with relevant content")
 
-        if gates['token_count']['count'] > 6000:
+        if gates['token_count'].get('tokens', 0) > 6000:
             recommendations.append("Consider reducing token count: Remove redundancies, consolidate examples")
 
-        if not gates['no_placeholders']['passed']:
+        if gates['no_placeholders']['passed'] is False:
             placeholders = gates['no_placeholders'].get('placeholders', [])
             recommendations.append(f"Replace placeholders: {', '.join(placeholders[:3])}")
 
-        if not gates['actionable_workflow']['passed']:
+        if gates['actionable_workflow']['passed'] is False:
             recommendations.append("Add clear workflow: Include numbered steps or phases")
 
-        if not gates['best_practices']['passed']:
+        if gates['best_practices']['passed'] is False:
             recommendations.append("Enhance best practices: Add domain-specific guidelines and rules")
 
-        if not gates['examples_present']['passed']:
+        if gates['examples_present']['passed'] is False:
             recommendations.append("Add examples: Include at least 2 concrete examples demonstrating expected behavior")
 
         # Overall recommendation
@@ -340,6 +492,244 @@ class PromptValidator:
         return recommendations
 
 
+# One validator per process, reused for every file that process handles
+_file_validator: Optional[PromptValidator] = None
+
+
+def _validate_path(validator: PromptValidator, path: str, format_hint: str, fail_fast: bool,
+                   stream: bool, fingerprint: bool = False) -> Dict[str, Any]:
+    """
+    Read and validate one file with a warm validator.
+
+    With fingerprint, the result also carries the manifest 'fingerprint' of
+    exactly the bytes validated (None if a streamed file changed meanwhile).
+    """
+    if not fingerprint:
+        if stream:
+            return validator.validate_stream(path, format_hint, fail_fast)
+        return validator.validate(Path(path).read_text(), format_hint, fail_fast)
+
+    from validation_manifest import read_fingerprinted, file_fingerprint
+
+    if stream:
+        before = os.stat(path)
+        result = validator.validate_stream(path, format_hint, fail_fast)
+        return {**result, 'fingerprint': file_fingerprint(path, before)}
+
+    import io
+
+    data, read_print = read_fingerprinted(path)
+    # Decoded as read_text() does: locale encoding, universal newlines
+    prompt_text = io.TextIOWrapper(io.BytesIO(data)).read()
+    return {**validator.validate(prompt_text, format_hint, fail_fast), 'fingerprint': read_print}
+
+
+def validate_file(path: str, format_hint: str = 'auto', fail_fast: bool = False,
+                  profile: bool = False, stream: bool = False,
+                  tokenizer: Optional[str] = None, fingerprint: bool = False) -> Dict[str, Any]:
+    """Validate one prompt file (module-level so process pool workers can run it)."""
+    from token_counter import get_counter
+
+    global _file_validator
+    if _file_validator is None:
+        _file_validator = PromptValidator()
+    _file_validator.counter = get_counter(tokenizer)
+    if profile != (_file_validator.profiler is not None):
+        from profiling import StageProfiler
+        _file_validator.profiler = StageProfiler() if profile else None
+
+    return {
+        'file': path,
+        **_validate_path(_file_validator, path, format_hint, fail_fast, stream, fingerprint)
+    }
+
+
+def iter_validate_files(paths: List[str], format_hint: str = 'auto', workers: int = 1,
+                        fail_fast: bool = False, profile: bool = False, stream: bool = False,
+                        tokenizer: Optional[str] = None,
+                        fingerprint: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Validate prompt files, optionally across processes, yielding each result
+    as soon as it and every file before it are done.
+
+    Args:
+        paths: Prompt file paths
+        format_hint: Format passed to every validate() call
+        workers: Worker processes; 1 validates in this process
+        fail_fast: Stop each file's gates once pass/fail is decided
+        profile: Record per-gate costs in each result's 'timings'
+        stream: Scan each file in bounded memory (validate_stream)
+        tokenizer: token_counter backend for the token gate (default: heuristic)
+        fingerprint: Add the validation_manifest fingerprint of the bytes
+            validated to each result, as 'fingerprint'
+
+    Yields:
+        One result per path, in the same order as paths
+    """
+    if workers <= 1 or len(paths) < 2:
+        for path in paths:
+            yield validate_file(path, format_hint, fail_fast, profile, stream, tokenizer,
+                                fingerprint)
+        return
+
+    import concurrent.futures
+
+    # Enough chunks per worker to balance uneven files, few enough to keep
+    # per-task IPC negligible; map() yields results in submission order
+    chunksize = max(1, min(256, len(paths) // (workers * 8)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(validate_file, paths, repeat(format_hint), repeat(fail_fast),
+                                repeat(profile), repeat(stream), repeat(tokenizer),
+                                repeat(fingerprint), chunksize=chunksize)
+
+
+def validate_files(paths: List[str], format_hint: str = 'auto', workers: int = 1,
+                   on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+                   fail_fast: bool = False, profile: bool = False,
+                   stream: bool = False, tokenizer: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Validate prompt files, in the order given, optionally across processes.
+
+    Args:
+        paths: Prompt file paths
+        format_hint: Format passed to every validate() call
+        workers: Worker processes; 1 validates in this process
+        on_result: Called with each result as it arrives, in order
+        fail_fast, profile, stream, tokenizer: As for iter_validate_files()
+
+    Returns:
+        One result per path, in the same order as paths
+    """
+    results = []
+    for result in iter_validate_files(paths, format_hint, workers, fail_fast, profile,
+                                      stream, tokenizer):
+        results.append(result)
+        if on_result:
+            on_result(result)
+    return results
+
+
+class ValidationProgress:
+    """Single-line progress display with a bounded number of updates."""
+
+    def __init__(self, total: int, stream=None, interval: float = 0.1):
+        self.total = total
+        self.stream = stream or sys.stdout
+        self.interval = interval
+        self.done = 0
+        self.passed = 0
+        self.tty = self.stream.isatty()
+        self._last_draw = 0.0
+        self._last_decile = 0
+
+    def update(self, result: Dict[str, Any]):
+        """Count a result and redraw if due."""
+        self.done += 1
+        self.passed += result['passed']
+
+        if self.tty:
+            # Redraw in place at most every `interval` seconds
+            now = monotonic()
+            if now - self._last_draw >= self.interval or self.done == self.total:
+                self._last_draw = now
+                self.stream.write(f"\r{self._line()}")
+                if self.done == self.total:
+                    self.stream.write("\n")
+                self.stream.flush()
+        else:
+            # Logs and pipes get one line per 10%
+            decile = self.done * 10 // self.total
+            if decile > self._last_decile:
+                self._last_decile = decile
+                print(self._line(), file=self.stream)
+
+    def _line(self) -> str:
+        failed = self.done - self.passed
+        return f"📝 {self.done}/{self.total} validated (✅ {self.passed}  ❌ {failed})"
+
+
+def watch_prompts(watcher, results: Dict[str, Dict[str, Any]], validator: PromptValidator,
+                  format_hint: str = 'auto', fail_fast: bool = False, stream: bool = False,
+                  on_batch: Optional[Callable[[List[Tuple[Dict[str, Any], Any]]], None]] = None,
+                  fingerprint: bool = False):
+    """
+    Revalidate prompts as they are saved, until interrupted (Ctrl+C).
+
+    The one validator (and its compiled patterns) stays warm, so each save
+    costs one validate() call and no process start-up.
+
+    Args:
+        watcher: file_watcher watcher on the prompt directory
+        results: Latest result per path; updated in place
+        validator: Validator to reuse
+        format_hint, fail_fast, stream: As for validate_files()
+        on_batch: Called after each batch of saves with (result, fingerprint)
+            pairs for the fresh results
+        fingerprint: Fingerprint the bytes validated, as iter_validate_files()
+            does; otherwise the pairs carry None
+    """
+    tty = sys.stdout.isatty()
+
+    def show_summary():
+        passed = sum(1 for result in results.values() if result['passed'])
+        line = (f"👀 {len(results)} prompts (✅ {passed}  ❌ {len(results) - passed}) "
+                f"- watching for changes, Ctrl+C to stop")
+        if tty:
+            # Live status line, redrawn in place after every batch
+            sys.stdout.write(f"\r\033[K{line}")
+            sys.stdout.flush()
+        else:
+            print(line)
+
+    show_summary()
+    try:
+        while True:
+            changed, removed = watcher.wait()
+            if tty:
+                sys.stdout.write("\r\033[K")
+
+            for path in sorted(removed):
+                if results.pop(path, None) is not None:
+                    print(f"🗑️  {Path(path).name}: removed")
+
+            fresh = []
+            for path in sorted(changed):
+                started = monotonic()
+                try:
+                    result = _validate_path(validator, path, format_hint, fail_fast, stream,
+                                            fingerprint)
+                except (OSError, UnicodeDecodeError) as e:
+                    # Deleted or still being written; the next save retries
+                    print(f"⚠️  {Path(path).name}: {e}")
+                    continue
+                elapsed = (monotonic() - started) * 1000
+
+                read_print = result.pop('fingerprint', None)
+                results[path] = {'file': path, **result}
+                fresh.append((results[path], read_print))
+                status = "✅" if result['passed'] else "❌"
+                print(f"{status} {Path(path).name}: {result['score']}/7 ({elapsed:.1f} ms)")
+                for issue in result['issues']:
+                    print(f"   - {issue}")
+
+            if on_batch and (fresh or removed):
+                on_batch(fresh)
+            show_summary()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        watcher.close()
+
+
+def summarize(results: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Report summary fields: total, passed and failed counts."""
+    total = passed = 0
+    for result in results:
+        total += 1
+        passed += result['passed']
+    return {'total': total, 'passed': passed, 'failed': total - passed}
+
+
 def create_validation_report(result: Dict[str, Any], prompt_file: Path) -> str:
     """Create human-readable validation report."""
     status = "✅ PASSED" if result['passed'] else "❌ FAILED"
@@ -357,19 +747,9 @@ def create_validation_report(result: Dict[str, Any], prompt_file: Path) -> str:
 """
 
     # Add each gate result
-    gate_names = {
-        'xml_structure': 'XML Structure Valid',
-        'completeness': 'No Empty Sections',
-        'token_count': 'Token Count Reasonable',
-        'no_placeholders': 'No Placeholder Text',
-        'actionable_workflow': 'Workflow Actionable',
-        'best_practices': 'Best Practices Present',
-        'examples_present': 'Examples Included'
-    }
-
-    for gate_key, gate_name in gate_names.items():
+    for gate_key, gate_name in PromptValidator().gates:
         gate = result['gates'][gate_key]
-        status_icon = "✅" if gate['passed'] else "❌"
+        status_icon = "⏭️" if gate.get('skipped') else "✅" if gate['passed'] else "❌"
         report += f"\n### {status_icon} {gate_name}\n\n"
         report += f"{gate['details']}\n"
 
@@ -418,6 +798,33 @@ Examples:
   # Validate directory
   python validator.py --dir ./prompts/ --report batch-validation.json
 
+  # Validate a large directory on 8 processes
+  python validator.py --dir ./outputs/ --workers 8 --report batch-validation.json
+
+  # Pass/fail screening: skip gates that cannot change the outcome
+  python validator.py --dir ./outputs/ --fail-fast --workers 0
+
+  # Multi-megabyte generated prompts in bounded memory
+  python validator.py --prompt huge-prompt.md --stream
+
+  # Or split one huge prompt across every CPU
+  python validator.py --prompt huge-prompt.md --workers 0
+
+  # Count tokens with the bundled BPE vocabulary instead of the word heuristic
+  python validator.py --prompt prompt.md --tokenizer bpe
+
+  # 100k-file runs: results stream to disk as they complete
+  python validator.py --dir ./outputs/ --workers 0 --report results.jsonl --report-format jsonl
+
+  # Per-gate cost table
+  python validator.py --prompt prompt.md --profile
+
+  # Only re-validate files changed since the last run
+  python validator.py --dir ./outputs/ --manifest --prune
+
+  # Edit-validate loop: revalidate each prompt as it is saved
+  python validator.py --dir ./prompts/ --watch
+
   # Fail on validation errors
   python validator.py --prompt prompt.md --fail-on-error
 """
@@ -426,19 +833,60 @@ Examples:
     parser.add_argument('--prompt', help='Single prompt file to validate')
     parser.add_argument('--dir', help='Directory of prompts to validate')
     parser.add_argument('--report', help='Output JSON report file')
+    parser.add_argument('--report-format', default='json', choices=['json', 'jsonl'],
+                       help='json: one document written at the end (default); jsonl: one line '
+                            'per file as it completes, then a summary line')
     parser.add_argument('--fail-on-error', action='store_true',
                        help='Exit with error code if validation fails')
     parser.add_argument('--format', default='auto',
                        choices=['auto', 'xml', 'claude', 'chatgpt', 'gemini'],
                        help='Prompt format (default: auto-detect)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Worker processes (default: 1, 0 = one per CPU); with --prompt, '
+                            'the prompt is split into chunks scanned in parallel')
+    parser.add_argument('--manifest', nargs='?', const='', metavar='PATH',
+                       help='Skip files unchanged since the last --dir run '
+                            '(default: <dir>/.validation-manifest.sqlite3)')
+    parser.add_argument('--force', action='store_true',
+                       help='With --manifest, re-validate every file')
+    parser.add_argument('--prune', action='store_true',
+                       help='With --manifest, drop entries for files that no longer exist')
+    parser.add_argument('--fail-fast', action='store_true',
+                       help='Stop each prompt\'s gates once pass/fail is decided (skipped gates are marked)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Memory-map each file and scan it in windows (bounded memory for huge prompts)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Record per-gate wall-clock cost and print a timing table')
+    parser.add_argument('--watch', action='store_true',
+                       help='With --dir, keep running and revalidate prompts as they are saved')
+    parser.add_argument('--poll', action='store_true',
+                       help='With --watch, poll file stats instead of using inotify')
+    parser.add_argument('--tokenizer', default='heuristic', choices=['heuristic', 'bpe'],
+                       help='Token counting backend for the token gate (default: heuristic)')
 
     args = parser.parse_args()
+    from report_writer import open_report, JsonReport
 
     if not args.prompt and not args.dir:
         parser.error("Either --prompt or --dir is required")
-
-    validator = PromptValidator()
-    results = []
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    if args.prompt and args.stream and args.workers != 1:
+        parser.error("--stream scans one window at a time; drop --workers for a single --prompt")
+    if (args.force or args.prune) and args.manifest is None:
+        parser.error("--force and --prune require --manifest")
+    if (args.watch or args.poll) and not args.dir:
+        parser.error("--watch requires --dir")
+    if args.poll and not args.watch:
+        parser.error("--poll requires --watch")
+
+    profiler = None
+    if args.profile:
+        from profiling import StageProfiler
+        profiler = StageProfiler()
+    validator = PromptValidator(profiler, args.tokenizer)
+    report = None
+    total = passed = 0
 
     # Validate single prompt or directory
     if args.prompt:
@@ -447,12 +895,20 @@ Examples:
             parser.error(f"Prompt file not found: {args.prompt}")
 
         print(f"📝 Validating: {prompt_file.name}")
-        prompt_text = prompt_file.read_text()
-        result = validator.validate(prompt_text, args.format)
+        if args.stream:
+            result = validator.validate_stream(str(prompt_file), args.format, args.fail_fast)
+        elif args.workers != 1:
+            result = validator.validate_chunked(prompt_file.read_text(), args.format,
+                                                args.fail_fast, args.workers)
+        else:
+            prompt_text = prompt_file.read_text()
+            result = validator.validate(prompt_text, args.format, args.fail_fast)
 
         # Print result
         status = "✅ PASSED" if result['passed'] else "❌ FAILED"
         print(f"\n{status} ({result['score']}/7)")
+        if result.get('skipped_gates'):
+            print(f"⏭️  Skipped: {', '.join(result['skipped_gates'])}")
 
         if result['issues']:
             print(f"\n❌ Issues:")
@@ -470,55 +926,142 @@ Examples:
         report_file.write_text(report_text)
         print(f"\n📋 Report: {report_file}")
 
-        results.append(result)
+        total, passed = 1, int(result['passed'])
+        if args.report:
+            report = open_report(args.report, args.report_format)
+            report.add(result)
 
     elif args.dir:
         prompt_dir = Path(args.dir)
         if not prompt_dir.exists():
             parser.error(f"Directory not found: {args.dir}")
 
-        prompt_files = list(prompt_dir.glob('*.md'))
-        print(f"📁 Validating {len(prompt_files)} prompts in: {prompt_dir}")
-
-        for prompt_file in prompt_files:
-            print(f"\n📝 {prompt_file.name}...")
-            prompt_text = prompt_file.read_text()
-            result = validator.validate(prompt_text, args.format)
-
-            status = "✅" if result['passed'] else "❌"
-            print(f"   {status} {result['score']}/7")
+        report = open_report(args.report, args.report_format) if args.report else None
+        watcher = None
+        if args.watch:
+            from file_watcher import open_watcher
+
+            # Started first, so saves during the initial pass are not missed
+            watcher = open_watcher(prompt_dir)
+
+        # Sorted so reports are identical across runs and worker counts
+        prompt_files = sorted(str(path) for path in prompt_dir.glob('*.md'))
+        workers = args.workers or os.cpu_count() or 1
+        print(f"📁 Validating {len(prompt_files)} prompts in: {prompt_dir}"
+              + (f" ({workers} workers)" if workers > 1 else ""))
+
+        # Fail-fast results lack skipped gates and token counts depend on the
+        # tokenizer, so both are cached separately
+        manifest_format = args.format + ('+fail-fast' if args.fail_fast else '')
+        if args.tokenizer != 'heuristic':
+            manifest_format += f'+{args.tokenizer}'
+        manifest = None
+        cached: Dict[str, Dict[str, Any]] = {}
+        stale = prompt_files
+        if args.manifest is not None:
+            from validation_manifest import ValidationManifest, MANIFEST_NAME
+
+            manifest = ValidationManifest(Path(args.manifest or prompt_dir / MANIFEST_NAME),
+                                          VALIDATOR_VERSION)
+            if args.prune:
+                pruned = manifest.prune(str(prompt_dir), prompt_files)
+                print(f"🧹 Pruned {pruned} manifest entries for deleted files")
+            cached, stale = manifest.partition(prompt_files, manifest_format, force=args.force)
+            if len(cached) + len(stale) < len(prompt_files):
+                # Some were deleted since the directory was listed
+                validating = set(stale)
+                prompt_files = [path for path in prompt_files
+                                if path in cached or path in validating]
+            print(f"♻️  {len(cached)} unchanged (reused), {len(stale)} to validate")
+
+        progress = ValidationProgress(len(stale))
+        fresh = iter_validate_files(stale, args.format, workers, args.fail_fast, args.profile,
+                                    args.stream, args.tokenizer, fingerprint=manifest is not None)
+        # Results are consumed one at a time, so only the report format and
+        # watch mode decide how many stay in memory
+        unrecorded: List[Tuple[Dict[str, Any], Any]] = []
+        latest: Dict[str, Dict[str, Any]] = {}
+        failed_files: List[str] = []
+
+        # Walk files in sorted order, taking each fresh result as it arrives
+        for path in prompt_files:
+            if path in cached:
+                result = cached.pop(path)
+            else:
+                result = next(fresh)
+                read_print = result.pop('fingerprint', None)
+                progress.update(result)
+                if profiler is not None:
+                    profiler.merge(result['timings'])
+                if manifest is not None:
+                    unrecorded.append((result, read_print))
+                    if len(unrecorded) >= MANIFEST_BATCH:
+                        manifest.record(unrecorded, manifest_format)
+                        unrecorded = []
+
+            total += 1
+            passed += result['passed']
+            if not result['passed'] and len(failed_files) < 20:
+                failed_files.append(path)
+            if report is not None:
+                report.add(result)
+            if watcher is not None:
+                latest[path] = result
+        fresh.close()
+
+        if manifest is not None and unrecorded:
+            manifest.record(unrecorded, manifest_format)
+
+        if failed_files:
+            print(f"\n❌ Failed:")
+            for path in failed_files:
+                print(f"   - {Path(path).name}")
+            if total - passed > 20:
+                print(f"   ... and {total - passed - 20} more")
+
+        if watcher is not None:
+            def on_batch(batch: List[Tuple[Dict[str, Any], Any]]):
+                if manifest is not None:
+                    manifest.record(batch, manifest_format)
+                if isinstance(report, JsonReport):
+                    # Rewrite the whole document with the latest results
+                    report.results = [latest[path] for path in sorted(latest)]
+                    report.close(summarize(latest.values()))
+                elif report is not None:
+                    for result, _ in batch:
+                        report.add(result)
+
+            if isinstance(report, JsonReport):
+                report.close(summarize(latest.values()))
+            print()
+            watch_prompts(watcher, latest, validator, args.format, args.fail_fast,
+                          args.stream, on_batch, fingerprint=manifest is not None)
+            if isinstance(report, JsonReport):
+                report.results = [latest[path] for path in sorted(latest)]
+            total = len(latest)
+            passed = sum(1 for result in latest.values() if result['passed'])
+
+        if manifest is not None:
+            manifest.close()
+
+    if profiler is not None:
+        print(f"\n{profiler.format_table()}")
 
-            results.append({
-                'file': str(prompt_file),
-                **result
-            })
+    # Summary
+    failed = total - passed
 
     # Save JSON report
-    if args.report:
-        report_data = {
-            'timestamp': datetime.now().isoformat(),
-            'total': len(results),
-            'passed': sum(1 for r in results if r['passed']),
-            'failed': sum(1 for r in results if not r['passed']),
-            'results': results
-        }
-
-        with open(args.report, 'w') as f:
-            json.dump(report_data, f, indent=2)
-
+    if report is not None:
+        report.close({'total': total, 'passed': passed, 'failed': failed})
         print(f"\n📊 JSON Report: {args.report}")
 
-    # Summary
-    passed = sum(1 for r in results if r['passed'])
-    failed = len(results) - passed
-
     print(f"\n{'=' * 60}")
     print(f"📊 Validation Summary")
     print(f"{'=' * 60}")
-    print(f"Total: {len(results)}")
+    print(f"Total: {total}")
     print(f"✅ Passed: {passed}")
     print(f"❌ Failed: {failed}")
-    print(f"Success Rate: {(passed / len(results) * 100):.1f}%")
+    print(f"Success Rate: {(passed / total * 100) if total else 0:.1f}%")
 
     # Exit with error if requested
     if args.fail_on_error and failed > 0:
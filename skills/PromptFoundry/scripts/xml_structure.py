@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Prompt Suite - XML Structure Scanner
+
+Single-pass, stack-based scanner for the XML-style tags in prompts. It builds
+a tag tree, reports the exact line and column of the first nesting error, and
+ignores tags inside comments, inline code and non-XML code fences. The tree
+is shared by the structure and completeness gates instead of each re-running
+re.findall over the prompt.
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+
+# Tags (quoted attribute values may contain '>'), comments and inline code.
+# Every branch starts with '<' or '`', so re can skip plain text quickly.
+TOKEN_PATTERN = re.compile(
+    r'<(?:!--[\s\S]*?-->'
+    r'|(?P<close>/)?(?P<name>[A-Za-z_][\w.:-]*)'
+    r'(?P<attrs>(?:\s(?:[^<>"\']|"[^"]*"|\'[^\']*\')*?)?)\s*(?P<selfclose>/)?>)'
+    r'|`[^`\n]+`'
+)
+
+# A fence line: up to 3 spaces of indent, ``` or ~~~, optional info string
+FENCE_PATTERN = re.compile(r'[ \t]{0,3}(`{3,}|~{3,})[ \t]*([^\s`]*)[^\n]*')
+
+# Fences whose contents are themselves scanned (the prompt inside a
+# generated markdown document sits in a ```xml fence)
+SCANNED_FENCES = {'xml'}
+
+
+def _fence_lines(text: str) -> List[Tuple[int, int, str, str]]:
+    """(line start, line end, marker, info) for each fence line, in order."""
+    lines = []
+    for marker in ('```', '~~~'):
+        index = text.find(marker)
+        while index != -1:
+            line_start = text.rfind('\n', 0, index) + 1
+            match = FENCE_PATTERN.match(text, line_start)
+            if match and match.start(1) == index:
+                lines.append((line_start, match.end(), match.group(1), match.group(2).lower()))
+                index = text.find(marker, match.end())
+            else:
+                index = text.find(marker, index + len(marker))
+    return sorted(lines)
+
+
+def _next_fence_state(fence: Optional[str], scanned: bool, marker: str,
+                      info: str) -> Tuple[Optional[str], bool]:
+    """State after one fence line: only a bare fence of the same character, at
+    least as long as the opener, closes it (CommonMark)."""
+    if fence is None:
+        return marker, info in SCANNED_FENCES
+    if marker[0] == fence[0] and len(marker) >= len(fence) and not info:
+        return None, True
+    return fence, scanned
+
+
+def fence_states(text: str, offsets: List[int]) -> List[Tuple[Optional[str], bool]]:
+    """
+    Fence state (open marker, contents scanned) at each line-start offset.
+
+    Offsets must be ascending; used to start partial TagScanners mid-text.
+    """
+    states = []
+    fence, scanned = None, True
+    lines = iter(_fence_lines(text))
+    line = next(lines, None)
+    for offset in offsets:
+        while line is not None and line[0] < offset:
+            fence, scanned = _next_fence_state(fence, scanned, line[2], line[3])
+            line = next(lines, None)
+        states.append((fence, scanned))
+    return states
+
+
+class TagNode:
+    """One element of the tag tree, with source offsets for later stages."""
+
+    __slots__ = ('name', 'attrs', 'line', 'column', 'start', 'content_start',
+                 'content_end', 'end', 'children', 'empty', 'has_content')
+
+    def __init__(self, name: Optional[str], attrs: str = '', line: int = 0, column: int = 0,
+                 start: int = 0, content_start: int = 0):
+        self.name = name
+        self.attrs = attrs
+        self.line = line
+        self.column = column
+        self.start = start
+        self.content_start = content_start
+        self.content_end: Optional[int] = None
+        self.end: Optional[int] = None
+        self.children: List['TagNode'] = []
+        self.empty = False
+        self.has_content = False
+
+    @property
+    def closed(self) -> bool:
+        return self.end is not None
+
+    def iter(self, name: Optional[str] = None) -> Iterator['TagNode']:
+        """Descendants in document order, optionally only those named name."""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if name is None or node.name == name:
+                yield node
+            stack.extend(reversed(node.children))
+
+    def content(self, text: str) -> str:
+        """Text between the opening and closing tag."""
+        return text[self.content_start:self.content_end]
+
+    def __repr__(self) -> str:
+        return f"TagNode({self.name!r}, line={self.line}, children={len(self.children)})"
+
+
+class TagTree:
+    """Result of a scan: the tree, every tag in order, and the first error."""
+
+    def __init__(self, root: TagNode, tags: List[TagNode], error: Optional[Dict[str, Any]],
+                 count: int, empty: List[str]):
+        self.root = root
+        self.tags = tags
+        self.error = error
+        self.count = count
+        self._empty = empty
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def iter(self, name: Optional[str] = None) -> Iterator[TagNode]:
+        return self.root.iter(name)
+
+    def empty_elements(self) -> List[str]:
+        """Names of closed elements with only whitespace inside, first occurrence order."""
+        return self._empty
+
+
+class TagScanner:
+    """
+    Stack-based tag scanner over text fed in line-aligned pieces.
+
+    scan_tags() feeds a whole text at once; streaming callers feed buffers
+    that start at a line boundary and are processed up to `cut`, with the
+    text past `cut` only used to finish tags, comments and fences that
+    straddle it. A tag longer than that lookahead is not recognised.
+
+    A partial scanner covers one chunk of a larger text, starting at offset
+    `start` inside the given fence state (and resuming after any tag that
+    ran into the chunk, at `resume`). Closing tags for elements opened
+    before the chunk are kept in `closers` instead of being reported, so
+    chunks can be scanned independently and combined in order.
+    """
+
+    def __init__(self, keep_tree: bool = True, partial: bool = False, start: int = 0,
+                 fence: Tuple[Optional[str], bool] = (None, True), resume: Optional[int] = None):
+        self.keep_tree = keep_tree
+        self.partial = partial
+        self.root = TagNode(None)
+        self.stack = [self.root]
+        self.tags: List[TagNode] = []
+        self.count = 0
+        # Name -> offset of the first empty element with that name
+        self.empty: Dict[str, int] = {}
+        self.error: Optional[Dict[str, Any]] = None
+        # Partial scans: (name, offset, content seen since the previous one)
+        self.closers: List[Tuple[str, int, bool]] = []
+
+        # Global offsets: where scanning resumes, and from where the open
+        # element's text has not yet been checked for content
+        self._scan_from = start if resume is None else resume
+        self._gap_from = self._scan_from
+        # Incremental line tracking keeps position lookups O(n) overall
+        self._line = 1
+        self._counted_to = start
+        # Open fence marker, and whether its contents are scanned
+        self._fence, self._fence_scanned = fence
+
+    @property
+    def position(self) -> int:
+        """Offset where scanning resumes (past any tag that ran over the last cut)."""
+        return self._scan_from
+
+    def _regions(self, buf: str, cut: int) -> List[Tuple[int, int]]:
+        """Spans of buf outside non-XML code fences (CommonMark fence rules)."""
+        fence, scanned = self._fence, self._fence_scanned
+        if '```' not in buf and '~~~' not in buf:
+            return [(0, len(buf))] if scanned else []
+
+        regions = []
+        start = 0
+        for line_start, line_end, marker, info in _fence_lines(buf):
+            was_scanned = scanned
+            fence, scanned = _next_fence_state(fence, scanned, marker, info)
+            if was_scanned and not scanned:
+                regions.append((start, line_start))
+            elif scanned and not was_scanned:
+                start = line_end
+            if line_start < cut:
+                self._fence, self._fence_scanned = fence, scanned
+
+        if scanned:
+            regions.append((start, len(buf)))
+        return regions
+
+    def _locate(self, buf: str, base: int, pos: int) -> Tuple[int, int]:
+        """(line, column) of global offset pos inside buf."""
+        self._line += buf.count('\n', self._counted_to - base, pos - base)
+        self._counted_to = pos
+        # buf starts at a line boundary, so a miss means column pos - base + 1
+        return self._line, pos - (base + buf.rfind('\n', 0, pos - base))
+
+    def _fail(self, message: str, buf: str, base: int, pos: int, tag: str):
+        if self.error is None:
+            line, column = self._locate(buf, base, pos)
+            self.error = {'message': message.format(line=line, column=column),
+                          'line': line, 'column': column, 'tag': tag}
+
+    def feed(self, buf: str, base: int = 0, cut: Optional[int] = None):
+        """
+        Scan buf (which starts at global offset base) up to cut.
+
+        Tags that start before cut are taken whole even if they end after it;
+        the next buffer must start at base + cut.
+        """
+        if cut is None:
+            cut = len(buf)
+        stack = self.stack
+        last_end = self._scan_from - base
+
+        for region_start, region_end in self._regions(buf, cut):
+            if region_end <= last_end:
+                continue
+            for match in TOKEN_PATTERN.finditer(buf, max(region_start, last_end), region_end):
+                start = match.start()
+                if start >= cut:
+                    break
+                last_end = match.end()
+                current = stack[-1]
+
+                name = match.group('name')
+                if name is None or match.group('selfclose'):
+                    # Comment, inline code or self-closing tag
+                    current.has_content = True
+                    continue
+
+                if not current.has_content and buf[self._gap_from - base:start].strip():
+                    current.has_content = True
+                self._gap_from = base + last_end
+
+                if not match.group('close'):
+                    line, column = self._locate(buf, base, base + start)
+                    node = TagNode(name, match.group('attrs').strip(), line, column,
+                                   base + start, base + last_end)
+                    current.has_content = True
+                    if self.keep_tree:
+                        current.children.append(node)
+                        self.tags.append(node)
+                    self.count += 1
+                    stack.append(node)
+                    continue
+
+                if self.partial and len(stack) == 1:
+                    # Closes an element opened before this chunk
+                    self.closers.append((name, base + start, current.has_content))
+                    current.has_content = False
+                    continue
+
+                if current.name != name:
+                    opener = next((i for i in range(len(stack) - 1, 0, -1)
+                                   if stack[i].name == name), None)
+                    if opener is None:
+                        self._fail(f"Unexpected closing tag </{name}> at line {{line}}, column {{column}}",
+                                   buf, base, base + start, name)
+                        current.has_content = True
+                        continue
+                    self._fail(f"Closing tag </{name}> at line {{line}}, column {{column}} does not match "
+                               f"<{current.name}> opened at line {current.line}, column {current.column}",
+                               buf, base, base + start, name)
+                    # Implicitly close the unclosed children in between
+                    del stack[opener + 1:]
+                    current = stack[-1]
+
+                current.content_end = base + start
+                current.end = base + last_end
+                current.empty = not current.has_content
+                if current.empty and name not in self.empty:
+                    self.empty[name] = current.start
+                stack.pop()
+
+        # Carry line count and content state over to the next buffer
+        self._scan_from = base + max(cut, last_end)
+        if self._gap_from < base + cut:
+            if not stack[-1].has_content and buf[self._gap_from - base:cut].strip():
+                stack[-1].has_content = True
+            self._gap_from = base + cut
+        if self._counted_to < base + cut:
+            self._line += buf.count('\n', self._counted_to - base, cut)
+            self._counted_to = base + cut
+
+    def finish(self) -> TagTree:
+        """Report any unclosed tag and return the result."""
+        if len(self.stack) > 1 and self.error is None:
+            unclosed = self.stack[1]
+            self.error = {'message': f"Tag <{unclosed.name}> opened at line {unclosed.line}, "
+                                     f"column {unclosed.column} is never closed",
+                          'line': unclosed.line, 'column': unclosed.column, 'tag': unclosed.name}
+        return TagTree(self.root, self.tags, self.error, self.count, list(self.empty))
+
+
+def scan_tags(text: str) -> TagTree:
+    """
+    Scan text once and build its tag tree.
+
+    Mismatched closing tags are recovered from (the stack unwinds to the
+    matching opener, or a stray closer is ignored) so the tree stays usable,
+    but only the first problem is reported.
+
+    Returns:
+        TagTree whose error, if any, has 'message', 'line', 'column' and 'tag'
+    """
+    scanner = TagScanner()
+    scanner.feed(text)
+    return scanner.finish()